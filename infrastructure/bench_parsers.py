@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+bench_parsers.py - Measure how the markdown parsers scale with file size.
+
+Builds books.md and albums.md at each requested size (default 1k, 10k and
+100k entries) from bench_v4_html.py's synthetic content, exported through
+json_to_markdown.py exactly as the real files are, then times
+BooksMarkdownParser.parse_books and MarkdownToJSONParser.parse_albums on
+them. Each size is also checked for a lossless round trip (every synthetic
+entry comes back field for field), so a faster parser can't pass by dropping
+entries.
+
+The synthetic books fall into about a dozen year sections at every size.
+--books-per-section N instead gives every N books a "## <year>" section of
+their own, so the section count grows with the file — the shape that made
+the old books parser quadratic (it re-scanned the rest of the file for each
+heading); --books-per-section 2 is "one shelf per two books".
+
+ns/entry staying flat across sizes is what linear scaling looks like.
+Results are written as JSON tagged with the git commit, in bench_v4_html.py's
+format, so two runs can be compared with --compare.
+
+Usage:
+    python infrastructure/bench_parsers.py
+    python infrastructure/bench_parsers.py --sizes 1000,100000 --repeat 5
+    python infrastructure/bench_parsers.py --output after.json --compare before.json
+    python infrastructure/bench_parsers.py --sizes 2000,8000,32000 --books-per-section 2
+"""
+
+import argparse
+import functools
+import json
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+from typing import cast
+
+from bench_v4_html import compare, git_commit, measure, synthetic_albums, synthetic_books
+from json_to_markdown import JSONToMarkdownConverter
+from parse_albums import MarkdownToJSONParser
+from parse_books import BooksMarkdownParser
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_OUTPUT = Path(".cache/bench/bench_parsers.json")
+
+
+def _canonical(entries: list[dict[str, object]]) -> list[str]:
+    return sorted(json.dumps(e, sort_keys=True) for e in entries)
+
+
+def shelve(books_data: dict[str, object], per_section: int) -> None:
+    """Regroup synthetic books so every per_section of them share one year
+    section, newest first."""
+    books = cast(list[dict[str, object]], books_data["books"])
+    for i, book in enumerate(books):
+        book["year"] = (len(books) - 1 - i) // per_section + 1
+        book["yearLabel"] = None
+
+
+def bench_books(
+    n: int, repeat: int, seed: int, workdir: Path, per_section: int | None = None
+) -> dict[str, object]:
+    books_data = synthetic_books(n, random.Random(seed + n))
+    if per_section:
+        shelve(books_data, per_section)
+    _ = (workdir / "books.json").write_text(json.dumps(books_data))
+    markdown = workdir / "books.md"
+    _ = markdown.write_text(JSONToMarkdownConverter(workdir).convert_books())
+
+    parser = BooksMarkdownParser(workdir)
+    stats = measure(lambda: parser.parse_books(markdown), repeat, memory=False)
+    parsed = parser.parse_books(markdown)["books"]
+    stats["inputBytes"] = markdown.stat().st_size
+    stats["sections"] = len({(b["year"], b["yearLabel"]) for b in parsed})
+    stats["roundTrip"] = _canonical(parsed) == _canonical(books_data["books"])
+    return stats
+
+
+def bench_albums(n: int, repeat: int, seed: int, workdir: Path) -> dict[str, object]:
+    albums_data = synthetic_albums(n, random.Random(seed + n))
+    _ = (workdir / "albums.json").write_text(json.dumps(albums_data))
+    markdown = workdir / "albums.md"
+    _ = markdown.write_text(JSONToMarkdownConverter(workdir).convert_albums())
+
+    parser = MarkdownToJSONParser(workdir)
+    stats = measure(lambda: parser.parse_albums(markdown), repeat, memory=False)
+    parsed = parser.parse_albums(markdown)["albums"]
+    stats["inputBytes"] = markdown.stat().st_size
+    stats["roundTrip"] = _canonical(parsed) == _canonical(albums_data["albums"])
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the markdown parsers on synthetic content")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="Comma-separated entry counts (default: 1000,10000,100000)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per size (best is kept)")
+    parser.add_argument("--seed", type=int, default=1, help="Synthetic content seed")
+    parser.add_argument(
+        "--books-per-section",
+        type=int,
+        default=None,
+        help="Give every N books their own year section (default: the synthetic ~12 years)",
+    )
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help=f"Results JSON (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    print("Benchmarking markdown parsers")
+    print("=" * 50)
+    books = functools.partial(bench_books, per_section=args.books_per_section)
+    results: dict[str, dict[str, dict[str, object]]] = {}
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            results[str(n)] = {}
+            for name, bench in (("parse_books", books), ("parse_albums", bench_albums)):
+                r = bench(n, args.repeat, args.seed, Path(tmp))
+                results[str(n)][name] = r
+                failed = failed or not r["roundTrip"]
+                seconds = cast(float, r["seconds"])
+                print(
+                    f"  {n:>9,}  {name:<14} {seconds * 1000:10.2f} ms"
+                    f" {seconds / n * 1e9:8.0f} ns/entry {cast(int, r['inputBytes']) / 2**20:8.1f} MB"
+                    + (f" {cast(int, r['sections']):7,} sections" if "sections" in r else " " * 17)
+                    + f"  {'round trip ok' if r['roundTrip'] else 'ROUND TRIP MISMATCH'}"
+                )
+
+    report = {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "cpus": os.cpu_count(),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "booksPerSection": args.books_per_section,
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\n✓ Wrote {args.output}")
+
+    if args.compare:
+        compare(report, args.compare)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+bench_v4_html.py - Measure how regenerate_v4_html.py scales with content size.
+
+Generates synthetic books.json / albums.json / now.json payloads at each
+requested size (default 1k, 10k, 100k and 1M entries) with year distributions
+shaped like the real logs, loads them as content_model.py records the way
+the renderer does, then times each renderer stage separately:
+
+  - group_books_by_year, group_albums_by_year, build_year_sparkline
+  - generate_book_groups_html, generate_albums_html, generate_now_html
+  - generate_full_html (whole page as one string)
+  - write_full_html (whole page streamed to a null sink)
+
+For every stage it records best-of-N wall time, peak traced memory
+(tracemalloc, measured in a separate pass so tracing overhead doesn't skew
+timings) and output size. Results are written as JSON, tagged with the current
+git commit, so two runs can be compared with --compare.
+
+Usage:
+    python infrastructure/bench_v4_html.py
+    python infrastructure/bench_v4_html.py --sizes 1000,10000 --repeat 5
+    python infrastructure/bench_v4_html.py --output before.json
+    python infrastructure/bench_v4_html.py --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Iterable
+
+from content_model import AlbumLog, BookLog, NowPage
+from regenerate_v4_html import (
+    build_year_sparkline,
+    generate_albums_html,
+    generate_book_groups_html,
+    generate_full_html,
+    generate_now_html,
+    group_albums_by_year,
+    group_books_by_year,
+    write_full_html,
+)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_OUTPUT = Path(".cache/bench/bench_v4_html.json")
+
+FIRST_YEAR = 2015
+LAST_YEAR = 2026
+
+WORDS = (
+    "the of and a in to night river glass house light empty north song city "
+    "memory fire slow gold wild blue machine garden signal ghost paper summer "
+    "winter stone letters dream electric broken long quiet modern last"
+).split()
+
+
+def _phrase(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).title()
+
+
+def _year_weights() -> list[float]:
+    """Ramp up from FIRST_YEAR, plateau with a mid-log peak — like books.md."""
+    years = range(FIRST_YEAR, LAST_YEAR + 1)
+    return [1.0 + min(y - FIRST_YEAR, 5) * 0.6 + (1.5 if y in (2019, 2020) else 0) for y in years]
+
+
+def synthetic_books(n: int, rng: random.Random) -> dict[str, object]:
+    years = list(range(LAST_YEAR, FIRST_YEAR - 1, -1))
+    weights = list(reversed(_year_weights()))
+    dated = int(n * 0.85)  # the rest land in the "<2015" bucket
+    picked = sorted(rng.choices(years, weights, k=dated), reverse=True)
+    books: list[dict[str, object]] = []
+    for year in picked:
+        book: dict[str, object] = {"title": _phrase(rng, 1, 6), "year": year, "yearLabel": None}
+        if rng.random() < 0.8:
+            book["goodreadsUrl"] = f"https://www.goodreads.com/book/show/{rng.randint(1, 10**9)}"
+        books.append(book)
+    for _ in range(n - dated):
+        books.append({"title": _phrase(rng, 1, 6), "year": None, "yearLabel": "<2015"})
+    return {
+        "meta": {"version": "1.0", "contentUpdated": f"{LAST_YEAR}-08-16"},
+        "books": books,
+    }
+
+
+def synthetic_albums(n: int, rng: random.Random) -> dict[str, object]:
+    years = list(range(FIRST_YEAR, LAST_YEAR + 1))
+    weights = _year_weights()
+    albums: list[dict[str, object]] = []
+    for _ in range(n):
+        year = rng.choices(years, weights)[0]
+        listened = date(year, 1, 1) + timedelta(days=rng.randrange(365))
+        # Most listens are recent releases, with a long tail back to the 60s.
+        release = max(1960, year - int(rng.expovariate(1 / 8)))
+        spotify_id = "".join(rng.choices("abcdefghijklmnopqrstuvwxyz0123456789", k=22))
+        albums.append({
+            "listenedDate": listened.isoformat(),
+            "artist": _phrase(rng, 1, 3),
+            "album": _phrase(rng, 1, 4),
+            "releaseYear": release,
+            "spotifyUrl": f"https://open.spotify.com/album/{spotify_id}",
+            "spotifyId": spotify_id,
+            "tracks": rng.randint(4, 20),
+            "playtime": f"{rng.randint(20, 70)} min.",
+            "notes": _phrase(rng, 3, 12).lower() if rng.random() < 0.2 else None,
+        })
+    return {
+        "meta": {"version": "1.0", "contentUpdated": f"{LAST_YEAR}-02-28"},
+        "albums": albums,
+    }
+
+
+def synthetic_now() -> dict[str, object]:
+    return {
+        "meta": {"version": "1.0", "contentUpdated": f"{LAST_YEAR}-02-25"},
+        "location": {"city": "Chattanooga", "state": "TN", "emoji": "📍"},
+        "sections": {
+            "life": {"text": "Paragraph one.\n\nParagraph [two](https://fring.io).", "highlights": []},
+            "work": {"currentRole": "Director", "description": "Work description."},
+            "future": {"desires": ["One thing.", "Another thing."]},
+        },
+        "links": {"github": "k-f-", "linkedin": "kfring", "goodreads": "kfring"},
+    }
+
+
+class _NullSink:
+    """Binary sink that only counts what is written to it."""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, chunk: bytes) -> int:
+        self.size += len(chunk)
+        return len(chunk)
+
+    def writelines(self, chunks: Iterable[bytes]) -> None:
+        for chunk in chunks:
+            self.size += len(chunk)
+
+
+def _output_size(result: object) -> int | None:
+    if isinstance(result, str):
+        return len(result.encode("utf-8"))
+    if isinstance(result, _NullSink):
+        return result.size
+    return None
+
+
+def measure(fn: Callable[[], object], repeat: int, memory: bool) -> dict[str, object]:
+    """Best-of-repeat wall time, then one traced run for peak memory."""
+    best = float("inf")
+    result: object = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    stats: dict[str, object] = {"seconds": round(best, 6), "outputBytes": _output_size(result)}
+    del result
+
+    if memory:
+        tracemalloc.start()
+        _ = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stats["peakBytes"] = peak
+    return stats
+
+
+def bench_size(n: int, repeat: int, memory: bool, seed: int) -> dict[str, dict[str, object]]:
+    rng = random.Random(seed + n)
+    book_log = BookLog.from_json(synthetic_books(n, rng))
+    album_log = AlbumLog.from_json(synthetic_albums(n, rng))
+    now = NowPage.from_json(synthetic_now())
+    books = book_log.books
+    albums = album_log.albums
+    book_counts = OrderedDict((k, len(v)) for k, v in group_books_by_year(books).items())
+
+    def streamed() -> _NullSink:
+        sink = _NullSink()
+        write_full_html(sink, book_log, album_log, now)
+        return sink
+
+    stages: dict[str, Callable[[], object]] = {
+        "group_books_by_year": lambda: group_books_by_year(books),
+        "group_albums_by_year": lambda: group_albums_by_year(albums),
+        "build_year_sparkline": lambda: build_year_sparkline(book_counts),
+        "generate_book_groups_html": lambda: generate_book_groups_html(books),
+        "generate_albums_html": lambda: generate_albums_html(albums),
+        "generate_now_html": lambda: generate_now_html(now),
+        "generate_full_html": lambda: generate_full_html(book_log, album_log, now),
+        "write_full_html": streamed,
+    }
+    results: dict[str, dict[str, object]] = {}
+    for name, fn in stages.items():
+        results[name] = measure(fn, repeat, memory)
+        r = results[name]
+        peak = f"{r['peakBytes'] / 2**20:9.1f} MB" if "peakBytes" in r else " " * 12
+        size = f"{r['outputBytes'] / 1024:10.1f} KB" if r["outputBytes"] is not None else ""
+        print(f"  {n:>9,}  {name:<26} {r['seconds'] * 1000:10.2f} ms {peak} {size}")
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def compare(current: dict[str, object], baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text())
+    print(f"\nvs {baseline_path} ({baseline.get('commit') or 'unknown commit'})")
+    for size, stages in current["results"].items():
+        old_stages = baseline["results"].get(size)
+        if not old_stages:
+            continue
+        for name, stats in stages.items():
+            old = old_stages.get(name)
+            if not old or not old["seconds"]:
+                continue
+            ratio = stats["seconds"] / old["seconds"]
+            print(f"  {int(size):>9,}  {name:<26} {ratio:6.2f}x time")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark regenerate_v4_html on synthetic content")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="Comma-separated entry counts (default: 1000,10000,100000,1000000)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage (best is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--seed", type=int, default=1, help="Synthetic content seed")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help=f"Results JSON (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    print("Benchmarking v4 renderer")
+    print("=" * 50)
+    results = {}
+    for n in sizes:
+        results[str(n)] = bench_size(n, args.repeat, not args.no_memory, args.seed)
+
+    report = {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "cpus": os.cpu_count(),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\n✓ Wrote {args.output}")
+
+    if args.compare:
+        compare(report, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+compress_site.py - Write precompressed .gz/.br variants of a generated site.
+
+Runs after regenerate_v4_html.py / regenerate_brief_html.py (or from their
+--compress flag). Every HTML/JSON/CSS/JS/XML file under the site root gets a
+sibling <file>.gz and, when the brotli package is installed, <file>.br. Files
+are compressed in a process pool, and a file whose artifacts are already newer
+than the source is skipped.
+
+A manifest (encodings.json at the site root) records, per file, the content
+type, the raw and encoded sizes, and which encoding to serve. S3 can't
+negotiate Accept-Encoding per request, so every compressible file is served
+as gzip (which every browser accepts) — even the few tiny ones where that
+costs a dozen bytes, so that deploy_sync.sh can hand whole file types to one
+gzip-encoded `aws s3 sync` instead of uploading file by file. The .br sizes
+are there for a CDN that can negotiate.
+
+--stage DIR copies each file's gzip bytes to DIR under the file's own name
+(DIR/index.html holds index.html.gz), keeping the source's mtime; that tree
+is what deploy_sync.sh syncs with --content-encoding gzip.
+
+Usage:
+    python infrastructure/compress_site.py sites/v4
+    python infrastructure/compress_site.py sites/v4 --stage .deploy/gzip
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = "encodings.json"
+
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".json": "application/json",
+    ".css": "text/css; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+    ".xml": "application/xml",
+}
+
+
+def compressible_files(root: Path) -> list[Path]:
+    """Every file under root with a compressible suffix, manifest excluded."""
+    return sorted(
+        p
+        for p in root.rglob("*")
+        if p.is_file() and p.suffix in CONTENT_TYPES and p.name != MANIFEST_NAME
+    )
+
+
+def _is_fresh(source: Path, artifact: Path) -> bool:
+    return artifact.exists() and artifact.stat().st_mtime >= source.stat().st_mtime
+
+
+def compress_file(path: Path) -> dict:
+    """Write path.gz (and path.br) next to path; return the sizes."""
+    data = path.read_bytes()
+    entry = {"size": len(data)}
+
+    gz_path = path.with_name(path.name + ".gz")
+    if not _is_fresh(path, gz_path):
+        # mtime=0 keeps the gzip header stable, so identical input gives
+        # byte-identical artifacts across runs.
+        _ = gz_path.write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    entry["gzip"] = gz_path.stat().st_size
+
+    if brotli is not None:
+        br_path = path.with_name(path.name + ".br")
+        if not _is_fresh(path, br_path):
+            _ = br_path.write_bytes(brotli.compress(data, quality=11))
+        entry["br"] = br_path.stat().st_size
+
+    return entry
+
+
+def compress_tree(root: Path, workers: int | None = None) -> dict:
+    """Compress every eligible file under root and write the encodings manifest."""
+    if brotli is None:
+        print("WARNING: python 'brotli' package missing — writing .gz only",
+              file=sys.stderr)
+
+    files = compressible_files(root)
+    if workers == 1:
+        results = [compress_file(f) for f in files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(compress_file, files, chunksize=16))
+
+    manifest_files = {}
+    for path, entry in zip(files, results):
+        entry["contentType"] = CONTENT_TYPES[path.suffix]
+        entry["serve"] = "gzip"
+        manifest_files[path.relative_to(root).as_posix()] = entry
+
+    manifest = {"files": manifest_files}
+    _ = (root / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+    return manifest
+
+
+def stage_gzip(root: Path, manifest: dict, stage_dir: Path) -> int:
+    """Copy every file's .gz to stage_dir under its original name; return how
+    many files were (re)written."""
+    written = 0
+    for rel in manifest["files"]:
+        source = root / rel
+        target = stage_dir / rel
+        data = source.with_name(source.name + ".gz").read_bytes()
+        if not (target.exists() and target.read_bytes() == data):
+            target.parent.mkdir(parents=True, exist_ok=True)
+            _ = target.write_bytes(data)
+            written += 1
+        mtime = source.stat().st_mtime
+        os.utime(target, (mtime, mtime))
+    return written
+
+
+def summarize(manifest: dict) -> str:
+    files = manifest["files"]
+    raw = sum(e["size"] for e in files.values())
+    served = sum(e["gzip"] for e in files.values())
+    saved = 100 * (1 - served / raw) if raw else 0
+    return f"{len(files)} file(s), {raw / 1024:.1f} KB → {served / 1024:.1f} KB gzip ({saved:.0f}% saved)"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write .gz/.br variants and an encodings manifest for a site")
+    parser.add_argument("root", type=Path, help="Site root, e.g. sites/v4")
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Process pool size (default: one per CPU; 1 compresses in-process)")
+    parser.add_argument(
+        "--stage", type=Path, default=None, metavar="DIR",
+        help="Also copy the gzip bytes to DIR under the original names (used by deploy.yml)")
+    args = parser.parse_args()
+
+    if not args.root.is_dir():
+        print(f"ERROR: {args.root} is not a directory", file=sys.stderr)
+        return 1
+
+    manifest = compress_tree(args.root, args.workers)
+
+    print(f"✓ Compressed {args.root}: {summarize(manifest)}")
+    print(f"  Manifest: {args.root / MANIFEST_NAME}")
+    if args.stage:
+        written = stage_gzip(args.root, manifest, args.stage)
+        print(f"  Staged: {len(manifest['files'])} file(s) in {args.stage}/ ({written} written)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
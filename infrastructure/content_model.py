@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+content_model.py - Typed, slotted records for the content/*.json files.
+
+Content used to travel as dict[str, object], cast() at every use. This module
+gives each entry a __slots__ dataclass instead — Book, Album, CareerEntry —
+plus a container per file (BookLog, AlbumLog, NowPage, CareerPage) with a
+loader from the existing JSON and a dumper back to it. parse_books.py and
+parse_albums.py build Book/Album records (parse_book_log, parse_album_log)
+and dump them to write the JSON; json_to_markdown.py loads the logs to write
+the markdown; regenerate_v4_html.py loads them to render the site, and hands
+the records on to content_stats.py, detail_pages.py, facet_index.py and
+static_api.py. Where JSON is needed again (the API pages, digests), it is
+the records' to_json().
+
+Dumps are lossless: keys come back in the order the parsers write them,
+optional keys (a book's goodreadsUrl) are only emitted when the source had
+them, and any key this module doesn't know about is carried in `extra` and
+written back after the known ones. `--check` proves the round trip on the
+real content; `--footprint` measures the per-entry memory against plain dicts.
+
+Usage:
+    python infrastructure/content_model.py --check
+    python infrastructure/content_model.py --footprint
+    python infrastructure/content_model.py --footprint --entries 100000
+"""
+
+import argparse
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, ClassVar, TypeVar, cast
+
+T = TypeVar("T")
+
+CONTENT_DIR = Path("content")
+
+
+def _known(json_fields: tuple[tuple[str, str], ...], data: dict[str, object]) -> dict[str, object] | None:
+    keys = {key for _, key in json_fields}
+    extra = {k: v for k, v in data.items() if k not in keys}
+    return extra or None
+
+
+def _from_json(cls: Callable[..., T], json_fields: tuple[tuple[str, str], ...], data: dict[str, object]) -> T:
+    values = [data.get(key) for _, key in json_fields]
+    return cls(*values, extra=_known(json_fields, data))
+
+
+def _to_json(
+    obj: object, json_fields: tuple[tuple[str, str], ...], optional: frozenset[str]
+) -> dict[str, object]:
+    out: dict[str, object] = {}
+    for attr, key in json_fields:
+        value = getattr(obj, attr)
+        if value is None and key in optional:
+            continue
+        out[key] = value
+    extra = cast(dict[str, object] | None, getattr(obj, "extra"))
+    if extra:
+        out.update(extra)
+    return out
+
+
+# ── Entries ─────────────────────────────────────────────────────────────────
+
+
+@dataclass(slots=True)
+class Book:
+    """One books.json entry. year is None for the "<2015" bucket (yearLabel)."""
+
+    title: str
+    year: int | None
+    year_label: str | None
+    goodreads_url: str | None = None
+    extra: dict[str, object] | None = None
+
+    JSON_FIELDS: ClassVar[tuple[tuple[str, str], ...]] = (
+        ("title", "title"),
+        ("year", "year"),
+        ("year_label", "yearLabel"),
+        ("goodreads_url", "goodreadsUrl"),
+    )
+    OPTIONAL: ClassVar[frozenset[str]] = frozenset({"goodreadsUrl"})
+
+    @classmethod
+    def from_json(cls, data: dict[str, object]) -> "Book":
+        return _from_json(cls, cls.JSON_FIELDS, data)
+
+    @property
+    def year_key(self) -> str:
+        """The Bookshelf group: the year label ("<2015") if any, else the year."""
+        if self.year_label:
+            return self.year_label
+        return "Unknown" if self.year is None else str(self.year)
+
+    def to_json(self) -> dict[str, object]:
+        # Spelled out rather than _to_json(): the parsers dump every entry
+        # through here, and the generic loop costs several times as much.
+        out: dict[str, object] = {"title": self.title, "year": self.year, "yearLabel": self.year_label}
+        if self.goodreads_url is not None:
+            out["goodreadsUrl"] = self.goodreads_url
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+
+@dataclass(slots=True)
+class Album:
+    """One albums.json entry."""
+
+    listened_date: str
+    artist: str
+    album: str
+    release_year: int | None = None
+    spotify_url: str | None = None
+    spotify_id: str | None = None
+    tracks: int | None = None
+    playtime: str | None = None
+    notes: str | None = None
+    extra: dict[str, object] | None = None
+
+    JSON_FIELDS: ClassVar[tuple[tuple[str, str], ...]] = (
+        ("listened_date", "listenedDate"),
+        ("artist", "artist"),
+        ("album", "album"),
+        ("release_year", "releaseYear"),
+        ("spotify_url", "spotifyUrl"),
+        ("spotify_id", "spotifyId"),
+        ("tracks", "tracks"),
+        ("playtime", "playtime"),
+        ("notes", "notes"),
+    )
+    OPTIONAL: ClassVar[frozenset[str]] = frozenset()
+
+    @classmethod
+    def from_json(cls, data: dict[str, object]) -> "Album":
+        return _from_json(cls, cls.JSON_FIELDS, data)
+
+    def to_json(self) -> dict[str, object]:
+        # Spelled out for the parsers, as Book.to_json is.
+        out: dict[str, object] = {
+            "listenedDate": self.listened_date,
+            "artist": self.artist,
+            "album": self.album,
+            "releaseYear": self.release_year,
+            "spotifyUrl": self.spotify_url,
+            "spotifyId": self.spotify_id,
+            "tracks": self.tracks,
+            "playtime": self.playtime,
+            "notes": self.notes,
+        }
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+
+@dataclass(slots=True)
+class CareerEntry:
+    """One career.json "experience" entry."""
+
+    title: str
+    company: str
+    company_type: str | None = None
+    location: str | None = None
+    start_date: str | None = None
+    end_date: str | None = None
+    duration: str | None = None
+    current: bool | None = None
+    description: str | None = None
+    highlights: list[str] | None = None
+    skills: list[str] | None = None
+    extra: dict[str, object] | None = None
+
+    JSON_FIELDS: ClassVar[tuple[tuple[str, str], ...]] = (
+        ("title", "title"),
+        ("company", "company"),
+        ("company_type", "companyType"),
+        ("location", "location"),
+        ("start_date", "startDate"),
+        ("end_date", "endDate"),
+        ("duration", "duration"),
+        ("current", "current"),
+        ("description", "description"),
+        ("highlights", "highlights"),
+        ("skills", "skills"),
+    )
+    # parse_career.py only writes these when the markdown has them.
+    OPTIONAL: ClassVar[frozenset[str]] = frozenset({"companyType", "location", "current"})
+
+    @classmethod
+    def from_json(cls, data: dict[str, object]) -> "CareerEntry":
+        return _from_json(cls, cls.JSON_FIELDS, data)
+
+    def to_json(self) -> dict[str, object]:
+        return _to_json(self, self.JSON_FIELDS, self.OPTIONAL)
+
+
+# ── Files ───────────────────────────────────────────────────────────────────
+
+
+def _read(path: Path) -> dict[str, object]:
+    with open(path) as f:
+        return cast(dict[str, object], json.load(f))
+
+
+@dataclass(slots=True)
+class BookLog:
+    """content/books.json"""
+
+    meta: dict[str, object]
+    books: list[Book] = field(default_factory=list)
+
+    @classmethod
+    def from_json(cls, data: dict[str, object]) -> "BookLog":
+        entries = cast(list[dict[str, object]], data["books"])
+        return cls(cast(dict[str, object], data["meta"]), [Book.from_json(b) for b in entries])
+
+    @classmethod
+    def load(cls, path: Path = CONTENT_DIR / "books.json") -> "BookLog":
+        return cls.from_json(_read(path))
+
+    def to_json(self) -> dict[str, object]:
+        return {"meta": self.meta, "books": [b.to_json() for b in self.books]}
+
+
+@dataclass(slots=True)
+class AlbumLog:
+    """content/albums.json"""
+
+    meta: dict[str, object]
+    albums: list[Album] = field(default_factory=list)
+
+    @classmethod
+    def from_json(cls, data: dict[str, object]) -> "AlbumLog":
+        entries = cast(list[dict[str, object]], data["albums"])
+        return cls(cast(dict[str, object], data["meta"]), [Album.from_json(a) for a in entries])
+
+    @classmethod
+    def load(cls, path: Path = CONTENT_DIR / "albums.json") -> "AlbumLog":
+        return cls.from_json(_read(path))
+
+    def to_json(self) -> dict[str, object]:
+        return {"meta": self.meta, "albums": [a.to_json() for a in self.albums]}
+
+
+@dataclass(slots=True)
+class NowPage:
+    """content/now.json — one small document, so its sections stay plain dicts."""
+
+    meta: dict[str, object]
+    location: dict[str, object]
+    sections: dict[str, object]
+    links: dict[str, str]
+
+    @classmethod
+    def from_json(cls, data: dict[str, object]) -> "NowPage":
+        return cls(
+            cast(dict[str, object], data["meta"]),
+            cast(dict[str, object], data.get("location", {})),
+            cast(dict[str, object], data.get("sections", {})),
+            cast(dict[str, str], data.get("links", {})),
+        )
+
+    @classmethod
+    def load(cls, path: Path = CONTENT_DIR / "now.json") -> "NowPage":
+        return cls.from_json(_read(path))
+
+    def to_json(self) -> dict[str, object]:
+        return {
+            "meta": self.meta,
+            "location": self.location,
+            "sections": self.sections,
+            "links": self.links,
+        }
+
+
+@dataclass(slots=True)
+class CareerPage:
+    """content/career.json"""
+
+    meta: dict[str, object]
+    summary: dict[str, object]
+    experience: list[CareerEntry]
+    preferences: dict[str, object]
+
+    @classmethod
+    def from_json(cls, data: dict[str, object]) -> "CareerPage":
+        entries = cast(list[dict[str, object]], data.get("experience", []))
+        return cls(
+            cast(dict[str, object], data["meta"]),
+            cast(dict[str, object], data.get("summary", {})),
+            [CareerEntry.from_json(e) for e in entries],
+            cast(dict[str, object], data.get("preferences", {})),
+        )
+
+    @classmethod
+    def load(cls, path: Path = CONTENT_DIR / "career.json") -> "CareerPage":
+        return cls.from_json(_read(path))
+
+    def to_json(self) -> dict[str, object]:
+        return {
+            "meta": self.meta,
+            "summary": self.summary,
+            "experience": [e.to_json() for e in self.experience],
+            "preferences": self.preferences,
+        }
+
+
+MODELS = {
+    "books": BookLog,
+    "albums": AlbumLog,
+    "now": NowPage,
+    "career": CareerPage,
+}
+
+
+# ── Checks ──────────────────────────────────────────────────────────────────
+
+
+def check_round_trip(content_dir: Path = CONTENT_DIR) -> bool:
+    """Load and dump every content file; True if each dump equals its source."""
+    ok = True
+    for name, model in MODELS.items():
+        path = content_dir / f"{name}.json"
+        if not path.exists():
+            continue
+        source = path.read_text()
+        dumped = json.dumps(model.load(path).to_json(), indent=2)
+        same = json.dumps(json.loads(source), indent=2) == dumped
+        print(f"  {'✓' if same else '✗'} {path}")
+        ok = ok and same
+    return ok
+
+
+def _traced(build: Callable[[], object]) -> tuple[object, int]:
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def footprint(entries: int) -> None:
+    """Per-entry memory of dict entries vs slotted records, from real content
+    repeated up to `entries` (the dicts are copied so both sides own their
+    containers; strings are shared, as they would be after one json.load)."""
+    for name, model, key in (("books", Book, "books"), ("albums", Album, "albums")):
+        path = CONTENT_DIR / f"{name}.json"
+        if not path.exists():
+            continue
+        source = cast(list[dict[str, object]], _read(path)[key])
+        sample = [source[i % len(source)] for i in range(entries)]
+        dicts, dict_bytes = _traced(lambda: [dict(d) for d in sample])
+        records, record_bytes = _traced(lambda: [model.from_json(d) for d in sample])
+        del dicts, records
+        print(
+            f"  {name:<7} dict {dict_bytes / entries:7.1f} B/entry   "
+            f"slots {record_bytes / entries:7.1f} B/entry   "
+            f"({100 * (1 - record_bytes / dict_bytes):.0f}% smaller)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Typed content model: round-trip check and memory footprint")
+    parser.add_argument("--check", action="store_true", help="Verify lossless load/dump of content/*.json")
+    parser.add_argument("--footprint", action="store_true", help="Compare per-entry memory of dicts vs slotted records")
+    parser.add_argument("--entries", type=int, default=10_000, help="Entries for --footprint (default: 10000)")
+    args = parser.parse_args()
+
+    if not (args.check or args.footprint):
+        parser.print_help()
+        return 0
+
+    status = 0
+    if args.check:
+        print("Round-trip check")
+        print("=" * 50)
+        if not check_round_trip():
+            status = 1
+    if args.footprint:
+        print("Memory footprint")
+        print("=" * 50)
+        footprint(args.entries)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+content_stats.py - Reading and listening aggregates, computed once at parse time.
+
+parse_books.py and parse_albums.py store these under meta["stats"] in
+books.json / albums.json, stamped with a digest of the entries they were
+computed from. The v4 renderer hashes the entries anyway (its section cache
+keys), so it uses the stored stats whenever that digest still matches and
+recomputes them — once per render — only after a hand edit of the JSON:
+
+  books.json   {"digest": d, "total": n, "perYear": {"2026": 5, ..., "<2015": 40}}
+  albums.json  {"digest": d, "total": n,
+                "perYear": {"2026": 3, ...},          listened year, newest first
+                "perArtist": {"Boy Harsher": 2, ...}, most listened first
+                "releaseDecades": {"1970s": 4, ...},  oldest first
+                "releaseSpan": [1971, 2024] | null,
+                "playtimeMinutes": 1234, "playtimeAlbums": 25}
+
+The inputs are content_model.py Book/Album records. The computation is
+column-at-a-time: each field is pulled out with map(attrgetter(...)) and
+counted with Counter, both in C, and anything derived (the year of a date, a
+decade, parsed playtime) is computed once per *distinct* value and weighted
+by its count — a log has a few thousand distinct dates and a few hundred
+distinct durations even at a million entries. `--bench` measures this on
+repeated real content.
+
+json_to_markdown.py leaves meta["stats"] out of the markdown: it is derived
+data, and the parsers recompute it on every run.
+
+Usage:
+    python infrastructure/content_stats.py
+    python infrastructure/content_stats.py --bench 1000000
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import timeit
+from collections import Counter
+from operator import attrgetter
+from pathlib import Path
+from typing import Callable, TypeVar, cast
+
+from content_model import Album, AlbumLog, Book, BookLog
+
+T = TypeVar("T")
+
+CONTENT_DIR = Path("content")
+
+_PLAYTIME = re.compile(
+    r"^\s*(?:(\d+)\s*(?:hours?|hrs?|h)\.?)?\s*(?:(\d+)\s*(?:minutes?|mins?|m)\.?)?\s*$", re.I
+)
+
+
+def parse_playtime(text: str) -> int | None:
+    """Minutes in "2 hr 13 min.", "37 Minutes", "41 min"; None if unparseable."""
+    match = _PLAYTIME.match(text)
+    if not match or not any(match.groups()):
+        return None
+    hours, minutes = match.groups()
+    return int(hours or 0) * 60 + int(minutes or 0)
+
+
+def _fold(counts: Counter, key) -> dict[str, int]:
+    """Re-key a Counter of distinct values, keeping first-appearance order."""
+    folded: dict[str, int] = {}
+    for value, count in counts.items():
+        k = key(value)
+        folded[k] = folded.get(k, 0) + count
+    return folded
+
+
+def _year_key(pair: tuple[str | None, int | None]) -> str:
+    # Book.year_key, applied per distinct (year_label, year) pair.
+    label, year = pair
+    return label or ("Unknown" if year is None else str(year))
+
+
+def book_stats(books: list[Book]) -> dict[str, object]:
+    # Same key as group_books_by_year; insertion order is the file's
+    # newest-first order, like the Bookshelf groups.
+    years = Counter(zip(map(attrgetter("year_label"), books), map(attrgetter("year"), books)))
+    per_year = _fold(years, _year_key)
+    return {"total": len(books), "perYear": per_year}
+
+
+def album_stats(albums: list[Album]) -> dict[str, object]:
+    dates = Counter(map(attrgetter("listened_date"), albums))
+    listened = _fold(dates, lambda date: (date or "")[:4])
+    # Newest first, undated last — the order the Albums section groups in.
+    per_year = {year or "Unknown": listened[year] for year in sorted(listened, reverse=True)}
+
+    artists = Counter(map(attrgetter("artist"), albums))
+    per_artist = dict(sorted(artists.items(), key=lambda kv: (-kv[1], kv[0].lower())))
+
+    released = Counter(filter(None, map(attrgetter("release_year"), albums)))
+    decades = _fold(released, lambda year: f"{int(cast(int, year)) // 10 * 10}s")
+
+    playtimes = Counter(filter(None, map(attrgetter("playtime"), albums)))
+    minutes = 0
+    timed = 0
+    for text, count in playtimes.items():
+        parsed = parse_playtime(str(text))
+        if parsed is not None:
+            minutes += parsed * count
+            timed += count
+
+    return {
+        "total": len(albums),
+        "perYear": per_year,
+        "perArtist": per_artist,
+        "releaseDecades": dict(sorted(decades.items())),
+        "releaseSpan": [min(released), max(released)] if released else None,
+        "playtimeMinutes": minutes,
+        "playtimeAlbums": timed,
+    }
+
+
+def entries_digest(entries: list[dict[str, object]]) -> str:
+    """Hash of a books/albums entry list, independent of key order.
+
+    One json.dumps() call, so the whole encode runs in C; iterencode() would
+    stream it but falls back to the pure-Python encoder, several times slower.
+    """
+    text = json.dumps(entries, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def with_digest(stats: dict[str, object], entries: list[dict[str, object]]) -> dict[str, object]:
+    """stats as the parsers store them: led by the digest of their entries."""
+    return {"digest": entries_digest(entries), **stats}
+
+
+def stored_stats(
+    meta: dict[str, object],
+    entries: list[T],
+    digest: str,
+    compute: Callable[[list[T]], dict[str, object]],
+) -> dict[str, object]:
+    """meta["stats"] if it was computed from entries (digest is the
+    entries_digest() of their JSON), otherwise compute(entries)."""
+    stats = meta.get("stats")
+    if isinstance(stats, dict) and stats.get("digest") == digest:
+        return cast(dict[str, object], stats)
+    return compute(entries)
+
+
+def bench(entries: int) -> None:
+    for name, compute, source in (
+        ("books", book_stats, BookLog.load(CONTENT_DIR / "books.json").books),
+        ("albums", album_stats, AlbumLog.load(CONTENT_DIR / "albums.json").albums),
+    ):
+        sample = [source[i % len(source)] for i in range(entries)]
+        elapsed = min(timeit.repeat(lambda: compute(sample), number=1, repeat=3))
+        print(f"  {name:<7} {entries:,} entries in {elapsed * 1000:7.1f} ms ({elapsed / entries * 1e9:.0f} ns/entry)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print (or benchmark) the books/albums aggregates")
+    parser.add_argument("--bench", type=int, metavar="N", help="Time the aggregates over N repeated entries")
+    args = parser.parse_args()
+
+    if args.bench:
+        print("Stats benchmark")
+        print("=" * 50)
+        bench(args.bench)
+        return 0
+    books = BookLog.load(CONTENT_DIR / "books.json").books
+    albums = AlbumLog.load(CONTENT_DIR / "albums.json").albums
+    print(json.dumps({"books": book_stats(books), "albums": album_stats(albums)}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
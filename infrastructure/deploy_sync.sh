@@ -0,0 +1,85 @@
+#!/bin/bash
+set -euo pipefail
+
+# deploy_sync.sh - Sync a generated site to an S3 bucket, text files gzip-encoded
+# Usage: ./deploy_sync.sh <source-dir> <gzip-stage-dir> <bucket>
+#
+# <gzip-stage-dir> is compress_site.py --stage output: the gzip bytes of every
+# HTML/JSON/CSS/JS/XML file under its original name. Those keys are left out
+# of the plain sync and pushed from the stage tree instead, one `aws s3 sync`
+# per content type and Cache-Control class, so S3 compares gzip bytes with
+# gzip objects and uploads only what changed. Every sync passes --delete; the
+# groups' filters don't overlap, so each prunes only its own keys. Superseded
+# hashes under assets/ stay in the tree for a few builds (site_assets.py), so
+# pages still cached from the last deploy keep finding their CSS and JS.
+#
+# Example: ./deploy_sync.sh sites/v4 .deploy/gzip v4.fring.io
+
+SOURCE_DIR="${1:-}"
+STAGE_DIR="${2:-}"
+BUCKET="${3:-}"
+
+if [[ -z "$SOURCE_DIR" || -z "$STAGE_DIR" || -z "$BUCKET" ]]; then
+    echo "Usage: $0 <source-dir> <gzip-stage-dir> <bucket>"
+    exit 1
+fi
+
+DEFAULT_CACHE="public, max-age=3600"
+# Content-hashed files under assets/ (site_assets.py) never change; nor does
+# the legacy v1 css/ directory.
+IMMUTABLE_CACHE="public, max-age=31536000, immutable"
+# Service workers (service_worker.py) must see a new version right away.
+NO_CACHE="no-cache"
+
+HTML="text/html; charset=utf-8"
+JSON="application/json"
+CSS="text/css; charset=utf-8"
+JS="text/javascript; charset=utf-8"
+XML="application/xml"
+
+# Never uploaded: compressed siblings, the encodings manifest, build state.
+BUILD_ONLY=(--exclude "*.gz" --exclude "*.br" --exclude "encodings.json"
+            --exclude "sitemap-state.json" --exclude "*/sitemap-state.json"
+            --exclude "*/asset-state.json")
+NOT_ASSETS=(--exclude "assets/*" --exclude "*/assets/*" --exclude "css/*")
+NOT_SW=(--exclude "sw.js" --exclude "*/sw.js" --exclude "sw-manifest.json" --exclude "*/sw-manifest.json")
+
+# gzip_sync <content-type> <cache-control> <filters...>
+# Filters apply after --exclude "*"; later filters win, as in aws s3 sync.
+gzip_sync() {
+    local content_type="$1" cache="$2"
+    shift 2
+    aws s3 sync "${STAGE_DIR}/" "s3://${BUCKET}/" --delete \
+        --exclude "*" "$@" "${BUILD_ONLY[@]}" \
+        --content-encoding gzip \
+        --content-type "${content_type}" \
+        --cache-control "${cache}"
+}
+
+# Everything that isn't compressible (images, fonts, ...), as-is
+COMPRESSIBLE=(--exclude "*.html" --exclude "*.json" --exclude "*.css" --exclude "*.js" --exclude "*.xml")
+aws s3 sync "${SOURCE_DIR}/" "s3://${BUCKET}/" --delete \
+    "${COMPRESSIBLE[@]}" "${NOT_ASSETS[@]}" "${BUILD_ONLY[@]}" \
+    --cache-control "${DEFAULT_CACHE}"
+aws s3 sync "${SOURCE_DIR}/" "s3://${BUCKET}/" --delete \
+    --exclude "*" --include "assets/*" --include "*/assets/*" --include "css/*" \
+    "${COMPRESSIBLE[@]}" "${BUILD_ONLY[@]}" \
+    --cache-control "${IMMUTABLE_CACHE}"
+
+# Pages, feeds and data
+gzip_sync "${HTML}" "${DEFAULT_CACHE}" --include "*.html"
+gzip_sync "${XML}"  "${DEFAULT_CACHE}" --include "*.xml"
+gzip_sync "${JSON}" "${DEFAULT_CACHE}" --include "*.json" "${NOT_ASSETS[@]}" "${NOT_SW[@]}"
+gzip_sync "${CSS}"  "${DEFAULT_CACHE}" --include "*.css" "${NOT_ASSETS[@]}"
+gzip_sync "${JS}"   "${DEFAULT_CACHE}" --include "*.js" "${NOT_ASSETS[@]}" "${NOT_SW[@]}"
+
+# Content-hashed assets
+for pair in "json:${JSON}" "css:${CSS}" "js:${JS}"; do
+    ext="${pair%%:*}"
+    gzip_sync "${pair#*:}" "${IMMUTABLE_CACHE}" \
+        --include "assets/*.${ext}" --include "*/assets/*.${ext}" --include "css/*.${ext}"
+done
+
+# Service workers and their precache manifests
+gzip_sync "${JS}"   "${NO_CACHE}" --include "sw.js" --include "*/sw.js"
+gzip_sync "${JSON}" "${NO_CACHE}" --include "sw-manifest.json" --include "*/sw-manifest.json"
@@ -0,0 +1,263 @@
+"""
+detail_pages.py - One static page per book and per album for the v4 site.
+
+regenerate_v4_html.py calls write_detail_pages() after the main page. Each
+book gets sites/v4/books/<slug>.html and each album sites/v4/albums/<slug>.html,
+where the slug comes from the title (books) or "artist album" (albums), so it
+survives reordering and unrelated edits to the logs. Entries of the same work
+(a re-read book: same title; a re-listened album: same artist and album)
+share one page that lists every date.
+
+Different works can slugify alike: titles that differ only in punctuation,
+titles with no ASCII letters at all (every one would be "untitled"), or
+titles that only differ past SLUG_MAX. The work logged first keeps the bare
+slug and each later one gets a hash of its own title (or artist and album)
+appended, so adding an entry never renames an existing page.
+
+Rendering is incremental. Every page's input is hashed, and the hashes are kept
+in .cache/detail_pages/state.marshal; only pages whose hash changed (or whose file
+is missing) are rendered, in a process pool when there are enough of them, and
+a rendered page is only written if its bytes differ from the file on disk — so
+a cold cache still leaves unchanged pages untouched. Pages whose slug no longer
+exists are removed.
+
+Not a script — imported by regenerate_v4_html.py.
+"""
+
+import hashlib
+import html
+import marshal
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import cast
+
+from content_model import Album, Book
+from page_template import load_template
+
+BOOKS_DIR = "books"
+ALBUMS_DIR = "albums"
+# Anchored at the repo root, like regenerate_v4_html.CACHE_DIR.
+STATE_PATH = Path(__file__).parent.parent / ".cache" / "detail_pages" / "state.marshal"
+
+# Below this many changed pages, rendering inline beats starting a pool.
+POOL_THRESHOLD = 256
+
+SLUG_MAX = 80
+_NON_SLUG = re.compile(r"[^a-z0-9]+")
+
+# Any edit to this module can change page markup; fold its source into every
+# page hash so the state file never vouches for stale output.
+DETAIL_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:12]
+
+DETAIL_SHELL = """<!DOCTYPE html>
+<html lang="en" data-theme="dark">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{{title}} — Kyle Fring</title>
+    <link rel="stylesheet" href="{{css_href}}">
+</head>
+<body>
+
+    <button class="theme-toggle" id="theme-toggle" aria-label="Toggle theme">☀</button>
+
+    <div class="container">
+        <header>
+            <nav>
+                <a href="../">Kyle Fring</a> <span class="nav-separator">·</span>
+                <a href="{{back_href}}">{{back_label}}</a>
+            </nav>
+        </header>
+
+        <main>
+            <section>
+                <h2>{{heading}}</h2>
+{{body}}
+            </section>
+        </main>
+    </div>
+
+    <script src="{{js_href}}" data-sw="../sw.js"></script>
+</body>
+</html>
+"""
+
+
+def slugify(text: str) -> str:
+    """ASCII, lowercase, hyphen-separated; stable for a given title."""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    slug = _NON_SLUG.sub("-", text.lower()).strip("-")
+    return slug[:SLUG_MAX].rstrip("-") or "untitled"
+
+
+def _paths(directory: str, works: list[str]) -> list[str]:
+    """Page path of each entry, given the text identifying its work.
+
+    Both logs are newest first, so claiming slugs from the end gives the bare
+    slug to the work logged first; a later work whose slug is taken gets its
+    own hash appended (see the module docstring).
+    """
+    owners: dict[str, str] = {}
+    paths: dict[str, str] = {}
+    for work in reversed(works):
+        if work in paths:
+            continue
+        slug = slugify(work)
+        if owners.setdefault(slug, work) != work:
+            slug = f"{slug}-{hashlib.sha256(work.encode('utf-8')).hexdigest()[:8]}"
+            owners[slug] = work
+        paths[work] = f"{directory}/{slug}.html"
+    return [paths[work] for work in works]
+
+
+def book_paths(books: list[Book]) -> list[str]:
+    """Detail page of each book, relative to the site root."""
+    return _paths(BOOKS_DIR, [book.title for book in books])
+
+
+def album_paths(albums: list[Album]) -> list[str]:
+    """Detail page of each album, relative to the site root."""
+    # The separator can't occur in a name, so ("a b", "c") and ("a", "b c")
+    # stay different works; the slug is that of "artist album".
+    works = [f"{album.artist}\0{album.album}" for album in albums]
+    return _paths(ALBUMS_DIR, works)
+
+
+def detail_inputs(books: list[Book], albums: list[Album]) -> dict[str, list[Book | Album]]:
+    """Map each page path (relative to the site root) to the entries it shows."""
+    pages: dict[str, list[Book | Album]] = defaultdict(list)
+    for path, book in zip(book_paths(books), books):
+        pages[path].append(book)
+    for path, album in zip(album_paths(albums), albums):
+        pages[path].append(album)
+    return pages
+
+
+def _row(label: str, value_html: str) -> str:
+    return (
+        f'                <p><span class="muted small">{label}</span><br>{value_html}</p>'
+    )
+
+
+def _link(url: str, text: str) -> str:
+    return f'<a href="{html.escape(url)}" target="_blank">{html.escape(text)}</a>'
+
+
+def render_detail(path: str, entries: list[Book | Album], css_href: str, js_href: str) -> bytes:
+    """Render one detail page. Top-level so the process pool can pickle it."""
+    rows: list[str] = []
+    if path.startswith(f"{BOOKS_DIR}/"):
+        books = cast(list[Book], entries)
+        title = books[0].title
+        read = [str(b.year or b.year_label or "") for b in books]
+        rows.append(_row("Read", html.escape(", ".join(r for r in read if r))))
+        url = next((b.goodreads_url for b in books if b.goodreads_url), None)
+        if url:
+            rows.append(_row("GoodReads", _link(url, "View on GoodReads")))
+        back_href, back_label = "../#bookshelf", "Bookshelf"
+    else:
+        albums = cast(list[Album], entries)
+        first = albums[0]
+        title = f"{first.artist} — {first.album}"
+        rows.append(_row("Artist", html.escape(first.artist)))
+        if first.release_year:
+            rows.append(_row("Released", html.escape(str(first.release_year))))
+        rows.append(_row("Listened", html.escape(", ".join(str(a.listened_date) for a in albums))))
+        duration = [f"{first.tracks} tracks" if first.tracks else "", first.playtime or ""]
+        if any(duration):
+            rows.append(_row("Duration", html.escape(", ".join(d for d in duration if d))))
+        if first.spotify_url:
+            rows.append(_row("Listen", _link(first.spotify_url, "Spotify")))
+        for a in albums:
+            if a.notes:
+                rows.append(f'                <p class="album-note">{html.escape(a.notes)}</p>')
+        back_href, back_label = "../#albums", "Albums"
+
+    return load_template(DETAIL_SHELL).render({
+        "title": html.escape(title),
+        "heading": html.escape(title),
+        "css_href": html.escape(f"../{css_href}"),
+        "js_href": html.escape(f"../{js_href}"),
+        "back_href": back_href,
+        "back_label": back_label,
+        "body": "\n".join(rows),
+    })
+
+
+def _digest(base: "hashlib._Hash", entries: list[Book | Album]) -> bytes:
+    # repr() of the records is deterministic (every field, in declaration
+    # order) and several times cheaper than json.dumps at 50k pages.
+    digest = base.copy()
+    digest.update(repr(entries).encode("utf-8"))
+    return digest.digest()[:8]
+
+
+def _existing_pages(output_dir: Path) -> set[str]:
+    found: set[str] = set()
+    for sub in (BOOKS_DIR, ALBUMS_DIR):
+        directory = output_dir / sub
+        if directory.is_dir():
+            with os.scandir(directory) as it:
+                found.update(f"{sub}/{e.name}" for e in it if e.name.endswith(".html"))
+    return found
+
+
+def write_detail_pages(
+    output_dir: Path,
+    books: list[Book],
+    albums: list[Album],
+    css_href: str,
+    js_href: str,
+    state_path: Path = STATE_PATH,
+    workers: int | None = None,
+) -> dict[str, int]:
+    """Bring output_dir/books/ and output_dir/albums/ up to date; return stats."""
+    pages = detail_inputs(books, albums)
+    base = hashlib.sha256(f"{DETAIL_VERSION}\0{css_href}\0{js_href}\0".encode("utf-8"))
+    hashes = {path: _digest(base, entries) for path, entries in pages.items()}
+    existing = _existing_pages(output_dir)
+
+    # marshal, not JSON: at 50k pages, loading and saving the state would
+    # otherwise cost more than the diff itself.
+    state: dict[str, bytes] = {}
+    if state_path.exists():
+        try:
+            state = cast(dict[str, bytes], marshal.loads(state_path.read_bytes()))
+        except (EOFError, ValueError, TypeError):
+            state = {}
+
+    todo = [p for p in pages if p not in existing or state.get(p) != hashes[p]]
+    args = (todo, [pages[p] for p in todo], repeat(css_href), repeat(js_href))
+    if len(todo) >= POOL_THRESHOLD and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rendered = list(pool.map(render_detail, *args, chunksize=64))
+    else:
+        rendered = list(map(render_detail, *args))
+
+    for sub in (BOOKS_DIR, ALBUMS_DIR):
+        _ = (output_dir / sub).mkdir(parents=True, exist_ok=True)
+    written = 0
+    for path, body in zip(todo, rendered):
+        target = output_dir / path
+        if path in existing and target.read_bytes() == body:
+            continue
+        _ = target.write_bytes(body)
+        written += 1
+
+    removed = 0
+    for stale in existing - pages.keys():
+        (output_dir / stale).unlink()
+        removed += 1
+
+    if hashes != state:
+        _ = state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = state_path.with_suffix(".tmp")
+        _ = tmp.write_bytes(marshal.dumps(hashes))
+        _ = tmp.replace(state_path)
+    return {"pages": len(pages), "rendered": len(todo), "written": written, "removed": removed}
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+dev_server.py - Local preview server for sites/v4 with watch mode and live reload.
+
+Serves sites/v4/ on http://localhost:8000/. With --watch it also polls
+content/*.md and content/brief/*.md, and on a save re-runs only what that
+file feeds — in this process, so parsers, templates and the section cache
+stay warm — then tells every open page to reload over Server-Sent Events:
+
+  content/books.md    parse_books.py   → regenerate_v4_html.render_site()
+  content/albums.md   parse_albums.py  → regenerate_v4_html.render_site()
+  content/now.md      parse_now.py     → regenerate_v4_html.render_site()
+  content/brief/*.md  regenerate_brief_html.build_pages() / write_pages()
+
+HTML is served with a one-line EventSource snippet injected before </body>;
+the files on disk are never modified. The snippet's data-live-reload
+attribute (and the localhost origin) keeps THEME_JS from registering the
+site's service worker, which would otherwise answer reloads from its cache. Polling a dozen mtimes every 50 ms
+keeps the watcher dependency-free, and a rebuild takes tens of milliseconds,
+so save-to-refresh stays well under 200 ms.
+
+career.md is not parsed: nothing renders career.json, and parse_career.py
+doesn't round-trip the current file, so a save would rewrite it lossily.
+
+A save that fails to parse or render (a half-written file, a typo in the
+metadata comment) is reported and skipped, whatever it raises; the next good
+save rebuilds as usual.
+
+Usage:
+    python infrastructure/dev_server.py
+    python infrastructure/dev_server.py --watch
+    python infrastructure/dev_server.py --watch --port 8080
+"""
+
+import argparse
+import functools
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from itertools import chain
+from pathlib import Path
+from typing import Callable
+
+from parse_albums import MarkdownToJSONParser
+from parse_books import BooksMarkdownParser
+from parse_now import NowMarkdownParser
+from regenerate_brief_html import (
+    CONTENT_DIR as BRIEF_CONTENT_DIR,
+    OUTPUT_DIR as BRIEF_OUTPUT_DIR,
+    build_pages,
+    discover_weeks,
+    write_pages,
+)
+from regenerate_v4_html import SectionCache, render_site
+
+CONTENT_DIR = Path("content")
+SITE_DIR = Path("sites/v4")
+
+RELOAD_PATH = "/__reload"
+RELOAD_SNIPPET = (
+    f'<script data-live-reload>new EventSource("{RELOAD_PATH}").onmessage = () => location.reload();</script>\n'
+).encode("utf-8")
+
+# Seconds between keep-alive comments on an idle event stream.
+KEEPALIVE = 15.0
+
+
+def _parse_books() -> None:
+    parser = BooksMarkdownParser(CONTENT_DIR)
+    parser.save_books_json(parser.parse_books())
+
+
+def _parse_albums() -> None:
+    parser = MarkdownToJSONParser(CONTENT_DIR)
+    parser.save_albums_json(parser.parse_albums())
+
+
+def _parse_now() -> None:
+    parser = NowMarkdownParser(CONTENT_DIR)
+    parser.save_now_json(parser.parse_now())
+
+
+# markdown file → (parser, whether its JSON feeds the v4 page)
+PARSERS: dict[str, tuple[Callable[[], None], bool]] = {
+    "books.md": (_parse_books, True),
+    "albums.md": (_parse_albums, True),
+    "now.md": (_parse_now, True),
+}
+
+
+class Reloader:
+    """A build counter that event-stream handlers block on."""
+
+    def __init__(self):
+        self._changed = threading.Condition()
+        self.generation = 0
+
+    def notify(self) -> None:
+        with self._changed:
+            self.generation += 1
+            self._changed.notify_all()
+
+    def wait(self, seen: int, timeout: float) -> int:
+        """Block until the generation moves past `seen` (or timeout); return it."""
+        with self._changed:
+            _ = self._changed.wait_for(lambda: self.generation != seen, timeout)
+            return self.generation
+
+
+class DevHandler(SimpleHTTPRequestHandler):
+    """Static files from SITE_DIR, HTML with the reload snippet, and the event stream."""
+
+    reloader: Reloader
+
+    def do_GET(self):
+        if self.path == RELOAD_PATH:
+            self._stream_events()
+            return
+        path = Path(self.translate_path(self.path))
+        if path.is_dir() and self.path.endswith("/"):
+            path = path / "index.html"
+        if path.suffix != ".html" or not path.is_file():
+            super().do_GET()
+            return
+        body = path.read_bytes()
+        end = body.rfind(b"</body>")
+        body = body[:end] + RELOAD_SNIPPET + body[end:] if end != -1 else body + RELOAD_SNIPPET
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        _ = self.wfile.write(body)
+
+    def _stream_events(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        seen = self.reloader.generation
+        try:
+            while True:
+                current = self.reloader.wait(seen, KEEPALIVE)
+                _ = self.wfile.write(b"data: reload\n\n" if current != seen else b": ping\n\n")
+                self.wfile.flush()
+                seen = current
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def log_message(self, format, *args):
+        pass  # one line per asset request drowns out the rebuild log
+
+
+def snapshot() -> dict[Path, int]:
+    """mtime of every watched markdown file."""
+    files = chain(CONTENT_DIR.glob("*.md"), BRIEF_CONTENT_DIR.glob("*.md"))
+    return {path: path.stat().st_mtime_ns for path in files}
+
+
+def render(v4: bool, brief: bool, cache: SectionCache) -> bool:
+    """Re-render the v4 site and/or the brief; True if either wrote a page."""
+    changed = False
+    if v4:
+        stats = render_site(CONTENT_DIR, SITE_DIR, cache, log=lambda _line: None)
+        changed = bool(stats["changed"])
+    if brief:
+        weeks = discover_weeks()
+        if weeks:
+            pages, css = build_pages(weeks)
+            _css_href, _js_href, written = write_pages(weeks, pages, css, BRIEF_OUTPUT_DIR)
+            changed = changed or written > 0
+    return changed
+
+
+def rebuild(changed: set[Path], cache: SectionCache) -> bool:
+    """Re-run the parsers and renderers the changed files feed; True if any
+    page was rewritten (and open browsers should reload)."""
+    v4 = False
+    brief = False
+    for path in sorted(changed):
+        if path.parent == BRIEF_CONTENT_DIR:
+            brief = True
+        elif path.name in PARSERS and path.exists():
+            parse, renders = PARSERS[path.name]
+            parse()
+            v4 = v4 or renders
+    return render(v4, brief, cache)
+
+
+def watch(reloader: Reloader, interval: float) -> None:
+    cache = SectionCache()
+    seen = snapshot()
+    # Render once up front: the served tree matches the JSON on disk, and the
+    # first save doesn't pay for cold imports and an empty section cache.
+    try:
+        _ = render(True, True, cache)
+    except Exception as e:
+        print(f"  ✗ initial build: {type(e).__name__}: {e}", file=sys.stderr)
+    while True:
+        time.sleep(interval)
+        current = snapshot()
+        changed = {p for p in current.keys() | seen.keys() if current.get(p) != seen.get(p)}
+        if not changed:
+            continue
+        seen = current
+        names = ", ".join(sorted(str(p.relative_to(CONTENT_DIR)) for p in changed))
+        start = time.perf_counter()
+        try:
+            reloaded = rebuild(changed, cache)
+        except Exception as e:
+            # Anything a half-edited file can raise; letting it escape would
+            # end this thread while the server keeps serving stale pages.
+            print(f"  ✗ {names}: {type(e).__name__}: {e}", file=sys.stderr)
+            continue
+        elapsed = (time.perf_counter() - start) * 1000
+        if reloaded:
+            reloader.notify()
+        print(f"  ↻ {names} rebuilt in {elapsed:.0f} ms{'' if reloaded else ' (no page changes)'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve sites/v4 locally, optionally rebuilding on save")
+    _ = parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Rebuild on changes to content/*.md and content/brief/*.md and live-reload open pages",
+    )
+    _ = parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000)")
+    _ = parser.add_argument("--bind", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    _ = parser.add_argument(
+        "--interval", type=float, default=0.05, help="Seconds between polls in --watch mode (default: 0.05)"
+    )
+    args = parser.parse_args()
+
+    if not SITE_DIR.is_dir():
+        print(f"ERROR: {SITE_DIR} not found — run from the repository root", file=sys.stderr)
+        return 1
+
+    reloader = Reloader()
+    DevHandler.reloader = reloader
+    server = ThreadingHTTPServer(
+        (args.bind, args.port), functools.partial(DevHandler, directory=str(SITE_DIR))
+    )
+    server.daemon_threads = True
+
+    print(f"Serving {SITE_DIR}/ at http://{args.bind}:{args.port}/")
+    if args.watch:
+        print(f"  Watching {CONTENT_DIR}/*.md and {BRIEF_CONTENT_DIR}/*.md (Ctrl-C to stop)")
+        threading.Thread(target=watch, args=(reloader, args.interval), daemon=True).start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""
+facet_index.py - Precomputed browse facets for books and albums.
+
+The v4 page only groups albums by listened year and books by read year.
+This module precomputes the other ways to slice the logs, so a facet view is
+one small fetch instead of the browser re-grouping all of albums.json:
+
+  albums/artist     artist → albums
+  albums/decade     release decade ("1990s") → albums
+  albums/listened   listened year → albums
+  books/read        read year ("2024", "<2015") → books
+  books/letter      first letter of the title → books
+
+(books.json carries no author or publication year, so read year and title
+letter are the book equivalents.)
+
+Layout under sites/v4/facets/:
+  index.json                           {kind: {facet: {slug: [label, count, file]}}}
+  <kind>/<facet>/<slug>.<hash>.json    {"label": ..., "items": [...]}
+
+Album items are [artist, album, releaseYear, listenedDate, spotifyUrl, page],
+book items [title, read, goodreadsUrl, page], where page is the item's
+detail page (detail_pages.py). Value files are content-hashed, like the
+search shards, so unchanged values keep their name and cache; stale ones are
+removed. With pages=True each value (and each facet) also gets a static HTML
+page next to its JSON.
+
+Not a script — imported by regenerate_v4_html.py.
+"""
+
+import hashlib
+import html
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable
+
+from content_model import Album, Book
+from detail_pages import album_paths, book_paths, slugify
+from page_template import load_template
+from site_files import write_if_changed
+
+FACET_DIR = "facets"
+MANIFEST_NAME = "index.json"
+
+FACET_SHELL = """<!DOCTYPE html>
+<html lang="en" data-theme="dark">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{{title}} — Kyle Fring</title>
+    <link rel="stylesheet" href="{{css_href}}">
+</head>
+<body>
+
+    <button class="theme-toggle" id="theme-toggle" aria-label="Toggle theme">☀</button>
+
+    <div class="container">
+        <header>
+            <nav>
+                <a href="{{root}}">Kyle Fring</a> <span class="nav-separator">·</span>
+                <a href="{{up_href}}">{{up_label}}</a>
+            </nav>
+        </header>
+
+        <main>
+            <section>
+                <h2>{{title}}</h2>
+                <p class="muted small">{{summary}}</p>
+{{body}}
+            </section>
+        </main>
+    </div>
+
+    <script src="{{js_href}}" data-sw="{{root}}sw.js"></script>
+</body>
+</html>
+"""
+
+FACET_LABELS = {
+    ("albums", "artist"): "Albums by artist",
+    ("albums", "decade"): "Albums by release decade",
+    ("albums", "listened"): "Albums by year listened",
+    ("books", "read"): "Books by year read",
+    ("books", "letter"): "Books by title",
+}
+
+
+def _value_slug(label: str) -> str:
+    slug = slugify(label)
+    return f"before-{slug}" if label.startswith("<") else slug
+
+
+def _decade(album: Album) -> str:
+    year = album.release_year
+    return f"{int(year) // 10 * 10}s" if year else "Unknown"
+
+
+def _letter(book: Book) -> str:
+    first = slugify(book.title)[:1]
+    return first.upper() if first.isalpha() else "#"
+
+
+ALBUM_FACETS: dict[str, Callable[[Album], str]] = {
+    "artist": lambda a: a.artist,
+    "decade": _decade,
+    "listened": lambda a: str(a.listened_date)[:4],
+}
+
+BOOK_FACETS: dict[str, Callable[[Book], str]] = {
+    "read": lambda b: str(b.year or b.year_label or "Unknown"),
+    "letter": _letter,
+}
+
+
+def _album_item(album: Album, page: str) -> list[object]:
+    return [
+        album.artist,
+        album.album,
+        album.release_year,
+        album.listened_date,
+        album.spotify_url,
+        page,
+    ]
+
+
+def _book_item(book: Book, page: str) -> list[object]:
+    return [
+        book.title,
+        book.year or book.year_label,
+        book.goodreads_url,
+        page,
+    ]
+
+
+def build_facets(
+    books: list[Book], albums: list[Album]
+) -> dict[str, dict[str, dict[str, tuple[str, list[list[object]]]]]]:
+    """{kind: {facet: {slug: (label, items)}}}, values in first-seen order."""
+    out: dict[str, dict[str, dict[str, tuple[str, list[list[object]]]]]] = {}
+    for kind, entries, paths, facets, item in (
+        ("albums", albums, album_paths(albums), ALBUM_FACETS, _album_item),
+        ("books", books, book_paths(books), BOOK_FACETS, _book_item),
+    ):
+        items = [item(e, p) for e, p in zip(entries, paths)]
+        out[kind] = {}
+        for facet, key in facets.items():
+            labels: dict[str, str] = {}
+            values: dict[str, list[list[object]]] = defaultdict(list)
+            for entry, row in zip(entries, items):
+                label = key(entry)
+                slug = _value_slug(label)
+                _ = labels.setdefault(slug, label)
+                values[slug].append(row)
+            out[kind][facet] = {slug: (labels[slug], values[slug]) for slug in values}
+    return out
+
+
+def _item_html(kind: str, row: list[object], root: str) -> str:
+    if kind == "albums":
+        artist, album, year, listened, _url, page = row
+        text = f"{artist} — {album}" + (f" ({year})" if year else "")
+        meta = f"listened {listened}"
+    else:
+        title, read, _url, page = row
+        text, meta = str(title), f"read {read}" if read else ""
+    return (
+        f'                <a href="{html.escape(root + str(page))}" class="{kind[:-1]}-title">{html.escape(text)}</a>'
+        + (f' <span class="muted small">{html.escape(meta)}</span>' if meta else "")
+    )
+
+
+def write_facet_indexes(
+    output_dir: Path,
+    books: list[Book],
+    albums: list[Album],
+    pages: bool = False,
+    css_href: str = "",
+    js_href: str = "",
+) -> dict[str, int]:
+    """Write facet JSON (and with pages=True, HTML) under output_dir/facets/."""
+    facet_root = output_dir / FACET_DIR
+    facets = build_facets(books, albums)
+    manifest: dict[str, dict[str, dict[str, list[object]]]] = {}
+    keep: set[Path] = {facet_root / MANIFEST_NAME}
+    written = 0
+    values = 0
+    template = load_template(FACET_SHELL) if pages else None
+
+    for kind, by_facet in facets.items():
+        manifest[kind] = {}
+        for facet, by_value in by_facet.items():
+            directory = facet_root / kind / facet
+            _ = directory.mkdir(parents=True, exist_ok=True)
+            entries: dict[str, list[object]] = {}
+            for slug, (label, items) in by_value.items():
+                body = json.dumps({"label": label, "items": items}, ensure_ascii=False, separators=(",", ":"))
+                digest = hashlib.sha256(body.encode("utf-8")).hexdigest()[:8]
+                name = f"{slug}.{digest}.json"
+                path = directory / name
+                keep.add(path)
+                if not path.exists():
+                    _ = path.write_text(body)
+                    written += 1
+                entries[slug] = [label, len(items), f"{kind}/{facet}/{name}"]
+                values += 1
+            manifest[kind][facet] = entries
+
+            if template is None:
+                continue
+            # Pages sit three levels below the site root: facets/<kind>/<facet>/.
+            root = "../../../"
+            common = {
+                "root": root,
+                "css_href": html.escape(root + css_href),
+                "js_href": html.escape(root + js_href),
+            }
+            facet_title = FACET_LABELS[(kind, facet)]
+            for slug, (label, items) in by_value.items():
+                page = directory / f"{slug}.html"
+                keep.add(page)
+                written += write_if_changed(page, template.render({
+                    **common,
+                    "title": html.escape(f"{facet_title}: {label}"),
+                    "up_href": "index.html",
+                    "up_label": html.escape(facet_title),
+                    "summary": f"{len(items)} {kind if len(items) != 1 else kind[:-1]}",
+                    "body": "\n".join(_item_html(kind, row, root) for row in items),
+                }))
+            index = directory / "index.html"
+            keep.add(index)
+            links = "\n".join(
+                f'                <a href="{slug}.html" class="{kind[:-1]}-title">{html.escape(label)}'
+                f' <span class="muted small">({len(items)})</span></a>'
+                for slug, (label, items) in sorted(by_value.items(), key=lambda kv: kv[1][0].lower())
+            )
+            written += write_if_changed(index, template.render({
+                **common,
+                "title": html.escape(facet_title),
+                "up_href": root + ("#albums" if kind == "albums" else "#bookshelf"),
+                "up_label": "Albums" if kind == "albums" else "Bookshelf",
+                "summary": f"{len(by_value)} values",
+                "body": links,
+            }))
+
+    removed = 0
+    if facet_root.is_dir():
+        for stale in facet_root.rglob("*"):
+            if stale.is_file() and stale not in keep:
+                stale.unlink()
+                removed += 1
+
+    _ = (facet_root / MANIFEST_NAME).write_text(
+        json.dumps(manifest, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    )
+    return {"values": values, "written": written, "removed": removed}
@@ -20,6 +20,15 @@ from pathlib import Path
 from typing import Dict, List, Any
 import argparse
 
+from content_model import AlbumLog, BookLog
+
+
+def markdown_meta(meta: dict) -> dict:
+    """meta for the markdown's JSON comment. The parsers derive "stats"
+    (content_stats.py) from the entries on every run, so it stays out of the
+    file people edit."""
+    return {k: v for k, v in meta.items() if k != "stats"}
+
 
 class JSONToMarkdownConverter:
     """Convert fring.io JSON data to human-readable Markdown"""
@@ -29,14 +38,13 @@ class JSONToMarkdownConverter:
 
     def convert_books(self, output_file: Path = None) -> str:
         """Convert books.json to books.md"""
-        with open(self.content_dir / "books.json") as f:
-            data = json.load(f)
+        log = BookLog.load(self.content_dir / "books.json")
 
         md = []
 
         # JSON metadata
         md.append("<!--")
-        md.append(json.dumps({"meta": data["meta"]}, indent=2))
+        md.append(json.dumps({"meta": markdown_meta(log.meta)}, indent=2))
         md.append("-->\n")
 
         # Title
@@ -47,9 +55,9 @@ class JSONToMarkdownConverter:
         books_by_year = {}
         prior_books = []
 
-        for book in data["books"]:
-            if book["year"]:
-                year = book["year"]
+        for book in log.books:
+            if book.year:
+                year = book.year
                 if year not in books_by_year:
                     books_by_year[year] = []
                 books_by_year[year].append(book)
@@ -58,9 +66,9 @@ class JSONToMarkdownConverter:
 
         def book_entry(book):
             # Preserve goodreadsUrl as a markdown link for lossless round-trips
-            if book.get("goodreadsUrl"):
-                return f"- [{book['title']}]({book['goodreadsUrl']})"
-            return f"- {book['title']}"
+            if book.goodreads_url:
+                return f"- [{book.title}]({book.goodreads_url})"
+            return f"- {book.title}"
 
         # Recent years (descending)
         for year in sorted(books_by_year.keys(), reverse=True):
@@ -88,7 +96,7 @@ class JSONToMarkdownConverter:
 
         if output_file:
             output_file.write_text(content)
-            print(f"✓ Exported books.md ({len(data['books'])} books)")
+            print(f"✓ Exported books.md ({len(log.books)} books)")
 
         return content
 
@@ -212,14 +220,13 @@ class JSONToMarkdownConverter:
 
     def convert_albums(self, output_file: Path = None) -> str:
         """Convert albums.json to albums.md"""
-        with open(self.content_dir / "albums.json") as f:
-            data = json.load(f)
+        log = AlbumLog.load(self.content_dir / "albums.json")
 
         md = []
 
         # JSON metadata
         md.append("<!--")
-        md.append(json.dumps({"meta": data["meta"]}, indent=2))
+        md.append(json.dumps({"meta": markdown_meta(log.meta)}, indent=2))
         md.append("-->\n")
 
         # Title
@@ -228,8 +235,8 @@ class JSONToMarkdownConverter:
 
         # Group by year
         albums_by_year = {}
-        for album in data["albums"]:
-            year = album["listenedDate"][:4]  # Extract YYYY from YYYY-MM-DD
+        for album in log.albums:
+            year = album.listened_date[:4]  # Extract YYYY from YYYY-MM-DD
             if year not in albums_by_year:
                 albums_by_year[year] = []
             albums_by_year[year].append(album)
@@ -241,29 +248,29 @@ class JSONToMarkdownConverter:
 
             for album in albums:
                 # Date and artist/album (use YYYY-MM-DD format for lossless round-trip)
-                listened_date = album["listenedDate"]
-                md.append(f"### [{listened_date}] {album['artist']} - {album['album']}")
+                listened_date = album.listened_date
+                md.append(f"### [{listened_date}] {album.artist} - {album.album}")
 
                 # Release year
-                if album.get("releaseYear"):
-                    md.append(f"**Released:** {album['releaseYear']}")
+                if album.release_year:
+                    md.append(f"**Released:** {album.release_year}")
 
                 # Spotify link
-                if album.get("spotifyUrl"):
-                    md.append(f"**Listen:** [Spotify]({album['spotifyUrl']})")
+                if album.spotify_url:
+                    md.append(f"**Listen:** [Spotify]({album.spotify_url})")
 
                 # Tracks and playtime
                 metadata_parts = []
-                if album.get("tracks"):
-                    metadata_parts.append(f"{album['tracks']} tracks")
-                if album.get("playtime"):
-                    metadata_parts.append(album["playtime"])
+                if album.tracks:
+                    metadata_parts.append(f"{album.tracks} tracks")
+                if album.playtime:
+                    metadata_parts.append(album.playtime)
                 if metadata_parts:
                     md.append(f"**Duration:** {', '.join(metadata_parts)}")
 
                 # Notes
-                if album.get("notes"):
-                    md.append(f"\n{album['notes']}\n")
+                if album.notes:
+                    md.append(f"\n{album.notes}\n")
                 else:
                     md.append("")
 
@@ -280,7 +287,7 @@ class JSONToMarkdownConverter:
 
         if output_file:
             output_file.write_text(content)
-            print(f"✓ Exported albums.md ({len(data['albums'])} albums)")
+            print(f"✓ Exported albums.md ({len(log.albums)} albums)")
 
         return content
 
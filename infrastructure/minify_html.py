@@ -0,0 +1,114 @@
+"""
+minify_html.py - Whitespace/comment minifier for the generated pages.
+
+regenerate_v4_html.py and regenerate_brief_html.py indent their output for
+readable diffs (the 16-space section indent, the indented shells). With
+--minify they pass each finished page through minify_html() and the
+stylesheet through minify_css() before hashing it into assets/.
+
+The rules are deliberately conservative, so a minified page renders exactly
+like the original:
+
+  - <pre>, <textarea>, <script> and <style> contents are never collapsed
+    (inline <script> only loses indentation, blank lines and whole-line //
+    comments; <style> goes through minify_css()).
+  - Only whitespace that contains a line break — i.e. source formatting —
+    is touched. Whitespace inside a line (inline text, the sparkline's
+    "2019 ▁ | 2020 █" runs) is left byte-for-byte.
+  - A formatting break next to a block-level tag is dropped; anywhere else
+    (between inline elements, inside text) it becomes one space.
+  - HTML comments go, except conditional comments.
+
+Both functions are a handful of regex passes — a brief week takes well under
+a millisecond, so it is cheap enough to run on every page of every build.
+
+Not a script — imported by regenerate_v4_html.py and regenerate_brief_html.py.
+"""
+
+import re
+
+# Tags whose boxes start on a new line: whitespace touching them never renders.
+BLOCK_TAGS = frozenset(
+    """
+    html head body title meta link base script style noscript
+    div section main header footer nav aside article p blockquote figure
+    ul ol li dl dt dd h1 h2 h3 h4 h5 h6 details summary hr br
+    table thead tbody tfoot tr td th form
+    """.split()
+)
+
+_RAW = re.compile(r"(<(pre|textarea|script|style)\b[^>]*>)(.*?)(</\2\s*>)", re.S | re.I)
+_COMMENT = re.compile(r"<!--(?!\[if).*?-->", re.S)
+_BREAK = re.compile(r"[ \t\r\f]*\n\s*")
+_PLACEHOLDER = re.compile(r"\0(\d+)\0")
+_TAG_NAME = re.compile(r"</?([A-Za-z][A-Za-z0-9]*)")
+
+_CSS_STRING = re.compile(r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')")
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE = re.compile(r"\s+")
+_CSS_PUNCT = re.compile(r" ?([{};,>]) ?")
+_CSS_COLON = re.compile(r": ")
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and formatting whitespace; string literals are kept as-is."""
+    parts = _CSS_STRING.split(_CSS_COMMENT.sub("", css))
+    for i in range(0, len(parts), 2):
+        text = _CSS_SPACE.sub(" ", parts[i])
+        text = _CSS_PUNCT.sub(r"\1", text)
+        parts[i] = _CSS_COLON.sub(":", text)
+    return "".join(parts).replace(";}", "}").strip()
+
+
+def _minify_script(js: str) -> str:
+    lines = (line.strip() for line in js.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+def _tag_before(text: str, end: int) -> str | None:
+    if end == 0 or text[end - 1] != ">":
+        return None
+    match = _TAG_NAME.match(text, text.rfind("<", 0, end))
+    return match.group(1).lower() if match else None
+
+
+def _tag_after(text: str, start: int) -> str | None:
+    match = _TAG_NAME.match(text, start)
+    return match.group(1).lower() if match else None
+
+
+def _collapse(text: str) -> str:
+    text = _COMMENT.sub("", text)
+
+    def replace(m: re.Match[str]) -> str:
+        if _tag_before(text, m.start()) in BLOCK_TAGS or _tag_after(text, m.end()) in BLOCK_TAGS:
+            return ""
+        return " "
+
+    return _BREAK.sub(replace, text)
+
+
+def minify_html(page: str) -> str:
+    """Collapse formatting whitespace and comments; see the module docstring."""
+    # Raw-text bodies are swapped for \0<n>\0 placeholders so the collapse
+    # pass still sees their tags but never their contents.
+    bodies: list[str] = []
+
+    def stash(m: re.Match[str]) -> str:
+        open_tag, name, body, close_tag = m.groups()
+        name = name.lower()
+        if name == "style":
+            body = minify_css(body)
+        elif name == "script" and "src=" not in open_tag:
+            body = _minify_script(body)
+        bodies.append(body)
+        return f"{open_tag}\0{len(bodies) - 1}\0{close_tag}"
+
+    collapsed = _collapse(_RAW.sub(stash, page))
+    return _PLACEHOLDER.sub(lambda m: bodies[int(m.group(1))], collapsed).strip() + "\n"
+
+
+def format_saving(before: int, after: int) -> str:
+    """"46,735 → 39,038 bytes (-16.5%)" for the renderers' per-page report."""
+    percent = 100 * (before - after) / before if before else 0.0
+    return f"{before:,} → {after:,} bytes (-{percent:.1f}%)"
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+page_budget.py - Check generated pages against page-weight and DOM budgets.
+
+Runs after regenerate_v4_html.py / regenerate_brief_html.py. Every HTML page
+under the site root that has a budget in page_budgets.json is parsed and
+measured:
+
+  - rawBytes / gzipBytes (and brBytes when brotli is installed)
+  - domNodes (elements) and maxDepth (deepest element nesting), counted as a
+    scripting browser builds them — <noscript> content is bytes, not DOM
+  - inlineCssBytes (<style> blocks + style="" attributes)
+  - inlineJsBytes (<script> blocks without src + on*="" handlers)
+
+Each <section id="..."> (#now, #bookshelf, #albums, ...) is also broken out
+with its own raw/gzip bytes and node count, so a regression points at the
+part of the page to optimize.
+
+page_budgets.json maps a page glob (relative to the site root, first match
+wins) to the limits for any of the metrics above, plus optional per-section
+limits under "sections". The script exits 1 if any limit is exceeded, so it
+can gate the content/brief pipelines.
+
+Usage:
+    python infrastructure/page_budget.py sites/v4
+    python infrastructure/page_budget.py sites/v4 --json
+    python infrastructure/page_budget.py sites/v4 --budgets my_budgets.json
+"""
+
+import argparse
+import gzip
+import json
+import sys
+from fnmatch import fnmatch
+from html.parser import HTMLParser
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_BUDGETS = Path(__file__).with_name("page_budgets.json")
+
+VOID_ELEMENTS = frozenset(
+    "area base br col embed hr img input link meta param source track wbr".split()
+)
+
+METRICS = ("rawBytes", "gzipBytes", "brBytes", "domNodes", "maxDepth", "inlineCssBytes", "inlineJsBytes")
+
+
+def _weight(text: str) -> dict[str, int]:
+    data = text.encode("utf-8")
+    weight = {"rawBytes": len(data), "gzipBytes": len(gzip.compress(data, compresslevel=9, mtime=0))}
+    if brotli is not None:
+        weight["brBytes"] = len(brotli.compress(data, quality=11))
+    return weight
+
+
+class PageAnalyzer(HTMLParser):
+    """Single pass over a page: node counts, depth, inline code, section spans."""
+
+    def __init__(self, source: str):
+        super().__init__(convert_charrefs=True)
+        self.source = source
+        self.line_starts = [0]
+        for i, ch in enumerate(source):
+            if ch == "\n":
+                self.line_starts.append(i + 1)
+
+        self.nodes = 0
+        self.max_depth = 0
+        self.inline_css = 0
+        self.inline_js = 0
+        # (tag, section id or None, start offset, node count at start)
+        self.stack: list[tuple[str, str | None, int, int]] = []
+        self.sections: dict[str, dict[str, int]] = {}
+        self._inline: str | None = None  # "css" | "js" while inside <style>/<script>
+        self._noscript = 0
+
+    def _offset(self) -> int:
+        line, col = self.getpos()
+        return self.line_starts[line - 1] + col
+
+    def handle_starttag(self, tag, attrs):
+        if self._noscript:
+            # A scripting browser keeps <noscript> content as text, not DOM.
+            self._noscript += tag == "noscript"
+            return
+        self.nodes += 1
+        for name, value in attrs:
+            if value is None:
+                continue
+            if name == "style":
+                self.inline_css += len(value.encode("utf-8"))
+            elif name.startswith("on"):
+                self.inline_js += len(value.encode("utf-8"))
+        attr_map = dict(attrs)
+        if tag == "style":
+            self._inline = "css"
+        elif tag == "script" and not attr_map.get("src"):
+            self._inline = "js"
+        if tag in VOID_ELEMENTS:
+            self.max_depth = max(self.max_depth, len(self.stack) + 1)
+            return
+        if tag == "noscript":
+            self._noscript = 1
+        section = attr_map.get("id") if tag == "section" else None
+        self.stack.append((tag, section, self._offset(), self.nodes))
+        self.max_depth = max(self.max_depth, len(self.stack))
+
+    def handle_startendtag(self, tag, attrs):
+        if self._noscript:
+            return
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS and self.stack and self.stack[-1][0] == tag:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        if self._noscript:
+            self._noscript -= tag == "noscript"
+            if self._noscript:
+                return
+        if tag in ("style", "script"):
+            self._inline = None
+        # Tolerate implicitly closed elements (<p>, <li>): unwind to the match.
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                _, section, start, nodes_before = self.stack[i]
+                del self.stack[i:]
+                if section:
+                    end = self.source.find(">", self._offset()) + 1
+                    entry = _weight(self.source[start:end])
+                    entry["domNodes"] = self.nodes - nodes_before + 1
+                    self.sections[section] = entry
+                return
+
+    def handle_data(self, data):
+        if self._inline == "css":
+            self.inline_css += len(data.encode("utf-8"))
+        elif self._inline == "js":
+            self.inline_js += len(data.encode("utf-8"))
+
+
+def analyze_page(path: Path) -> dict[str, object]:
+    source = path.read_text()
+    parser = PageAnalyzer(source)
+    parser.feed(source)
+    parser.close()
+    report: dict[str, object] = dict(_weight(source))
+    report.update({
+        "domNodes": parser.nodes,
+        "maxDepth": parser.max_depth,
+        "inlineCssBytes": parser.inline_css,
+        "inlineJsBytes": parser.inline_js,
+        "sections": parser.sections,
+    })
+    return report
+
+
+def budget_for(rel: str, budgets: dict[str, dict]) -> dict | None:
+    for pattern, budget in budgets.items():
+        if fnmatch(rel, pattern):
+            return budget
+    return None
+
+
+def check(report: dict[str, object], budget: dict) -> list[str]:
+    """Human-readable list of exceeded limits (empty when within budget)."""
+    failures = []
+    for metric in METRICS:
+        if metric in budget and metric in report and report[metric] > budget[metric]:
+            failures.append(f"{metric} {report[metric]:,} > {budget[metric]:,}")
+    sections = report["sections"]
+    for name, limits in budget.get("sections", {}).items():
+        measured = sections.get(name)
+        if measured is None:
+            continue
+        for metric, limit in limits.items():
+            if metric in measured and measured[metric] > limit:
+                failures.append(f"#{name} {metric} {measured[metric]:,} > {limit:,}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check generated pages against weight/DOM budgets")
+    parser.add_argument("root", type=Path, help="Site root, e.g. sites/v4")
+    parser.add_argument(
+        "--budgets", type=Path, default=DEFAULT_BUDGETS,
+        help=f"Budget file (default: {DEFAULT_BUDGETS.name} next to this script)")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args()
+
+    if not args.root.is_dir():
+        print(f"ERROR: {args.root} is not a directory", file=sys.stderr)
+        return 1
+    budgets = json.loads(args.budgets.read_text())
+
+    reports = {}
+    failed = 0
+    for path in sorted(args.root.rglob("*.html")):
+        rel = path.relative_to(args.root).as_posix()
+        budget = budget_for(rel, budgets)
+        if budget is None:
+            continue
+        report = analyze_page(path)
+        failures = check(report, budget)
+        report["failures"] = failures
+        reports[rel] = report
+        failed += bool(failures)
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+        return 1 if failed else 0
+
+    print(f"Page budgets ({args.root})")
+    print("=" * 50)
+    for rel, r in reports.items():
+        mark = "✗" if r["failures"] else "✓"
+        print(
+            f"  {mark} {rel:<22} {r['rawBytes'] / 1024:7.1f} KB raw {r['gzipBytes'] / 1024:6.1f} KB gz"
+            f"  {r['domNodes']:>5} nodes  depth {r['maxDepth']:>2}"
+            f"  inline css {r['inlineCssBytes']:,} B js {r['inlineJsBytes']:,} B"
+        )
+        for name, s in r["sections"].items():
+            print(
+                f"      #{name:<19} {s['rawBytes'] / 1024:7.1f} KB raw {s['gzipBytes'] / 1024:6.1f} KB gz"
+                f"  {s['domNodes']:>5} nodes"
+            )
+        for failure in r["failures"]:
+            print(f"      over budget: {failure}")
+
+    if failed:
+        print(f"\n✗ {failed} page(s) over budget", file=sys.stderr)
+        return 1
+    print(f"\n✓ {len(reports)} page(s) within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+page_template.py - Precompiled page shells for the v4 and brief renderers.
+
+A shell is plain HTML with named slots written as {{name}}. Literal braces
+need no escaping (unlike str.format / f-strings), so inline CSS or JS can
+sit in a shell untouched. compile_template() splits the shell once into
+pre-encoded static byte chunks and the slot names between them;
+load_template() memoizes that per process and caches it on disk under
+.cache/templates/, keyed by a hash of the shell source. Rendering is then a
+single writelines() of the static chunks interleaved with the slot values.
+
+A slot value can be a str, bytes, or an iterable of str/bytes chunks — the
+last is consumed lazily, so a streamed section is written as it is produced
+and never joined in memory.
+
+Not a script — imported by regenerate_v4_html.py and regenerate_brief_html.py.
+"""
+
+import hashlib
+import marshal
+import os
+import re
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Mapping, NamedTuple, Union
+
+# Anchored at the repo root, like regenerate_v4_html.CACHE_DIR.
+TEMPLATE_CACHE_DIR = Path(__file__).parent.parent / ".cache" / "templates"
+
+SLOT = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+
+SlotValue = Union[str, bytes, Iterable[Union[str, bytes]]]
+
+
+class Template(NamedTuple):
+    chunks: tuple[bytes, ...]  # static text; always len(slots) + 1 entries
+    slots: tuple[str, ...]
+
+    def iter_bytes(self, values: Mapping[str, SlotValue]) -> Iterator[bytes]:
+        """Yield the rendered page as encoded chunks."""
+        missing = [name for name in self.slots if name not in values]
+        if missing:
+            raise KeyError(f"no value for template slot(s): {', '.join(sorted(set(missing)))}")
+        chunks = self.chunks
+        for i, name in enumerate(self.slots):
+            yield chunks[i]
+            value = values[name]
+            if isinstance(value, bytes):
+                yield value
+            elif isinstance(value, str):
+                yield value.encode("utf-8")
+            else:
+                for part in value:
+                    yield part if isinstance(part, bytes) else part.encode("utf-8")
+        yield chunks[-1]
+
+    def write(self, out: IO[bytes], values: Mapping[str, SlotValue]) -> None:
+        """Stream the rendered page into a binary file handle."""
+        out.writelines(self.iter_bytes(values))
+
+    def render(self, values: Mapping[str, SlotValue]) -> bytes:
+        return b"".join(self.iter_bytes(values))
+
+
+def compile_template(source: str) -> Template:
+    """Split a shell into static byte chunks and the slot names between them."""
+    parts = SLOT.split(source)
+    return Template(
+        chunks=tuple(p.encode("utf-8") for p in parts[0::2]),
+        slots=tuple(parts[1::2]),
+    )
+
+
+_compiled: dict[str, Template] = {}
+
+
+def load_template(source: str, cache_dir: Path | None = TEMPLATE_CACHE_DIR) -> Template:
+    """compile_template(), memoized in-process and (with cache_dir) on disk."""
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+    template = _compiled.get(digest)
+    if template is not None:
+        return template
+
+    path = cache_dir / f"{digest}.marshal" if cache_dir is not None else None
+    if path is not None:
+        try:
+            chunks, slots = marshal.loads(path.read_bytes())
+            template = Template(chunks, slots)
+        except FileNotFoundError:
+            template = None
+        except (EOFError, ValueError, TypeError):
+            template = None  # unreadable or from another Python; recompile
+    if template is None:
+        template = compile_template(source)
+        if path is not None:
+            _ = path.parent.mkdir(parents=True, exist_ok=True)
+            # Batch renders share this cache across processes; a per-process
+            # temp name keeps concurrent first writes from colliding.
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            _ = tmp.write_bytes(marshal.dumps((template.chunks, template.slots)))
+            _ = tmp.replace(path)
+
+    _compiled[digest] = template
+    return template
@@ -3,6 +3,10 @@
 Parse albums.md and regenerate albums.json
 Supports round-trip conversion: JSON → MD → JSON (lossless)
 
+The file is parsed line by line in one walk (iter_albums): headings open
+entries, and each entry's field lines and notes are read from the lines
+below its heading. bench_parsers.py times it on synthetic files.
+
 Usage:
     # Parse and update albums.json
     ./parse_albums.py
@@ -16,6 +20,168 @@ import json
 from datetime import datetime
 from pathlib import Path
 import argparse
+from operator import attrgetter
+from typing import Iterator
+
+from content_model import Album, AlbumLog
+from content_stats import album_stats, with_digest
+
+# The date in "### [2019-10-21] The Jackson 5 - Gold", matched at offset 5.
+HEADING_DATE = re.compile(r"\d{4}-\d{2}-\d{2}\] ")
+YEAR_HEADING = re.compile(r"##\s+\d{4}")
+TRACKS = re.compile(r"(\d+) tracks?")
+PLAYTIME = re.compile(r"tracks?, (.+)")
+SPOTIFY_ID = re.compile(r"/album/([a-zA-Z0-9]+)")
+
+RELEASED = "**Released:** "
+LISTEN = "**Listen:** [Spotify]("
+DURATION = "**Duration:**"
+
+
+def parse_meta(content: str) -> dict | None:
+    """The "meta" object from the <!-- {json} --> comment at the top, or None."""
+    start = content.find("<!--\n")
+    if start == -1:
+        return None
+    end = content.find("\n-->", start + 6)
+    if end == -1:
+        return None
+    return json.loads(content[start + 5 : end]).get("meta", {})
+
+
+def _notes(body: list[str], blank: int | None) -> str | None:
+    """The notes paragraph(s) of an entry, starting below body[blank] — the
+    first blank line under its Duration (or Listen) line — and running up to a
+    "###"/"---" line right after a blank line, a "## YYYY" year heading that
+    bled in, or the end of the entry. None if nothing follows that blank line
+    at all ("" if only whitespace does)."""
+    last = len(body) - 1  # body[last] is the entry's unterminated tail
+    if blank is None or (blank + 1 == last and not body[last]):
+        return None
+    start = blank + 1
+    end = next(
+        (i for i in range(start, len(body)) if body[i].startswith(("###", "---")) and not body[i - 1]),
+        len(body),
+    )
+    lines: list[str] = []
+    for line in body[start:end]:
+        heading = YEAR_HEADING.search(line)
+        if heading:
+            lines.append(line[: heading.start()])
+            break
+        lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def _album(listened_date: str, artist: str, album: str, body: list[str]) -> Album:
+    """Build one Album record from its heading and the lines below it, in one
+    scan of those lines."""
+    release_year = None
+    spotify_url = None
+    spotify_id = None
+    tracks = None
+    playtime = None
+    timed = False
+    # Where the Listen/Duration lines are, and the first blank line below
+    # each: the notes start after one of those blank lines.
+    listen_at = None
+    duration_at = None
+    listen_blank = None
+    duration_blank = None
+    last = len(body) - 1
+    for i, line in enumerate(body):
+        if not line:
+            if i < last:
+                if listen_at is not None and listen_blank is None:
+                    listen_blank = i
+                if duration_at is not None and duration_blank is None:
+                    duration_blank = i
+            continue
+        if line[0] != "*":
+            continue
+        if line.startswith(RELEASED):
+            year = line[len(RELEASED) : len(RELEASED) + 4]
+            if release_year is None and len(year) == 4 and year.isdecimal():
+                release_year = int(year)
+        elif line.startswith("**Listen:**"):
+            if listen_at is None:
+                listen_at = i
+            close = line.find(")", len(LISTEN) + 1)
+            if spotify_url is None and close != -1 and line.startswith(LISTEN):
+                spotify_url = line[len(LISTEN) : close]
+                found = SPOTIFY_ID.search(spotify_url)
+                if found:
+                    spotify_id = found.group(1)
+        elif line.startswith(DURATION):
+            if duration_at is None:
+                duration_at = i
+            # "36 tracks, 2 hr 13 min." or "10 tracks, 34 min."
+            duration = line[len(DURATION) + 1 :]
+            if not timed and duration and line[len(DURATION)] == " " and i < last:
+                timed = True
+                found = TRACKS.search(duration)
+                if found:
+                    tracks = int(found.group(1))
+                found = PLAYTIME.search(duration)
+                if found:
+                    playtime = found.group(1).strip()
+
+    notes = _notes(body, duration_blank)
+    if notes is None and listen_blank is not None and listen_blank != duration_blank:
+        # No Duration line (or nothing below it): notes follow the Listen line.
+        notes = _notes(body, listen_blank)
+        if notes and notes.startswith(DURATION):
+            notes = None
+    return Album(
+        listened_date,
+        artist,
+        album,
+        release_year,
+        spotify_url,
+        spotify_id,
+        tracks,
+        playtime,
+        notes or None,
+    )
+
+
+def parse_heading(line: str) -> tuple[str, str, str] | None:
+    """(listenedDate, artist, album) from "### [2019-10-21] Artist - Album",
+    splitting at the first " - " that leaves an album name; None if the line
+    isn't one."""
+    if not HEADING_DATE.match(line, 5):
+        return None
+    rest = line[17:]
+    split = rest.find(" - ", 1)
+    if split == -1 or split + 3 == len(rest):
+        return None
+    return line[5:15], rest[:split], rest[split + 3 :]
+
+
+def iter_albums(lines: list[str]) -> Iterator[Album]:
+    """Yield Album records from albums.md split on "\n", in file order.
+
+    One walk over the lines finds the "### [date] Artist - Album" headings;
+    each closes the previous entry and opens the next, and _album() reads the
+    lines in between field by field. The last element of `lines` is the text after
+    the final newline, so a heading there (with no newline after it) does not
+    count.
+    """
+    last = len(lines) - 1
+    heading = None
+    body_start = 0
+    for i in [i for i, line in enumerate(lines) if line[:5] == "### [" and i < last]:
+        parsed = parse_heading(lines[i])
+        if parsed is None:
+            continue
+        if heading is not None:
+            body = lines[body_start:i]
+            body.append("")  # the body ended with a newline
+            yield _album(*heading, body)
+        heading = parsed
+        body_start = i + 1
+    if heading is not None:
+        yield _album(*heading, lines[body_start:])
 
 
 class MarkdownToJSONParser:
@@ -24,20 +190,17 @@ class MarkdownToJSONParser:
     def __init__(self, content_dir: Path = Path("content")):
         self.content_dir = content_dir
 
-    def parse_albums(self, input_file: Path = None) -> dict:
-        """Parse albums.md to JSON structure"""
+    def parse_album_log(self, input_file: Path = None) -> AlbumLog:
+        """Parse albums.md to an AlbumLog (content_model.py), newest first,
+        meta["stats"] not yet set"""
         if input_file is None:
             input_file = self.content_dir / "albums.md"
 
         with open(input_file) as f:
             content = f.read()
 
-        # Extract JSON metadata from HTML comment
-        meta_match = re.search(r"<!--\n(.+?)\n-->", content, re.DOTALL)
-        if meta_match:
-            meta_json = json.loads(meta_match.group(1))
-            meta = meta_json.get("meta", {})
-        else:
+        meta = parse_meta(content)
+        if meta is None:
             meta = {
                 "version": "1.0",
                 "description": "Album listening log for fring.io - version agnostic content",
@@ -49,97 +212,19 @@ class MarkdownToJSONParser:
         # renders it, and keeping it just causes phantom diffs each run.
         meta.pop("lastUpdated", None)
 
-        albums = []
-
-        # Split into album entries (### [Date] Artist - Album)
-        # Pattern: ### [2019-10-21] The Jackson 5 - Gold
-        entry_pattern = r"### \[(\d{4}-\d{2}-\d{2})\] (.+?) - (.+?)\n"
-        entries = re.split(entry_pattern, content)
-
-        # Process entries in groups of 4 (split, date, artist, album, content)
-        for i in range(1, len(entries), 4):
-            if i + 3 > len(entries):
-                break
-
-            listened_date = entries[i]  # "2019-10-21"
-            artist = entries[i + 1]
-            album = entries[i + 2]
-            entry_content = entries[i + 3] if i + 3 < len(entries) else ""
-
-            # Extract metadata from entry
-            album_data = {
-                "listenedDate": listened_date,
-                "artist": artist,
-                "album": album,
-                "releaseYear": None,
-                "spotifyUrl": None,
-                "spotifyId": None,
-                "tracks": None,
-                "playtime": None,
-                "notes": None,
-            }
-
-            # Released year
-            release_match = re.search(r"\*\*Released:\*\* (\d{4})", entry_content)
-            if release_match:
-                album_data["releaseYear"] = int(release_match.group(1))
-
-            # Spotify URL
-            spotify_match = re.search(
-                r"\*\*Listen:\*\* \[Spotify\]\((.+?)\)", entry_content
-            )
-            if spotify_match:
-                spotify_url = spotify_match.group(1)
-                album_data["spotifyUrl"] = spotify_url
-                # Extract Spotify ID
-                spotify_id_match = re.search(r"/album/([a-zA-Z0-9]+)", spotify_url)
-                if spotify_id_match:
-                    album_data["spotifyId"] = spotify_id_match.group(1)
-
-            # Duration (tracks and playtime)
-            duration_match = re.search(r"\*\*Duration:\*\* (.+?)\n", entry_content)
-            if duration_match:
-                duration_str = duration_match.group(1)
-                # Parse "36 tracks, 2 hr 13 min." or "10 tracks, 34 min."
-                tracks_match = re.search(r"(\d+) tracks?", duration_str)
-                if tracks_match:
-                    album_data["tracks"] = int(tracks_match.group(1))
-                # Extract playtime (everything after tracks)
-                playtime_match = re.search(r"tracks?, (.+)", duration_str)
-                if playtime_match:
-                    album_data["playtime"] = playtime_match.group(1).strip()
-
-            # Notes (everything after Duration until next heading or end)
-            notes_match = re.search(
-                r"\*\*Duration:\*\*.*?\n\n(.+?)(?:\n\n###|\n\n---|\Z)",
-                entry_content,
-                re.DOTALL,
-            )
-            if notes_match:
-                notes = notes_match.group(1).strip()
-                # Strip year section headings (## 2019 ...) that bleed in
-                notes = re.sub(r"##\s+\d{4}.*", "", notes, flags=re.DOTALL).strip()
-                if notes:
-                    album_data["notes"] = notes
-            else:
-                # Check for notes without Duration field
-                notes_match = re.search(
-                    r"\*\*Listen:\*\*.*?\n\n(.+?)(?:\n\n###|\n\n---|\Z)",
-                    entry_content,
-                    re.DOTALL,
-                )
-                if notes_match:
-                    notes = notes_match.group(1).strip()
-                    notes = re.sub(r"##\s+\d{4}.*", "", notes, flags=re.DOTALL).strip()
-                    if notes and not notes.startswith("**Duration:**"):
-                        album_data["notes"] = notes
-
-            albums.append(album_data)
+        albums = list(iter_albums(content.split("\n")))
 
         # Sort by listened date (newest first)
-        albums.sort(key=lambda x: x.get("listenedDate", ""), reverse=True)
+        albums.sort(key=attrgetter("listened_date"), reverse=True)
 
-        return {"meta": meta, "albums": albums}
+        return AlbumLog(meta, albums)
+
+    def parse_albums(self, input_file: Path = None) -> dict:
+        """Parse albums.md to JSON structure"""
+        log = self.parse_album_log(input_file)
+        data = log.to_json()
+        data["meta"]["stats"] = with_digest(album_stats(log.albums), data["albums"])
+        return data
 
     def save_albums_json(self, data: dict, output_file: Path = None):
         """Save parsed data to albums.json"""
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+parse_all.py - Run every content parser in one process, skipping unchanged files.
+
+  content/books.md    BooksMarkdownParser   → books.json
+  content/albums.md   MarkdownToJSONParser  → albums.json
+  content/now.md      NowMarkdownParser     → now.json
+  content/career.md   CareerMarkdownParser  → career.json  (only when named)
+
+career.md is left out unless named on the command line: parse_career.py
+doesn't round-trip the current file, so parsing it by default would rewrite
+career.json lossily on every run.
+
+.cache/parse_all.json records, for each file's last successful parse, a hash
+of the markdown plus the parser's own source, and a hash of the JSON it
+wrote. A file is parsed again only when one of those no longer matches — the
+markdown or the parser changed, or something else rewrote the JSON — so a
+run costs what changed, not how many content files there are. --force
+parses everything.
+
+The files that do need parsing run in a process pool (one worker per file,
+up to --workers); a single file is parsed in this process instead, since a
+pool would only add its start-up time. Each file's status and time is
+printed as a table. A parser that raises is reported, keeps its old state,
+and makes the run exit 1 after the others have finished.
+
+Usage:
+    python infrastructure/parse_all.py
+    python infrastructure/parse_all.py books.md albums.md
+    python infrastructure/parse_all.py career.md
+    python infrastructure/parse_all.py --force
+    python infrastructure/parse_all.py --workers 1
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from parse_albums import MarkdownToJSONParser
+from parse_books import BooksMarkdownParser
+from parse_career import CareerMarkdownParser
+from parse_now import NowMarkdownParser
+
+CONTENT_DIR = Path("content")
+STATE_PATH = Path(".cache/parse_all.json")
+INFRA_DIR = Path(__file__).parent
+
+# markdown file → (parser class, parse method, save method, source files the
+# output depends on besides the markdown)
+PARSERS: dict[str, tuple[type, str, str, tuple[str, ...]]] = {
+    "books.md": (BooksMarkdownParser, "parse_books", "save_books_json", ("parse_books.py", "content_model.py", "content_stats.py")),
+    "albums.md": (MarkdownToJSONParser, "parse_albums", "save_albums_json", ("parse_albums.py", "content_model.py", "content_stats.py")),
+    "now.md": (NowMarkdownParser, "parse_now", "save_now_json", ("parse_now.py",)),
+    "career.md": (CareerMarkdownParser, "parse_career", "save_career_json", ("parse_career.py",)),
+}
+
+# What a run parses when no files are named; see the module docstring.
+DEFAULT_FILES = ["books.md", "albums.md", "now.md"]
+
+
+def _digest(*parts: bytes) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part)
+    return h.hexdigest()[:16]
+
+
+def input_digest(content_dir: Path, name: str) -> str:
+    """Hash of a markdown file together with the source of its parser."""
+    sources = PARSERS[name][3]
+    return _digest((content_dir / name).read_bytes(), *((INFRA_DIR / s).read_bytes() for s in sources))
+
+
+def output_digest(content_dir: Path, name: str) -> str | None:
+    path = content_dir / f"{Path(name).stem}.json"
+    return _digest(path.read_bytes()) if path.exists() else None
+
+
+def load_state(path: Path) -> dict[str, dict[str, str]]:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except ValueError:
+        return {}
+
+
+def parse_file(content_dir: Path, name: str) -> float:
+    """Parse one markdown file and write its JSON; returns seconds taken.
+    Top-level so the process pool can pickle it."""
+    start = time.perf_counter()
+    cls, parse, save, _sources = PARSERS[name]
+    parser = cls(content_dir)
+    # The save methods print a summary; the table below replaces it.
+    with contextlib.redirect_stdout(io.StringIO()):
+        getattr(parser, save)(getattr(parser, parse)(content_dir / name))
+    return time.perf_counter() - start
+
+
+def parse_all(
+    content_dir: Path = CONTENT_DIR,
+    state_path: Path = STATE_PATH,
+    force: bool = False,
+    workers: int | None = None,
+    names: list[str] | None = None,
+) -> bool:
+    """Parse every content file (of `names`, default DEFAULT_FILES) whose markdown,
+    parser or JSON changed since its last successful parse. Returns False if
+    any parser failed."""
+    started = time.perf_counter()
+    names = names or DEFAULT_FILES
+    previous = load_state(state_path)
+    present = [name for name in names if (content_dir / name).exists()]
+    inputs = {name: input_digest(content_dir, name) for name in present}
+
+    # Files not selected this run keep their entries.
+    state = {name: entry for name, entry in previous.items() if name not in names}
+    stale: list[str] = []
+    for name in present:
+        entry = previous.get(name)
+        if not force and entry and entry.get("input") == inputs[name] and entry.get("output") == output_digest(content_dir, name):
+            state[name] = entry
+        else:
+            stale.append(name)
+
+    timings: dict[str, float] = {}
+    errors: dict[str, str] = {}
+    workers = min(len(stale), workers or os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {name: pool.submit(parse_file, content_dir, name) for name in stale}
+            for name, future in futures.items():
+                try:
+                    timings[name] = future.result()
+                except Exception as e:
+                    errors[name] = f"{type(e).__name__}: {e}"
+    else:
+        for name in stale:
+            try:
+                timings[name] = parse_file(content_dir, name)
+            except Exception as e:
+                errors[name] = f"{type(e).__name__}: {e}"
+
+    for name in timings:
+        state[name] = {"input": inputs[name], "output": output_digest(content_dir, name) or ""}
+    for name in errors:
+        if name in previous:
+            state[name] = previous[name]
+
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    _ = state_path.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n")
+
+    print(f"  {'File':<12} {'Status':<10} {'Time':>10}")
+    for name in names:
+        if name not in present:
+            print(f"  {name:<12} {'missing':<10} {'-':>10}")
+        elif name in errors:
+            print(f"  {name:<12} {'FAILED':<10} {'-':>10}  {errors[name]}")
+        elif name in timings:
+            print(f"  {name:<12} {'parsed':<10} {timings[name] * 1000:7.1f} ms")
+        else:
+            print(f"  {name:<12} {'unchanged':<10} {'-':>10}")
+    pool_note = f", {workers} workers" if workers > 1 else ""
+    print(f"\n  {len(timings)} parsed, {len(present) - len(stale)} unchanged{pool_note}")
+    print(f"  Wall time: {(time.perf_counter() - started) * 1000:.1f} ms")
+    return not errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse every content markdown file to JSON")
+    parser.add_argument("--content-dir", type=Path, default=CONTENT_DIR, help=f"Content directory (default: {CONTENT_DIR})")
+    parser.add_argument("--state", type=Path, default=STATE_PATH, help=f"Change-detection state (default: {STATE_PATH})")
+    parser.add_argument("--force", action="store_true", help="Parse every file, even if unchanged")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: one per CPU)")
+    parser.add_argument("files", nargs="*", metavar="FILE", help=f"Files to parse (default: {' '.join(DEFAULT_FILES)})")
+    args = parser.parse_args()
+    unknown = [name for name in args.files if name not in PARSERS]
+    if unknown:
+        parser.error(f"no parser for {', '.join(unknown)} (known: {', '.join(PARSERS)})")
+
+    print("Parsing content")
+    print("=" * 50)
+    ok = parse_all(args.content_dir, args.state, args.force, args.workers, args.files)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
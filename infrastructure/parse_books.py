@@ -12,11 +12,93 @@ Usage:
 """
 
 import re
+import io
 import json
 from datetime import datetime
 from pathlib import Path
+from typing import Iterable, Iterator
 import argparse
 
+from content_model import Book, BookLog
+from content_stats import book_stats, with_digest
+
+# An entry that links its GoodReads page: [Title](https://...)
+LINK = re.compile(r"\[(.+)\]\((https?://\S+)\)$")
+
+
+def heading_title(text: str) -> str:
+    """A "## " heading's text without its trailing "(N books)" count."""
+    stripped = text.rstrip()
+    if stripped.endswith(")"):
+        # The count is the last "(...)" with no ")" inside; the title before
+        # it keeps at least one character.
+        after = stripped.rfind(")", 0, len(stripped) - 1) + 1
+        opening = stripped.find("(", max(after, 1))
+        if opening != -1:
+            return text[: max(1, len(text[:opening].rstrip()))]
+    return text[: max(1, len(stripped))]
+
+
+def year_fields(title: str) -> tuple[int | None, str | None]:
+    """(year, yearLabel) for a heading title: "2020" or "Prior to 2015"."""
+    if title.startswith("Prior to"):
+        return None, "<2015"
+    try:
+        return int(title), None
+    except ValueError:
+        return None, title
+
+
+def iter_books(lines: Iterable[str]) -> Iterator[Book]:
+    """Yield Book records from books.md lines (newlines included, as a file
+    iterates), in file order, without holding the file in memory.
+
+    A "## <year>" heading sets the year for the "- " entries below it. Any
+    other "##..." line ends the section, as does a "---" footer — unless
+    another "##" line follows it, in which case the entries in between still
+    belong to the section.
+    """
+    year: int | None = None
+    label: str | None = None
+    in_section = False
+    opening = False
+    # Entries below a "---" line wait here until a "##" line shows the footer
+    # wasn't the end of the file.
+    held: list[Book] | None = None
+    for line in lines:
+        if line.startswith("##"):
+            if held:
+                yield from held
+            held = None
+            text = line.rstrip("\n")
+            in_section = line.endswith("\n") and len(text) > 3 and text.startswith("## ")
+            if in_section:
+                year, label = year_fields(heading_title(text[3:]))
+                opening = True
+            continue
+        if not in_section:
+            continue
+        if opening:
+            # The heading claims the blank lines below it, so a "---" on the
+            # section's first non-blank line is not a footer.
+            if not line.strip():
+                continue
+            opening = False
+        elif held is None and line.startswith("---"):
+            held = []
+            continue
+        if line.startswith("- ") and line[2:] not in ("", "\n"):
+            title = line[2:].strip()
+            link = LINK.match(title) if title.startswith("[") else None
+            if link:
+                book = Book(link[1], year, label, link[2])
+            else:
+                book = Book(title, year, label)
+            if held is None:
+                yield book
+            else:
+                held.append(book)
+
 
 class BooksMarkdownParser:
     """Parse books.md back to JSON structure"""
@@ -24,8 +106,8 @@ class BooksMarkdownParser:
     def __init__(self, content_dir: Path = Path("content")):
         self.content_dir = content_dir
 
-    def parse_books(self, input_file: Path = None) -> dict:
-        """Parse books.md to JSON structure"""
+    def parse_book_log(self, input_file: Path = None) -> BookLog:
+        """Parse books.md to a BookLog (content_model.py), meta["stats"] not yet set"""
         if input_file is None:
             input_file = self.content_dir / "books.md"
 
@@ -49,60 +131,22 @@ class BooksMarkdownParser:
         # renders it, and keeping it just causes phantom diffs each run.
         meta.pop("lastUpdated", None)
 
-        books = []
+        return BookLog(meta, list(iter_books(io.StringIO(content))))
 
-        year_sections = re.finditer(
-            r"^## (.+?)(?:\s*\([^)]*\))?\s*\n", content, re.MULTILINE
-        )
+    def parse_books(self, input_file: Path = None) -> dict:
+        """Parse books.md to JSON structure"""
+        log = self.parse_book_log(input_file)
+        data = log.to_json()
+        data["meta"]["stats"] = with_digest(book_stats(log.books), data["books"])
+        return data
 
-        for match in year_sections:
-            year_text = match.group(1)  # "2020" or "Prior to 2015"
-            section_start = match.end()
+    def iter_books(self, input_file: Path = None) -> Iterator[Book]:
+        """Stream Book records from books.md as the file is read."""
+        if input_file is None:
+            input_file = self.content_dir / "books.md"
 
-            # Find the next section or end of document
-            next_match = re.search(r"\n##", content[section_start:])
-            if next_match:
-                section_end = section_start + next_match.start()
-            else:
-                # Look for the footer (---)
-                footer_match = re.search(r"\n---", content[section_start:])
-                if footer_match:
-                    section_end = section_start + footer_match.start()
-                else:
-                    section_end = len(content)
-
-            section_content = content[section_start:section_end]
-
-            # Determine year value and yearLabel
-            if year_text.startswith("Prior to"):
-                year = None
-                year_label = "<2015"
-            else:
-                try:
-                    year = int(year_text)
-                    year_label = None
-                except ValueError:
-                    year = None
-                    year_label = year_text
-
-            # Extract book titles from bullet points
-            book_titles = re.findall(r"^- (.+)$", section_content, re.MULTILINE)
-
-            for title in book_titles:
-                title = title.strip()
-                book = {
-                    "title": title,
-                    "year": year,
-                    "yearLabel": year_label,
-                }
-                # Entries may be markdown links: [Title](goodreads-url)
-                link_match = re.match(r"\[(.+)\]\((https?://\S+)\)$", title)
-                if link_match:
-                    book["title"] = link_match.group(1)
-                    book["goodreadsUrl"] = link_match.group(2)
-                books.append(book)
-
-        return {"meta": meta, "books": books}
+        with open(input_file) as f:
+            yield from iter_books(f)
 
     def save_books_json(self, data: dict, output_file: Path = None):
         """Save parsed data to books.json"""
@@ -23,20 +23,34 @@ Generates:
   - sites/v4/brief/index.html    latest week, duplicated
   - sites/v4/brief/about.html
   - sites/v4/brief/latest.json
+  - sites/v4/brief/sw.js + sw-manifest.json  (service_worker.py)
+  - sites/v4/sitemap.xml + sitemap-state.json  (sitemap.py; the whole site, shared
+    with regenerate_v4_html.py)
 
 Usage:
     python infrastructure/regenerate_brief_html.py
     python infrastructure/regenerate_brief_html.py --preview
+    python infrastructure/regenerate_brief_html.py --compress
+    python infrastructure/regenerate_brief_html.py --minify
 """
 
 import argparse
 import html
 import json
+import os
 import re
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
+from compress_site import compress_tree, summarize as summarize_compression
+from minify_html import format_saving, minify_css, minify_html
+from page_template import load_template
+from service_worker import write_service_worker
+from sitemap import write_sitemap
+from site_assets import BRIEF_CSS, THEME_JS, asset_href, write_asset
+from site_files import write_if_changed
+
 CONTENT_DIR = Path("content/brief")
 OUTPUT_DIR = Path("sites/v4/brief")
 SITE_URL = "https://fring.io/brief"
@@ -47,75 +61,19 @@ SITE_URL = "https://fring.io/brief"
 # in the k-f-/fring.io repo): mono font stack, dark default + light toggle, teal
 # accent, underline-accent links. Every page is re-rendered each run so the
 # archive sidebar stays current on old posts. All links are relative so the same
-# tree works at the NAS root (brief.fring.io) and under fring.io/brief/.
+# tree works at the NAS root (brief.fring.io) and under fring.io/brief/ — which
+# is also why the hashed CSS/JS (site_assets.py) lives in brief/assets/ rather
+# than sharing the v4 root's assets/. PAGE is a page_template.py shell: {{slot}}
+# placeholders, compiled once and rendered straight to bytes.
 
 PAGE = """<!DOCTYPE html>
 <html lang="en" data-theme="dark">
 <head>
 <meta charset="UTF-8">
 <meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>{title}</title>
+<title>{{title}}</title>
 <meta name="description" content="AI Weekly Brief — vendor, Databricks, and regulatory AI news, compiled weekly.">
-<style>
-:root {{
-    --bg: #1a1a1a; --text: #e0e0e0; --muted: #888; --accent: #88dcb4;
-    --border: #333; --code-bg: #222; --selection: rgba(94, 234, 212, 0.2);
-    --font-stack: ui-monospace, 'Cascadia Code', 'Source Code Pro', Menlo, Consolas, 'DejaVu Sans Mono', monospace;
-}}
-[data-theme="light"] {{
-    --bg: #fafafa; --text: #1a1a1a; --muted: #666; --accent: #278061;
-    --border: #ddd; --code-bg: #f0f0f0; --selection: rgba(13, 148, 136, 0.2);
-}}
-* {{ box-sizing: border-box; }}
-::selection {{ background: var(--accent); color: var(--bg); }}
-body {{
-    background-color: var(--bg); color: var(--text); font-family: var(--font-stack);
-    font-size: 16px; line-height: 1.6; margin: 0; padding: 2rem;
-    transition: background-color 0.3s ease, color 0.3s ease;
-}}
-.container {{ max-width: 1100px; margin: 0 auto; }}
-h1, h2, h3 {{ font-weight: 700; margin-top: 2.5rem; margin-bottom: 1rem;
-    line-height: 1.2; letter-spacing: -0.03em; }}
-h1 {{ font-size: 2rem; margin-top: 0; }}
-h2 {{ font-size: 1.4rem; color: var(--accent); }}
-h3 {{ font-size: 1.1rem; margin-top: 1.5rem; }}
-p, li {{ margin-bottom: 0.6rem; }}
-a {{ color: var(--text); text-decoration: underline;
-    text-decoration-color: var(--accent); text-decoration-thickness: 1px;
-    text-underline-offset: 4px; transition: color 0.2s, text-decoration-color 0.2s; }}
-a:hover {{ color: var(--accent); text-decoration-color: transparent; }}
-ul {{ padding-left: 1.5rem; list-style-type: square; }}
-.muted {{ color: var(--muted); font-size: 0.9em; }}
-.small {{ font-size: 0.85rem; }}
-.header-row {{ display: flex; align-items: baseline;
-    justify-content: space-between; gap: 1rem; }}
-nav {{ margin: 1.5rem 0 2.5rem 0; padding: 1rem 0; border-top: 1px solid var(--border);
-    border-bottom: 1px solid var(--border); display: flex; flex-wrap: wrap; gap: 0.5rem; }}
-nav a {{ text-decoration: none; }}
-nav a:hover {{ color: var(--accent); }}
-.nav-separator {{ color: var(--muted); padding: 0 0.5rem; }}
-.layout {{ display: grid; grid-template-columns: 240px minmax(0, 1fr); gap: 3rem; }}
-@media (max-width: 800px) {{
-  .layout {{ grid-template-columns: 1fr; }}
-  .sidebar {{ position: static; order: 2; }}
-  article {{ order: 1; }}
-}}
-article {{ max-width: 80ch; min-width: 0; }}
-article h2 {{ border-bottom: 1px solid var(--border); padding-bottom: 0.3rem; }}
-.sidebar {{ position: sticky; top: 1rem; align-self: start;
-    max-height: calc(100vh - 2rem); overflow-y: auto; font-size: 0.85rem; }}
-.sidebar h2 {{ font-size: 1rem; margin-top: 1.5rem; }}
-.sidebar h2:first-child {{ margin-top: 0; }}
-.sidebar ul {{ list-style: none; padding: 0; }}
-.sidebar ul ul {{ padding-left: 1rem; list-style: none; }}
-.sidebar li {{ margin-bottom: 0.4rem; }}
-#theme-toggle {{ background: none; border: 1px solid var(--border); color: var(--muted);
-    font-family: var(--font-stack); cursor: pointer; padding: 0.2rem 0.6rem;
-    border-radius: 4px; }}
-#theme-toggle:hover {{ color: var(--accent); border-color: var(--accent); }}
-footer {{ margin-top: 3rem; padding-top: 1rem; border-top: 1px solid var(--border);
-    color: var(--muted); font-size: 0.85rem; }}
-</style>
+<link rel="stylesheet" href="{{css_href}}">
 </head>
 <body>
 <div class="container">
@@ -127,37 +85,24 @@ footer {{ margin-top: 3rem; padding-top: 1rem; border-top: 1px solid var(--borde
         <nav>
             <a href="https://fring.io">fring.io</a> <span class="nav-separator">&middot;</span>
             <a href="./">Latest</a> <span class="nav-separator">&middot;</span>
-            <a href="about.html">About</a>{posted_block}
+            <a href="about.html">About</a>{{posted_block}}
         </nav>
     </header>
     <div class="layout">
         <aside class="sidebar">
-{toc}
+{{toc}}
             <h2>Archive</h2>
             <ul>
-{archive}
+{{archive}}
             </ul>
         </aside>
         <article>
-{body}
+{{body}}
         </article>
     </div>
-    <footer>Compiled {stamp} &middot; sources linked inline &middot; <a href="https://fring.io">fring.io</a></footer>
+    <footer>Compiled {{stamp}} &middot; sources linked inline &middot; <a href="https://fring.io">fring.io</a></footer>
 </div>
-<script>
-const toggleBtn = document.getElementById('theme-toggle');
-const html = document.documentElement;
-const savedTheme = localStorage.getItem('theme');
-if (savedTheme) {{ html.setAttribute('data-theme', savedTheme); updateIcon(savedTheme); }}
-else if (window.matchMedia('(prefers-color-scheme: light)').matches) {{
-    html.setAttribute('data-theme', 'light'); updateIcon('light'); }}
-function updateIcon(theme) {{ toggleBtn.textContent = theme === 'light' ? '\\u263e' : '\\u2600'; }}
-toggleBtn.addEventListener('click', () => {{
-    const newTheme = html.getAttribute('data-theme') === 'light' ? 'dark' : 'light';
-    html.setAttribute('data-theme', newTheme);
-    localStorage.setItem('theme', newTheme); updateIcon(newTheme);
-}});
-</script>
+<script src="{{js_href}}" data-sw="sw.js"></script>
 </body>
 </html>
 """
@@ -201,6 +146,17 @@ def md_to_html(text):
     return body, toc
 
 
+def build_stamp(weeks):
+    """The footer's "Compiled ..." stamp, derived from content so identical
+    inputs give byte-identical pages: SOURCE_DATE_EPOCH when set, otherwise
+    the newest week's date. (It used to be datetime.now() to the minute, which
+    made every run rewrite every page and trigger a redeploy.)"""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), tz=timezone.utc).strftime("%Y-%m-%d %H:%M")
+    return weeks[0]
+
+
 def pretty_date(iso_date):
     return datetime.strptime(iso_date, "%Y-%m-%d").strftime("%B %d, %Y")
 
@@ -227,38 +183,23 @@ def archive_html(weeks, current):
     return "\n".join(items)
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Regenerate sites/v4/brief/ from content/brief/*.md")
-    parser.add_argument(
-        "--preview", action="store_true",
-        help="Print the index (latest week) HTML to stdout instead of writing")
-    args = parser.parse_args()
+def build_pages(weeks, minify=False):
+    """Render every page in memory (so --preview needs no writes). Returns
+    ({filename: encoded html}, stylesheet source the pages link)."""
+    stamp = build_stamp(weeks)
+    css = minify_css(BRIEF_CSS) if minify else BRIEF_CSS
+    css_href = asset_href("brief", "css", css)
+    js_href = asset_href("theme", "js", THEME_JS)
 
-    print("Regenerating brief HTML")
-    print("=" * 50)
-
-    weeks = discover_weeks()
-    if not weeks:
-        # deploy.yml syncs sites/v4 to S3 with --delete, so writing an empty
-        # tree here would take down the live /brief section. Bail loudly
-        # instead of silently producing nothing.
-        print(f"ERROR: no dated posts found under {CONTENT_DIR}/ "
-              "(expected files like 2026-08-18.md) — refusing to write an "
-              "empty tree", file=sys.stderr)
-        return 1
-
-    print(f"  Weeks: {len(weeks)} ({weeks[-1]} .. {weeks[0]})")
-
-    stamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-
-    pages = {}  # filename -> html, built in memory first so --preview works
+    template = load_template(PAGE)
+    pages = {}
     for w in weeks:
         body, toc = md_to_html((CONTENT_DIR / f"{w}.md").read_text())
-        page = PAGE.format(
+        page = template.render(dict(
             title=f"AI Weekly Brief — {pretty_date(w)}",
             posted_block=f' <span class="nav-separator">&middot;</span> <span class="muted">Posted {pretty_date(w)}</span>',
-            body=body, toc=toc, archive=archive_html(weeks, w), stamp=stamp)
+            body=body, toc=toc, archive=archive_html(weeks, w), stamp=stamp,
+            css_href=css_href, js_href=js_href))
         pages[f"{w}.html"] = page
     pages["index.html"] = pages[f"{weeks[0]}.html"]
 
@@ -270,12 +211,28 @@ def main():
         if sources_src.exists():
             sources_html, _ = md_to_html(sources_src.read_text())
             sources_block = "            <h2>Sources</h2>\n" + sources_html
-        pages["about.html"] = PAGE.format(
+        pages["about.html"] = template.render(dict(
             title="AI Weekly Brief — About",
             posted_block="",
             body=about_body, toc=sources_block,
-            archive=archive_html(weeks, None), stamp=stamp)
+            archive=archive_html(weeks, None), stamp=stamp,
+            css_href=css_href, js_href=js_href))
+
+    if minify:
+        for name in [n for n in pages if n != "index.html"]:
+            minified = minify_html(pages[name].decode("utf-8")).encode("utf-8")
+            print(f"  Minified: {name} {format_saving(len(pages[name]), len(minified))}")
+            pages[name] = minified
+        pages["index.html"] = pages[f"{weeks[0]}.html"]
+        print(f"  Minified: brief.css {format_saving(len(BRIEF_CSS), len(css))}")
+    return pages, css
+
+
+def write_pages(weeks, pages, css, output_dir=OUTPUT_DIR):
+    """Write build_pages() output, latest.json and the hashed assets.
 
+    Pages and latest.json are only written when their bytes changed; returns
+    the asset hrefs and how many of those files were written."""
     # No "counts" key here (unlike the old STATE/weeks/*/meta.json-derived
     # version): those came from the Miniflux fetch counts, which only exist
     # on the Mac mini's compile run. GitHub Actions has no Miniflux access,
@@ -286,17 +243,63 @@ def main():
         "url": f"{SITE_URL}/{weeks[0]}.html",
     }, indent=2)
 
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = sum(write_if_changed(output_dir / name, content) for name, content in pages.items())
+    written += write_if_changed(output_dir / "latest.json", latest_json.encode("utf-8"))
+    css_href = write_asset(output_dir, "brief", "css", css)
+    js_href = write_asset(output_dir, "theme", "js", THEME_JS)
+    # Visited weeks are cached at runtime by the worker, so the precache
+    # only needs the landing pages and the shared assets.
+    precache = ["index.html", css_href, js_href] + (["about.html"] if "about.html" in pages else [])
+    write_service_worker(output_dir, precache, "fring-brief")
+    # One sitemap for the whole site, rooted where the brief is mounted.
+    write_sitemap(output_dir.parent)
+    return css_href, js_href, written
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Regenerate sites/v4/brief/ from content/brief/*.md")
+    parser.add_argument(
+        "--preview", action="store_true",
+        help="Print the index (latest week) HTML to stdout instead of writing")
+    parser.add_argument(
+        "--compress", action="store_true",
+        help="Also write .gz/.br variants and encodings.json (see compress_site.py)")
+    parser.add_argument(
+        "--minify", action="store_true",
+        help="Collapse formatting whitespace and comments and minify the stylesheet (see minify_html.py)")
+    args = parser.parse_args()
+
+    print("Regenerating brief HTML")
+    print("=" * 50)
+
+    weeks = discover_weeks()
+    if not weeks:
+        # deploy.yml syncs sites/v4 to S3 with --delete, so writing an empty
+        # tree here would take down the live /brief section. Bail loudly
+        # instead of silently producing nothing.
+        print(f"ERROR: no dated posts found under {CONTENT_DIR}/ "
+              "(expected files like 2026-08-18.md) — refusing to write an "
+              "empty tree", file=sys.stderr)
+        return 1
+
+    print(f"  Weeks: {len(weeks)} ({weeks[-1]} .. {weeks[0]})")
+
+    pages, css = build_pages(weeks, args.minify)
+
     if args.preview:
-        print("\n" + pages["index.html"])
+        print("\n" + pages["index.html"].decode("utf-8"))
         return 0
 
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    for name, content in pages.items():
-        (OUTPUT_DIR / name).write_text(content)
-    (OUTPUT_DIR / "latest.json").write_text(latest_json)
+    css_href, js_href, written = write_pages(weeks, pages, css)
 
-    print(f"\n  Wrote {len(pages) + 1} file(s) to {OUTPUT_DIR}/")
+    print(f"\n  Wrote {written} of {len(pages) + 1} file(s) to {OUTPUT_DIR}/ (the rest unchanged)")
+    print(f"  Assets: {css_href}, {js_href}")
     print(f"  Latest: {weeks[0]} -> {SITE_URL}/{weeks[0]}.html")
+    if args.compress:
+        manifest = compress_tree(OUTPUT_DIR)
+        print(f"  Compressed: {summarize_compression(manifest)}")
     return 0
 
 
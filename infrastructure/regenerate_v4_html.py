@@ -11,29 +11,218 @@ Generates a single-page HTML file with:
   - Now section (from now.json)
   - Bookshelf section (year-grouped grid from books.json)
   - Albums section (release-year-grouped grid from albums.json)
+  - Stats section (content_stats.py aggregates, as stored by the parsers)
   - Header icons (from now.json links)
   - Epilogue (static)
 
+plus one detail page per book and album under sites/v4/books/ and
+sites/v4/albums/ (detail_pages.py), re-rendered only when their input changes,
+browse facets (artist, release decade, ...) under sites/v4/facets/
+(facet_index.py), a paginated static JSON API under sites/v4/api/v1/
+(static_api.py), a service worker with its precache manifest
+(service_worker.py), and sitemap.xml (sitemap.py).
+
+The JSON is loaded as content_model.py records (BookLog, AlbumLog, NowPage),
+which every section and the detail-page, facet and API writers take.
+
+Section HTML (Now, Bookshelf, Albums, Stats) is cached on disk under .cache/, keyed
+by a content hash of each section's input and the renderer source, so a run
+only re-renders the sections whose JSON actually changed.
+
+The page is streamed to its destination chunk by chunk (iter_full_html), so
+peak memory does not grow with the size of books.json/albums.json. The shell
+around the sections is a precompiled template (PAGE_SHELL, page_template.py). The
+stylesheet and theme script are written as content-hashed files under
+sites/v4/assets/ (see site_assets.py) rather than inlined. --minify collapses
+the page's formatting whitespace and minifies the stylesheet (minify_html.py).
+--parallel-sections renders the sections in a process pool, each worker loading
+only the JSON its section reads, and the run logs how long each section took.
+
 Usage:
     python infrastructure/regenerate_v4_html.py
     python infrastructure/regenerate_v4_html.py --preview
+    python infrastructure/regenerate_v4_html.py --no-cache
+    python infrastructure/regenerate_v4_html.py --lazy
+    python infrastructure/regenerate_v4_html.py --virtual
+    python infrastructure/regenerate_v4_html.py --compress
+    python infrastructure/regenerate_v4_html.py --minify
+    python infrastructure/regenerate_v4_html.py --parallel-sections
+    python infrastructure/regenerate_v4_html.py --content-dir people/ana/content --output-dir sites/ana
+    python infrastructure/regenerate_v4_html.py --batch tenants.txt --jobs 8
 """
 
 import json
 import re
 import html
 import math
+import hashlib
 import argparse
 import urllib.parse
-from typing import cast
-from datetime import datetime
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import IO, Callable, Iterable, Iterator, cast
+from datetime import datetime, timezone
 from pathlib import Path
 from collections import OrderedDict
 
+from content_model import MODELS, Album, AlbumLog, Book, BookLog, NowPage
+from content_stats import album_stats, book_stats, entries_digest, stored_stats
+from compress_site import compress_tree, summarize as summarize_compression
+from minify_html import format_saving, minify_css, minify_html
+from facet_index import FACET_DIR, FACET_SHELL, write_facet_indexes
+from detail_pages import ALBUMS_DIR, BOOKS_DIR, DETAIL_SHELL, STATE_PATH as DETAIL_STATE_PATH, write_detail_pages
+from sitemap import SITE_URL, SITEMAP_NAME, write_sitemap
+from service_worker import SW_NAME, write_service_worker
+from static_api import API_DIR, write_static_api
+from search_index import SEARCH_DIR, MANIFEST_NAME as SEARCH_MANIFEST, SearchDoc, write_search_index
+from page_template import load_template
+from site_assets import GRID_JS, SEARCH_JS, SITE_CSS, THEME_JS, asset_href, write_asset
+from site_files import write_if_changed
+
+
+# Anchored at the repo root, so a run from another directory shares the cache.
+CACHE_DIR = Path(__file__).parent.parent / ".cache" / "regenerate_v4"
+
+# Sibling modules whose code also shapes cached section markup: the stats
+# behind the sparklines and the Stats section, and the --virtual grid hrefs.
+SECTION_SOURCES = ("content_stats.py", "site_assets.py")
+
+# Any edit to this script (or to SECTION_SOURCES) may change the section markup
+# it produces, so the renderer version is the hash of their source — no manual
+# bump to forget.
+RENDERER_VERSION = hashlib.sha256(
+    b"".join(
+        (Path(__file__).parent / name).read_bytes()
+        for name in (Path(__file__).name, *SECTION_SOURCES)
+    )
+).hexdigest()[:12]
+
+# Read size when streaming cached sections back out.
+CHUNK_SIZE = 64 * 1024
+
+# Year groups longer than OVERFLOW_THRESHOLD show VISIBLE_COUNT entries and
+# tuck the rest into a collapsed "[+] N more" <details>.
+OVERFLOW_THRESHOLD = 17
+VISIBLE_COUNT = 10
+
+# With --lazy, overflow entries are written here (relative to index.html)
+# and fetched the first time their <details> is opened.
+FRAGMENT_DIR = "fragments"
+
+# Artists listed in the Stats section.
+STATS_TOP_ARTISTS = 5
+
+
+@dataclass(frozen=True)
+class EntryStats:
+    """Digests and content_stats aggregates of the books and albums entries,
+    worked out once per render and shared by every section that reads them.
+
+    The digests are the section cache keys of Bookshelf and Albums. They also
+    tell whether the meta["stats"] the parsers stored still matches the
+    entries, so the aggregates are only recomputed after a hand edit.
+    """
+
+    books_digest: str
+    albums_digest: str
+    books: dict[str, object]
+    albums: dict[str, object]
+
+    @classmethod
+    def of(cls, book_log: BookLog, album_log: AlbumLog) -> "EntryStats":
+        books_digest = entries_digest([b.to_json() for b in book_log.books])
+        albums_digest = entries_digest([a.to_json() for a in album_log.albums])
+        return cls(
+            books_digest,
+            albums_digest,
+            stored_stats(book_log.meta, book_log.books, books_digest, book_stats),
+            stored_stats(album_log.meta, album_log.albums, albums_digest, album_stats),
+        )
+
 
-def load_json(path: Path) -> dict[str, object]:
-    with open(path) as f:
-        return cast(dict[str, object], json.load(f))
+def join_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Streaming "\\n".join(): yield each line with the separator before it."""
+    first = True
+    for line in lines:
+        if first:
+            first = False
+            yield line
+        else:
+            yield "\n" + line
+
+
+class SectionCache:
+    """Persistent cache of rendered section HTML.
+
+    Entries live at <cache_dir>/<section>-<hash>.html, where the hash covers
+    RENDERER_VERSION and the section's JSON input. Only the latest entry per
+    section is kept; older ones are pruned when a new one is written.
+
+    Two runs may share a cache directory (dev_server.py rebuilding while a
+    manual build runs), so an entry can vanish between has() and stream():
+    a missing file is just a miss, and each run writes its own temp file.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits: list[str] = []
+        self.misses: list[str] = []
+
+    def key(self, section: str, payload: object) -> str:
+        digest = hashlib.sha256(f"{RENDERER_VERSION}\0{section}\0".encode())
+        for chunk in json.JSONEncoder(sort_keys=True).iterencode(payload):
+            digest.update(chunk.encode("utf-8"))
+        return f"{section}-{digest.hexdigest()[:16]}"
+
+    def has(self, section: str, payload: object) -> bool:
+        """Whether stream() would be served from disk for (section, payload)."""
+        return (self.cache_dir / f"{self.key(section, payload)}.html").exists()
+
+    def stream(
+        self, section: str, payload: object, build: Callable[[], Iterable[str]]
+    ) -> Iterator[str]:
+        """Yield cached HTML chunks for (section, payload).
+
+        On a miss, build() is streamed through to the caller and tee'd into
+        the cache file as it goes, so neither path holds the section in memory.
+        """
+        path = self.cache_dir / f"{self.key(section, payload)}.html"
+        try:
+            cached = open(path)
+        except FileNotFoundError:
+            cached = None
+        if cached is not None:
+            self.hits.append(section)
+            with cached as f:
+                while chunk := f.read(CHUNK_SIZE):
+                    yield chunk
+            return
+
+        self.misses.append(section)
+        _ = self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp, "w") as f:
+                for chunk in build():
+                    _ = f.write(chunk)
+                    yield chunk
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        for stale in self.cache_dir.glob(f"{section}-{'?' * 16}.html"):
+            stale.unlink(missing_ok=True)
+        _ = tmp.replace(path)
+
+    def summary(self) -> str:
+        parts = [f"{len(self.hits)} hit(s), {len(self.misses)} miss(es)"]
+        if self.hits:
+            parts.append(f"hit: {', '.join(self.hits)}")
+        if self.misses:
+            parts.append(f"miss: {', '.join(self.misses)}")
+        return " · ".join(parts)
 
 
 def format_content_date(date_str: str) -> str:
@@ -57,13 +246,31 @@ def format_updated_stamp(date_str: str) -> str:
         return f"updated @ {date_str}"
 
 
-def group_books_by_year(
-    books: list[dict[str, object]],
-) -> OrderedDict[str, list[dict[str, object]]]:
+def build_datetime(*metas: dict[str, object]) -> datetime:
+    """The reproducible "Built" date for the epilogue.
+
+    SOURCE_DATE_EPOCH wins when set (the reproducible-builds.org convention);
+    otherwise it is the newest contentUpdated across the given meta blocks.
+    Either way, identical inputs produce a byte-identical page, so a no-op
+    content run leaves nothing to commit or deploy.
+    """
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), tz=timezone.utc)
+    dates: list[datetime] = []
+    for meta in metas:
+        try:
+            dates.append(datetime.strptime(str(meta.get("contentUpdated", ""))[:10], "%Y-%m-%d"))
+        except ValueError:
+            continue
+    return max(dates) if dates else datetime(1970, 1, 1)
+
+
+def group_books_by_year(books: list[Book]) -> OrderedDict[str, list[Book]]:
     """Group books by year, maintaining order (newest first). yearLabel books go last."""
-    groups: OrderedDict[str, list[dict[str, object]]] = OrderedDict()
+    groups: OrderedDict[str, list[Book]] = OrderedDict()
     for book in books:
-        key = str(book.get("yearLabel") or book.get("year", "Unknown"))
+        key = book.year_key
         if key not in groups:
             groups[key] = []
         groups[key].append(book)
@@ -93,182 +300,295 @@ def build_year_sparkline(year_counts: OrderedDict[str, int]) -> str:
     return " | ".join(parts)
 
 
-def book_title_html(book: dict[str, object]) -> str:
-    """Render a book title as a GoodReads link — the exact book page when
-    the data carries a URL, otherwise a title search."""
-    title = str(book["title"])
-    url = book.get("goodreadsUrl")
-    href = (
-        str(url)
-        if url
-        else f"https://www.goodreads.com/search?q={urllib.parse.quote_plus(title)}"
-    )
-    return f'<a href="{html.escape(href)}" target="_blank" class="book-title">{html.escape(title)}</a>'
-
-
-def generate_book_groups_html(
-    books: list[dict[str, object]], indent: str = "                "
-) -> str:
-    """Generate book-grid HTML from books list."""
+def fragment_href(section: str, year_key: str) -> str:
+    """Relative URL of the lazy overflow fragment for one year group."""
+    slug = re.sub(r"[^0-9a-z]+", "-", year_key.lower()).strip("-") or "unknown"
+    if year_key.startswith("<"):
+        slug = f"before-{slug}"
+    return f"{FRAGMENT_DIR}/{section}-{slug}.html"
+
+
+def iter_overflow_html(
+    section: str,
+    year_key: str,
+    entry_lines: Iterable[str],
+    lazy: bool,
+    indent: str,
+) -> Iterator[str]:
+    """Yield the body of a "[+] N more" <details>.
+
+    Inline mode yields the entries themselves. Lazy mode yields only a link
+    to the group's fragment file, which doubles as the no-JS fallback and is
+    swapped for the fetched entries by LAZY_FRAGMENT_SCRIPT.
+    """
+    if not lazy:
+        yield from entry_lines
+        return
+    href = fragment_href(section, year_key)
+    yield f'{indent}<a href="{html.escape(href)}" class="muted small fragment-link">show all</a>'
+
+
+def book_href(book: Book) -> str:
+    """GoodReads URL for a book — the exact book page when the data carries
+    one, otherwise a title search."""
+    if book.goodreads_url:
+        return book.goodreads_url
+    return f"https://www.goodreads.com/search?q={urllib.parse.quote_plus(book.title)}"
+
+
+def book_title_html(book: Book) -> str:
+    """Render a book title as a GoodReads link."""
+    return f'<a href="{html.escape(book_href(book))}" target="_blank" class="book-title">{html.escape(book.title)}</a>'
+
+
+def iter_book_groups_html(
+    books: list[Book],
+    indent: str = "                ",
+    lazy: bool = False,
+    grid_href: str | None = None,
+    stats: dict[str, object] | None = None,
+) -> Iterator[str]:
+    """Yield book-grid HTML lines from books list.
+
+    With lazy=True the overflow entries are left out; see write_fragments().
+    With a grid_href the grid is an empty container for GRID_JS to fill from
+    that payload, and the full grid moves into <noscript>. stats is
+    book_stats(books), computed here if not given (see EntryStats).
+    """
     groups = group_books_by_year(books)
-    total = len(books)
-    years = [k for k in groups if k != "<2015"]
+    stats = stats or book_stats(books)
+    total = stats["total"]
+    year_counts = OrderedDict(cast(dict[str, int], stats["perYear"]))
+    years = [k for k in year_counts if k != "<2015"]
     year_range = f"{min(years)}–{max(years)}" if years else ""
-    if "<2015" in groups:
+    if "<2015" in year_counts:
         year_range += " + prior"
 
-    year_counts = OrderedDict((k, len(v)) for k, v in groups.items())
     sparkline = build_year_sparkline(year_counts)
 
-    lines: list[str] = []
-    lines.append(
+    yield (
         f'{indent}<p class="muted small">{total} books tracked · {year_range}</p>'
     )
-    lines.append(f'{indent}<div class="sparkline" aria-hidden="true">')
-    lines.append(f"{indent}    {sparkline}")
-    lines.append(f"{indent}</div>")
-    lines.append(f'{indent}<div class="book-grid">')
-
-    OVERFLOW_THRESHOLD = 17
-    VISIBLE_COUNT = 10
+    yield f'{indent}<div class="sparkline" aria-hidden="true">'
+    yield f"{indent}    {sparkline}"
+    yield f"{indent}</div>"
+    if grid_href:
+        yield f'{indent}<div class="book-grid" data-grid="{html.escape(grid_href)}" hidden></div>'
+        yield f"{indent}<noscript>"
+    yield f'{indent}<div class="book-grid">'
 
     for year_key, year_books in groups.items():
         year_display = html.escape(str(year_key))
         count = len(year_books)
 
         if count <= OVERFLOW_THRESHOLD:
-            lines.append(f'{indent}<details class="book-group" open>')
-            lines.append(
+            yield f'{indent}<details class="book-group" open>'
+            yield (
                 f'{indent}    <summary class="book-year">{year_display} <span class="muted small">({count})</span></summary>'
             )
             for book in year_books:
-                lines.append(f"{indent}    {book_title_html(book)}")
-            lines.append(f"{indent}</details>")
+                yield f"{indent}    {book_title_html(book)}"
+            yield f"{indent}</details>"
         else:
             remaining = count - VISIBLE_COUNT
-            lines.append(f'{indent}<div class="book-group">')
-            lines.append(
+            yield f'{indent}<div class="book-group">'
+            yield (
                 f'{indent}    <span class="book-year">{year_display} <span class="muted small">({count})</span></span>'
             )
             for book in year_books[:VISIBLE_COUNT]:
-                lines.append(f"{indent}    {book_title_html(book)}")
-            lines.append(f'{indent}    <details class="book-overflow">')
-            lines.append(
+                yield f"{indent}    {book_title_html(book)}"
+            fragment_attr = (
+                f' data-fragment="{html.escape(fragment_href("books", year_key))}"' if lazy else ""
+            )
+            yield f'{indent}    <details class="book-overflow"{fragment_attr}>'
+            yield (
                 f'{indent}        <summary class="muted small">[+] {remaining} more</summary>'
             )
-            for book in year_books[VISIBLE_COUNT:]:
-                lines.append(f"{indent}        {book_title_html(book)}")
-            lines.append(f"{indent}    </details>")
-            lines.append(f"{indent}</div>")
+            yield from iter_overflow_html(
+                "books",
+                year_key,
+                (f"{indent}        {book_title_html(book)}" for book in year_books[VISIBLE_COUNT:]),
+                lazy,
+                f"{indent}        ",
+            )
+            yield f"{indent}    </details>"
+            yield f"{indent}</div>"
+
+    yield f"{indent}</div>"
+    if grid_href:
+        yield f"{indent}</noscript>"
 
-    lines.append(f"{indent}</div>")
-    return "\n".join(lines)
+
+def generate_book_groups_html(books: list[Book], indent: str = "                ") -> str:
+    """Generate book-grid HTML from books list."""
+    return "\n".join(iter_book_groups_html(books, indent))
 
 
-def group_albums_by_year(
-    albums: list[dict[str, object]],
-) -> OrderedDict[str, list[dict[str, object]]]:
+def group_albums_by_year(albums: list[Album]) -> OrderedDict[str, list[Album]]:
     """Group albums by listened year, newest first."""
-    sorted_albums = sorted(
-        albums, key=lambda a: str(a.get("listenedDate", "")), reverse=True
-    )
-    groups: OrderedDict[str, list[dict[str, object]]] = OrderedDict()
+    sorted_albums = sorted(albums, key=lambda a: a.listened_date or "", reverse=True)
+    groups: OrderedDict[str, list[Album]] = OrderedDict()
     for album in sorted_albums:
-        listened_date = str(album.get("listenedDate", ""))
-        year = listened_date[:4] or "Unknown"
+        year = (album.listened_date or "")[:4] or "Unknown"
         if year not in groups:
             groups[year] = []
         groups[year].append(album)
     return groups
 
 
-def generate_albums_html(
-    albums: list[dict[str, object]], indent: str = "                "
-) -> str:
-    """Generate year-grouped album grid HTML, sorted by listened date (newest first)."""
+def album_lines(album: Album, entry_indent: str) -> list[str]:
+    """Render one album as a title line plus an optional note line."""
+    artist = html.escape(album.artist)
+    name = html.escape(album.album)
+    title_text = f"{artist} — {name}"
+    if album.release_year:
+        title_text += f" ({album.release_year})"
+
+    out: list[str] = []
+    if album.spotify_url:
+        out.append(
+            f'{entry_indent}<a href="{html.escape(album.spotify_url)}" target="_blank" class="album-title">{title_text}</a>'
+        )
+    else:
+        out.append(f'{entry_indent}<span class="album-title">{title_text}</span>')
+
+    if album.notes:
+        out.append(
+            f'{entry_indent}<span class="album-note">{html.escape(album.notes)}</span>'
+        )
+    return out
+
+
+def iter_albums_html(
+    albums: list[Album],
+    indent: str = "                ",
+    lazy: bool = False,
+    grid_href: str | None = None,
+    stats: dict[str, object] | None = None,
+) -> Iterator[str]:
+    """Yield year-grouped album grid HTML lines, sorted by listened date (newest first).
+
+    With lazy=True the overflow entries are left out; see write_fragments().
+    With a grid_href the grid is rendered client-side, as for books. stats
+    is album_stats(albums), computed here if not given.
+    """
     groups = group_albums_by_year(albums)
-    total = len(albums)
+    stats = stats or album_stats(albums)
+    total = stats["total"]
 
-    release_years = [str(a.get("releaseYear")) for a in albums if a.get("releaseYear")]
-    year_span = f"{min(release_years)}–{max(release_years)}" if release_years else ""
+    release_span = cast(list[int] | None, stats["releaseSpan"])
+    year_span = f"{release_span[0]}–{release_span[1]}" if release_span else ""
 
-    year_counts = OrderedDict((k, len(v)) for k, v in groups.items())
+    year_counts = OrderedDict(cast(dict[str, int], stats["perYear"]))
     sparkline = build_year_sparkline(year_counts)
 
-    lines: list[str] = []
-    lines.append(
+    yield (
         f'{indent}<p class="muted small">{total} albums · releases spanning {year_span}</p>'
     )
-    lines.append(f'{indent}<div class="sparkline" aria-hidden="true">')
-    lines.append(f"{indent}    {sparkline}")
-    lines.append(f"{indent}</div>")
-    lines.append(f'{indent}<div class="album-grid">')
-
-    OVERFLOW_THRESHOLD = 17
-    VISIBLE_COUNT = 10
-
-    def album_lines(album: dict[str, object], entry_indent: str) -> list[str]:
-        artist = html.escape(str(album["artist"]))
-        name = html.escape(str(album["album"]))
-        release_year_value = album.get("releaseYear")
-        release_year = str(release_year_value) if release_year_value else ""
-        title_text = f"{artist} — {name}"
-        if release_year:
-            title_text += f" ({release_year})"
-
-        out: list[str] = []
-        spotify_url = album.get("spotifyUrl")
-        if spotify_url:
-            spotify_url = str(spotify_url)
-            out.append(
-                f'{entry_indent}<a href="{html.escape(spotify_url)}" target="_blank" class="album-title">{title_text}</a>'
-            )
-        else:
-            out.append(f'{entry_indent}<span class="album-title">{title_text}</span>')
-
-        if album.get("notes"):
-            out.append(
-                f'{entry_indent}<span class="album-note">{html.escape(str(album["notes"]))}</span>'
-            )
-        return out
+    yield f'{indent}<div class="sparkline" aria-hidden="true">'
+    yield f"{indent}    {sparkline}"
+    yield f"{indent}</div>"
+    if grid_href:
+        yield f'{indent}<div class="album-grid" data-grid="{html.escape(grid_href)}" hidden></div>'
+        yield f"{indent}<noscript>"
+    yield f'{indent}<div class="album-grid">'
 
     for year, year_albums in groups.items():
         year_display = html.escape(year)
         count = len(year_albums)
 
         if count <= OVERFLOW_THRESHOLD:
-            lines.append(f'{indent}<details class="album-group" open>')
-            lines.append(
+            yield f'{indent}<details class="album-group" open>'
+            yield (
                 f'{indent}    <summary class="album-year">{year_display} <span class="muted small">({count})</span></summary>'
             )
             for album in year_albums:
-                lines.extend(album_lines(album, f"{indent}    "))
-            lines.append(f"{indent}</details>")
+                yield from album_lines(album, f"{indent}    ")
+            yield f"{indent}</details>"
         else:
             remaining = count - VISIBLE_COUNT
-            lines.append(f'{indent}<div class="album-group">')
-            lines.append(
+            yield f'{indent}<div class="album-group">'
+            yield (
                 f'{indent}    <span class="album-year">{year_display} <span class="muted small">({count})</span></span>'
             )
             for album in year_albums[:VISIBLE_COUNT]:
-                lines.extend(album_lines(album, f"{indent}    "))
-            lines.append(f'{indent}    <details class="album-overflow">')
-            lines.append(
+                yield from album_lines(album, f"{indent}    ")
+            fragment_attr = (
+                f' data-fragment="{html.escape(fragment_href("albums", year))}"' if lazy else ""
+            )
+            yield f'{indent}    <details class="album-overflow"{fragment_attr}>'
+            yield (
                 f'{indent}        <summary class="muted small">[+] {remaining} more</summary>'
             )
-            for album in year_albums[VISIBLE_COUNT:]:
-                lines.extend(album_lines(album, f"{indent}        "))
-            lines.append(f"{indent}    </details>")
-            lines.append(f"{indent}</div>")
+            yield from iter_overflow_html(
+                "albums",
+                year,
+                (
+                    line
+                    for album in year_albums[VISIBLE_COUNT:]
+                    for line in album_lines(album, f"{indent}        ")
+                ),
+                lazy,
+                f"{indent}        ",
+            )
+            yield f"{indent}    </details>"
+            yield f"{indent}</div>"
 
-    lines.append(f"{indent}</div>")
-    return "\n".join(lines)
+    yield f"{indent}</div>"
+    if grid_href:
+        yield f"{indent}</noscript>"
 
 
-def generate_now_html(now: dict[str, object], indent: str = "                ") -> str:
-    """Generate Now section content from now.json."""
-    sections = cast(dict[str, object], now["sections"])
-    location = cast(dict[str, object], now["location"])
+def generate_albums_html(albums: list[Album], indent: str = "                ") -> str:
+    """Generate year-grouped album grid HTML, sorted by listened date (newest first)."""
+    return "\n".join(iter_albums_html(albums, indent))
+
+
+def iter_stats_html(
+    books: dict[str, object],
+    albums: dict[str, object],
+    indent: str = "                ",
+) -> Iterator[str]:
+    """Yield Stats section lines from the book_stats/album_stats aggregates."""
+
+    def row(label: str, value_html: str) -> str:
+        return f'{indent}<p><span class="muted small">{label}</span><br>{value_html}</p>'
+
+    per_year = cast(dict[str, int], books["perYear"])
+    yearly = {year: count for year, count in per_year.items() if year != "<2015"}
+    reading = f"{books['total']} books tracked"
+    if yearly:
+        busiest = max(yearly, key=lambda year: yearly[year])
+        reading += f" · most in {html.escape(busiest)} ({yearly[busiest]})"
+    yield row("Reading", reading)
+
+    listening = f"{albums['total']} albums"
+    minutes = cast(int, albums["playtimeMinutes"])
+    if minutes:
+        listening += f" · {minutes / 60:.1f} hours of listening"
+        if albums["playtimeAlbums"] != albums["total"]:
+            listening += f" ({albums['playtimeAlbums']} with a playtime)"
+    yield row("Listening", listening)
+
+    artists = list(cast(dict[str, int], albums["perArtist"]).items())[:STATS_TOP_ARTISTS]
+    if artists:
+        yield row(
+            "Most played artists",
+            " · ".join(f"{html.escape(artist)} ({count})" for artist, count in artists),
+        )
+
+    decades = cast(dict[str, int], albums["releaseDecades"])
+    if decades:
+        yield f'{indent}<p><span class="muted small">Release decades</span></p>'
+        yield f'{indent}<div class="sparkline" aria-hidden="true">'
+        yield f"{indent}    {build_year_sparkline(OrderedDict(decades))}"
+        yield f"{indent}</div>"
+
+
+def iter_now_html(now: NowPage, indent: str = "                ") -> Iterator[str]:
+    """Yield Now section content lines from now.json."""
+    sections = now.sections
+    location = now.location
 
     life_text = str(cast(dict[str, object], sections["life"])["text"])
     life_paragraphs = life_text.split("\n\n")
@@ -276,20 +596,19 @@ def generate_now_html(now: dict[str, object], indent: str = "                ")
     work = cast(dict[str, object], sections["work"])
     future = cast(list[str], cast(dict[str, object], sections["future"])["desires"])
 
-    lines: list[str] = []
-    lines.append(f"{indent}<h3>Life</h3>")
+    yield f"{indent}<h3>Life</h3>"
     # Location aside — show secondary if present
     loc_str = f"{location['emoji']} {location['city']}, {location['state']}"
     secondary = location.get("secondary")
     if secondary:
         secondary_loc = cast(dict[str, object], secondary)
         loc_str += f" / {secondary_loc['city']}, {secondary_loc['state']}"
-    lines.append(f'{indent}<aside class="muted">{loc_str}</aside>')
+    yield f'{indent}<aside class="muted">{loc_str}</aside>'
     for p in life_paragraphs:
         p_html = re.sub(r"\[([^\]]+)\]\(([^\)]+)\)", r'<a href="\2">\1</a>', p)
-        lines.append(f"{indent}<p>{p_html}</p>")
+        yield f"{indent}<p>{p_html}</p>"
 
-    lines.append(f"{indent}<h3>Work</h3>")
+    yield f"{indent}<h3>Work</h3>"
     role = work.get("currentRole")
     company = work.get("company")
     desc = work.get("description")
@@ -299,18 +618,21 @@ def generate_now_html(now: dict[str, object], indent: str = "                ")
     if company:
         meta_lines.append(f"<strong>Company:</strong> {company}")
     if meta_lines:
-        lines.append(f"{indent}<p>" + "<br>\n{}".format(indent).join(meta_lines) + "</p>")
+        yield f"{indent}<p>" + "<br>\n{}".format(indent).join(meta_lines) + "</p>"
     if desc:
         for p in str(desc).split("\n\n"):
-            lines.append(f"{indent}<p>{p}</p>")
+            yield f"{indent}<p>{p}</p>"
 
-    lines.append(f"{indent}<h3>Future</h3>")
-    lines.append(f"{indent}<ul>")
+    yield f"{indent}<h3>Future</h3>"
+    yield f"{indent}<ul>"
     for desire in future:
-        lines.append(f"{indent}    <li>{desire}</li>")
-    lines.append(f"{indent}</ul>")
+        yield f"{indent}    <li>{desire}</li>"
+    yield f"{indent}</ul>"
+
 
-    return "\n".join(lines)
+def generate_now_html(now: NowPage, indent: str = "                ") -> str:
+    """Generate Now section content from now.json."""
+    return "\n".join(iter_now_html(now, indent))
 
 
 ICON_GITHUB = '<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20" viewBox="0 0 24 24" fill="currentColor"><path d="M12 0c-6.626 0-12 5.373-12 12 0 5.302 3.438 9.8 8.207 11.387.599.111.793-.261.793-.577v-2.234c-3.338.726-4.033-1.416-4.033-1.416-.546-1.387-1.333-1.756-1.333-1.756-1.089-.745.083-.729.083-.729 1.205.084 1.839 1.237 1.839 1.237 1.07 1.834 2.807 1.304 3.492.997.107-.775.418-1.305.762-1.604-2.665-.305-5.467-1.334-5.467-5.931 0-1.311.469-2.381 1.236-3.221-.124-.303-.535-1.524.117-3.176 0 0 1.008-.322 3.301 1.23.957-.266 1.983-.399 3.003-.404 1.02.005 2.047.138 3.006.404 2.291-1.552 3.297-1.23 3.297-1.23.653 1.653.242 2.874.118 3.176.77.84 1.235 1.911 1.235 3.221 0 4.609-2.807 5.624-5.479 5.921.43.372.823 1.102.823 2.222v3.293c0 .319.192.694.801.576 4.765-1.589 8.199-6.086 8.199-11.386 0-6.627-5.373-12-12-12z"/></svg>'
@@ -320,9 +642,106 @@ ICON_LINKEDIN = '<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20"
 ICON_GOODREADS = '<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20" viewBox="0 0 24 24" fill="currentColor"><path d="M11.43 23.995c-3.608-.208-6.274-2.077-6.448-5.078.695.007 1.375-.013 2.07-.006.224 1.342 1.065 2.43 2.683 3.026 1.583.496 3.737.46 5.082-.174 1.351-.636 2.145-1.822 2.503-3.577.212-1.042.236-1.734.231-2.92l-.005-1.199h-.046c-.556 1.118-1.278 2.003-2.27 2.622-1.063.665-2.307.96-3.525.96-2.605 0-4.403-1.395-5.505-3.397-.93-1.686-1.327-3.97-1.174-6.21.096-1.417.39-2.725.936-3.856.547-1.13 1.347-2.08 2.374-2.755.969-.638 2.148-1.015 3.483-1.015 1.211 0 2.278.272 3.167.837.89.564 1.571 1.39 2.126 2.405h.044l.179-2.935h2.003c-.042.554-.08 1.388-.08 2.495l-.004 11.237c.002 2.467-.236 4.287-.882 5.578-.872 1.722-2.736 3.072-5.543 3.072-.553 0-1.082-.044-1.6-.11zm3.57-8.236c1.02-.627 1.737-1.558 2.145-2.659.365-.983.494-2.221.494-3.545 0-1.254-.174-2.38-.521-3.386-.403-1.165-1.108-2.083-2.168-2.704-.682-.398-1.456-.6-2.349-.6-1.218 0-2.183.388-2.961 1.158-.749.744-1.263 1.705-1.511 2.892-.192.92-.26 1.853-.217 2.784.05 1.076.231 2.084.597 2.975.464 1.13 1.201 2.028 2.237 2.623.697.399 1.47.596 2.334.596.675 0 1.316-.105 1.92-.334z"/></svg>'
 
 
-def generate_header_icons_html(now: dict[str, object]) -> str:
+LAZY_FRAGMENT_SCRIPT = """    <script>
+        // --lazy pages: fetch a year group's overflow entries on first open.
+        document.querySelectorAll('details[data-fragment]').forEach((details) => {
+            details.addEventListener('toggle', () => {
+                if (!details.open || details.dataset.loaded) return;
+                details.dataset.loaded = 'true';
+                fetch(details.dataset.fragment)
+                    .then((resp) => resp.ok ? resp.text() : Promise.reject(resp.status))
+                    .then((text) => {
+                        details.querySelector('.fragment-link')?.remove();
+                        details.insertAdjacentHTML('beforeend', text);
+                    })
+                    .catch(() => { delete details.dataset.loaded; });
+            });
+        });
+    </script>
+"""
+
+
+class _StringTable:
+    """Deduplicating string table for grid payloads; -1 stands for "none"."""
+
+    def __init__(self):
+        self.strings: list[str] = []
+        self.index: dict[str, int] = {}
+
+    def ref(self, value: object) -> int:
+        if value is None or value == "":
+            return -1
+        text = str(value)
+        i = self.index.get(text)
+        if i is None:
+            i = self.index[text] = len(self.strings)
+            self.strings.append(text)
+        return i
+
+
+def _grid_payload(kind: str, width: int, table: _StringTable, groups: list[list[int]], items: list[int]) -> str:
+    return json.dumps(
+        {
+            "kind": kind,
+            "visible": VISIBLE_COUNT,
+            "threshold": OVERFLOW_THRESHOLD,
+            "width": width,
+            "strings": table.strings,
+            "groups": groups,
+            "items": items,
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def book_grid_payload(books: list[Book]) -> str:
+    """Compact --virtual payload for the Bookshelf grid.
+
+    groups is [[label, count], ...] in page order; items is a flat int array
+    of (title, href) string-table indexes, group after group.
+    """
+    table = _StringTable()
+    groups: list[list[int]] = []
+    items: list[int] = []
+    for year_key, year_books in group_books_by_year(books).items():
+        groups.append([table.ref(year_key), len(year_books)])
+        for book in year_books:
+            items += (table.ref(book.title), table.ref(book_href(book)))
+    return _grid_payload("book", 2, table, groups, items)
+
+
+def album_grid_payload(albums: list[Album]) -> str:
+    """Compact --virtual payload for the Albums grid: items are
+    (artist, album, releaseYear or 0, spotifyUrl or -1, notes or -1)."""
+    table = _StringTable()
+    groups: list[list[int]] = []
+    items: list[int] = []
+    for year, year_albums in group_albums_by_year(albums).items():
+        groups.append([table.ref(year), len(year_albums)])
+        for album in year_albums:
+            items += (
+                table.ref(album.artist),
+                table.ref(album.album),
+                int(album.release_year) if album.release_year else 0,
+                table.ref(album.spotify_url),
+                table.ref(album.notes),
+            )
+    return _grid_payload("album", 5, table, groups, items)
+
+
+def search_documents(books: list[Book], albums: list[Album]) -> list[SearchDoc]:
+    """One search document per book (title) and album (artist + album name)."""
+    docs = [SearchDoc("book", b.title, book_href(b), b.title) for b in books]
+    for album in albums:
+        artist, name = album.artist, album.album
+        docs.append(SearchDoc("album", f"{artist} — {name}", album.spotify_url or None, f"{artist} {name}"))
+    return docs
+
+
+def generate_header_icons_html(now: NowPage) -> str:
     """Generate inline SVG icon links for the header."""
-    links = cast(dict[str, str], now["links"])
+    links = now.links
     icons: list[str] = []
     if "github" in links:
         icons.append(
@@ -339,28 +758,10 @@ def generate_header_icons_html(now: dict[str, object]) -> str:
     return "\n            ".join(icons)
 
 
-def generate_full_html(
-    books_data: dict[str, object],
-    albums_data: dict[str, object],
-    now_data: dict[str, object],
-) -> str:
-    """Generate the complete v4 HTML page."""
-    books = cast(list[dict[str, object]], books_data["books"])
-    albums = cast(list[dict[str, object]], albums_data["albums"])
-    books_html = generate_book_groups_html(books)
-    albums_html = generate_albums_html(albums)
-    now_html = generate_now_html(now_data)
-    header_icons = generate_header_icons_html(now_data)
-
-    now_meta = cast(dict[str, object], now_data["meta"])
-    now_content_date = format_content_date(str(now_meta.get("contentUpdated", "")))
-    books_meta = cast(dict[str, object], books_data["meta"])
-    albums_meta = cast(dict[str, object], albums_data["meta"])
-    books_content_date = format_updated_stamp(str(books_meta.get("contentUpdated", "")))
-    albums_content_date = format_updated_stamp(str(albums_meta.get("contentUpdated", "")))
-    build_date = datetime.now().strftime("%B %d, %Y")
-
-    return f"""<!DOCTYPE html>
+# The page shell: everything outside the Now/Bookshelf/Albums sections. Slots
+# are {{name}} (see page_template.py); it is compiled once to pre-encoded
+# chunks and cached under .cache/templates/.
+PAGE_SHELL = """<!DOCTYPE html>
 <html lang="en" data-theme="dark">
 <head>
     <meta charset="UTF-8">
@@ -371,320 +772,7 @@ def generate_full_html(
     <meta property="og:description" content="Program Director / Data Engineer. Chattanooga, TN & Fayetteville, WV.">
     <meta property="og:type" content="website">
     
-    <style>
-        :root {{
-            /* Dark Mode (Default) */
-            --bg: #1a1a1a;
-            --text: #e0e0e0;
-            --muted: #888;
-            --accent: #88dcb4;
-            --border: #333;
-            --code-bg: #222;
-            --selection: rgba(94, 234, 212, 0.2);
-            --bg-alpha: rgba(26,26,26,0.7);
-            --font-stack: ui-monospace, 'Cascadia Code', 'Source Code Pro', Menlo, Consolas, 'DejaVu Sans Mono', monospace;
-        }}
-
-        [data-theme="light"] {{
-            --bg: #fafafa;
-            --text: #1a1a1a;
-            --muted: #666;
-            --accent: #278061;
-            --border: #ddd;
-            --code-bg: #f0f0f0;
-            --selection: rgba(13, 148, 136, 0.2);
-            --bg-alpha: rgba(250,250,250,0.7);
-        }}
-
-        * {{
-            box-sizing: border-box;
-        }}
-
-        ::selection {{
-            background: var(--accent);
-            color: var(--bg);
-        }}
-
-        html {{
-            scroll-behavior: smooth;
-        }}
-
-        body {{
-            background-color: var(--bg);
-            color: var(--text);
-            font-family: var(--font-stack);
-            font-size: 16px;
-            line-height: 1.6;
-            margin: 0;
-            padding: 2rem;
-            transition: background-color 0.3s ease, color 0.3s ease;
-        }}
-
-        .container {{
-            max-width: 1100px;
-            margin: 0 auto;
-        }}
-
-        /* Typography */
-        h1, h2, h3 {{
-            font-weight: 700;
-            margin-top: 2.5rem;
-            margin-bottom: 1rem;
-            line-height: 1.2;
-            letter-spacing: -0.03em;
-        }}
-
-        h1 {{ font-size: 2rem; margin-top: 0; }}
-        h2 {{ font-size: 1.4rem; color: var(--accent); }}
-        h3 {{ font-size: 1.1rem; margin-top: 1.5rem; }}
-
-        p, li {{ margin-bottom: 1rem; }}
-        
-        a {{
-            color: var(--text);
-            text-decoration: underline;
-            text-decoration-color: var(--accent);
-            text-decoration-thickness: 1px;
-            text-underline-offset: 4px;
-            transition: color 0.2s, text-decoration-color 0.2s;
-        }}
-
-        a:hover {{
-            color: var(--accent);
-            text-decoration-color: transparent;
-        }}
-
-        ul {{
-            padding-left: 1.5rem;
-            list-style-type: square;
-        }}
-
-        .muted {{ color: var(--muted); font-size: 0.9em; }}
-        .small {{ font-size: 0.85rem; }}
-
-        /* Section header (flex row with right-aligned metadata) */
-        .section-header {{
-            display: flex;
-            align-items: baseline;
-            justify-content: space-between;
-            gap: 1rem;
-        }}
-
-        /* Header */
-        .header-row {{
-            display: flex;
-            align-items: baseline;
-            justify-content: space-between;
-            gap: 1rem;
-        }}
-
-        .header-icons {{
-            display: flex;
-            gap: 0.75rem;
-            align-items: center;
-        }}
-
-        .header-icon {{
-            color: var(--muted);
-            text-decoration: none;
-            transition: color 0.2s;
-            display: flex;
-        }}
-
-        .header-icon:hover {{
-            color: var(--accent);
-        }}
-
-        /* Navigation */
-        nav {{
-            margin: 1.5rem 0 3rem 0;
-            padding: 1rem 0;
-            border-top: 1px solid var(--border);
-            border-bottom: 1px solid var(--border);
-            display: flex;
-            flex-wrap: wrap;
-            gap: 0.5rem;
-        }}
-
-        nav a {{ text-decoration: none; }}
-        nav a:hover {{ color: var(--accent); }}
-        .nav-separator {{ color: var(--muted); padding: 0 0.5rem; }}
-
-        /* Sections */
-        section {{ margin-bottom: 4rem; }}
-
-        section p, section ul, section aside {{
-            max-width: 80ch;
-        }}
-
-        /* Content Grid (Books & Albums) */
-        .book-group,
-        .album-group {{
-            margin-bottom: 0.5rem;
-            padding-left: 1rem;
-            border-left: 2px solid var(--border);
-            transition: border-color 0.2s;
-        }}
-
-        .book-group:hover,
-        .album-group:hover {{
-            border-left-color: var(--accent);
-        }}
-
-        .book-year,
-        .album-year {{
-            display: block;
-            font-weight: bold;
-            padding: 0.25rem 0;
-        }}
-
-        details.book-group summary,
-        details.album-group summary {{
-            list-style: none;
-            cursor: pointer;
-            font-weight: bold;
-            padding: 0.25rem 0;
-            user-select: none;
-        }}
-
-        details.book-group summary::-webkit-details-marker,
-        details.album-group summary::-webkit-details-marker {{
-            display: none;
-        }}
-
-        details.book-group summary::before,
-        details.album-group summary::before {{
-            content: "[+] ";
-            color: var(--muted);
-            font-size: 0.9em;
-        }}
-
-        details.book-group[open] > summary::before,
-        details.album-group[open] > summary::before {{
-            content: "[-] ";
-        }}
-
-        details.book-group summary:hover,
-        details.album-group summary:hover {{
-            color: var(--accent);
-        }}
-
-        details.book-overflow,
-        details.album-overflow {{
-            margin-top: 0.25rem;
-        }}
-
-        details.book-overflow summary,
-        details.album-overflow summary {{
-            list-style: none;
-            cursor: pointer;
-            user-select: none;
-            padding: 0.25rem 0;
-        }}
-
-        details.book-overflow summary::-webkit-details-marker,
-        details.album-overflow summary::-webkit-details-marker {{
-            display: none;
-        }}
-
-        details.book-overflow summary:hover,
-        details.album-overflow summary:hover {{
-            color: var(--accent);
-        }}
-
-        .book-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(320px, 1fr));
-            gap: 1rem 2rem;
-        }}
-
-        .book-title {{
-            display: block;
-            color: var(--muted);
-            font-size: 0.9em;
-            line-height: 1.5;
-            text-decoration: none;
-        }}
-
-        a.book-title:hover {{
-            color: var(--accent);
-            text-decoration: underline;
-        }}
-
-        .sparkline {{
-            color: var(--muted);
-            font-size: 0.85rem;
-            margin-bottom: 1rem;
-            line-height: 1.6;
-        }}
-
-        .album-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(320px, 1fr));
-            gap: 1rem 2rem;
-        }}
-
-        .album-title {{
-            display: block;
-            text-decoration: none;
-        }}
-
-        a.album-title:hover {{
-            color: var(--accent);
-            text-decoration: underline;
-        }}
-
-        .album-note {{
-            display: block;
-            color: var(--muted);
-            font-size: 0.85em;
-            font-style: italic;
-            line-height: 1.4;
-            margin-bottom: 0.5rem;
-        }}
-
-        /* Theme Toggle */
-        .theme-toggle {{
-            position: fixed;
-            top: 1.5rem;
-            right: 1.5rem;
-            background: var(--bg-alpha);
-            backdrop-filter: blur(8px);
-            -webkit-backdrop-filter: blur(8px);
-            border: 1px solid var(--border);
-            color: var(--text);
-            padding: 0.5rem;
-            cursor: pointer;
-            border-radius: 4px;
-            font-family: inherit;
-            line-height: 1;
-            z-index: 100;
-        }}
-        
-        .theme-toggle:hover {{
-            border-color: var(--accent);
-            color: var(--accent);
-        }}
-
-        .back-to-top {{
-            display: block;
-            text-align: right;
-            font-size: 0.8rem;
-            margin-top: 1rem;
-            color: var(--muted);
-            text-decoration: none;
-        }}
-        .back-to-top:hover {{ color: var(--accent); }}
-
-        /* Responsive */
-        @media (max-width: 768px) {{
-            body {{ padding: 1rem; }}
-            h1 {{ font-size: 1.7rem; }}
-            nav {{ font-size: 0.9rem; }}
-            .theme-toggle {{ top: 1rem; right: 1rem; }}
-            .book-grid, .album-grid {{ grid-template-columns: 1fr; }}
-        }}
-    </style>
+    <link rel="stylesheet" href="{{css_href}}">
 </head>
 <body>
 
@@ -696,26 +784,31 @@ def generate_full_html(
             <div class="header-row">
                 <h1>Kyle Fring</h1>
                 <div class="header-icons">
-                    {header_icons}
+                    {{header_icons}}
                 </div>
             </div>
             <nav>
                 <a href="#now">Now</a> <span class="nav-separator">·</span>
                 <a href="#bookshelf">Bookshelf</a> <span class="nav-separator">·</span>
                 <a href="#albums">Albums</a> <span class="nav-separator">·</span>
+                <a href="#stats">Stats</a> <span class="nav-separator">·</span>
                 <a href="/brief/">Brief</a> <span class="nav-separator">·</span>
                 <a href="#epilogue">Epilogue</a>
             </nav>
+            <div class="site-search" role="search" hidden>
+                <input type="search" id="site-search" placeholder="search books &amp; albums" aria-label="Search books and albums" autocomplete="off" data-index="{{search_index}}">
+                <ul id="search-results" class="search-results"></ul>
+            </div>
         </header>
 
         <main>
             <section id="now">
                 <div class="section-header">
                     <h2>Now</h2>
-                    <span class="muted small">{now_content_date}</span>
+                    <span class="muted small">{{now_date}}</span>
                 </div>
                 
-{now_html}
+{{now_html}}
 
                 <a href="#top" class="back-to-top">↑</a>
             </section>
@@ -723,99 +816,697 @@ def generate_full_html(
             <section id="bookshelf">
                 <div class="section-header">
                     <h2>Bookshelf</h2>
-                    <span class="muted small">{books_content_date}</span>
+                    <span class="muted small">{{books_date}}</span>
                 </div>
 
-{books_html}
+{{books_html}}
                 <a href="#top" class="back-to-top">↑</a>
             </section>
 
             <section id="albums">
                 <div class="section-header">
                     <h2>Albums</h2>
-                    <span class="muted small">{albums_content_date}</span>
+                    <span class="muted small">{{albums_date}}</span>
                 </div>
 
-{albums_html}
+{{albums_html}}
+                <a href="#top" class="back-to-top">↑</a>
+            </section>
+
+            <section id="stats">
+                <h2>Stats</h2>
+
+{{stats_html}}
                 <a href="#top" class="back-to-top">↑</a>
             </section>
 
             <section id="epilogue">
                 <h2>Epilogue</h2>
-                <p>Previous iterations: <a href="http://v3.fring.io">v3</a> (2020) · <a href="http://v2.fring.io">v2</a> (2015) · <a href="http://v1.kfring.com">v1</a> (2013) · <span class="muted small">Built {build_date}</span></p>
+                <p>Previous iterations: <a href="http://v3.fring.io">v3</a> (2020) · <a href="http://v2.fring.io">v2</a> (2015) · <a href="http://v1.kfring.com">v1</a> (2013) · <span class="muted small">Built {{build_date}}</span></p>
                 <a href="#top" class="back-to-top">↑</a>
             </section>
 
         </main>
     </div>
 
-    <script>
-        const toggleBtn = document.getElementById('theme-toggle');
-        const html = document.documentElement;
-        
-        // Check local storage or system preference
-        const savedTheme = localStorage.getItem('theme');
-        if (savedTheme) {{
-            html.setAttribute('data-theme', savedTheme);
-            updateIcon(savedTheme);
-        }} else if (window.matchMedia('(prefers-color-scheme: light)').matches) {{
-            html.setAttribute('data-theme', 'light');
-            updateIcon('light');
-        }}
-
-        function updateIcon(theme) {{
-            toggleBtn.textContent = theme === 'light' ? '☾' : '☀';
-        }}
-
-        toggleBtn.addEventListener('click', () => {{
-            const currentTheme = html.getAttribute('data-theme');
-            const newTheme = currentTheme === 'light' ? 'dark' : 'light';
-            
-            html.setAttribute('data-theme', newTheme);
-            localStorage.setItem('theme', newTheme);
-            updateIcon(newTheme);
-        }});
-    </script>
-</body>
+    <script src="{{js_href}}" data-sw="sw.js"></script>
+    <script src="{{search_js_href}}" defer></script>
+{{page_scripts}}</body>
 </html>"""
 
 
+# Which content JSON (by file stem) each page section reads. A
+# --parallel-sections worker loads only these; Stats renders from the
+# EntryStats it is handed and reads none.
+SECTION_INPUTS: dict[str, tuple[str, ...]] = {
+    "header_icons": ("now",),
+    "now": ("now",),
+    "books": ("books",),
+    "albums": ("albums",),
+    "stats": (),
+}
+
+
+def grid_hrefs(grids: dict[str, str] | None) -> dict[str, str]:
+    """Asset hrefs of the --virtual grid payloads, by section."""
+    if not grids:
+        return {}
+    return {
+        "books": asset_href("books-grid", "json", grids["books"]),
+        "albums": asset_href("albums-grid", "json", grids["albums"]),
+    }
+
+
+def section_cache_entries(
+    now: NowPage,
+    stats: EntryStats,
+    mode: str,
+) -> dict[str, tuple[str, object] | None]:
+    """Each section's SectionCache (name, payload), or None if it isn't cached.
+    Bookshelf, Albums and Stats are keyed by their entries' digests."""
+    return {
+        "header_icons": None,
+        "now": ("now", now.to_json()),
+        "books": (f"books{mode}", stats.books_digest),
+        "albums": (f"albums{mode}", stats.albums_digest),
+        "stats": ("stats", [stats.books_digest, stats.albums_digest]),
+    }
+
+
+def build_section(
+    name: str,
+    data: dict[str, BookLog | AlbumLog | NowPage],
+    stats: EntryStats,
+    lazy: bool = False,
+    grid_href: str | None = None,
+) -> Iterable[str]:
+    """Render one section of the page; data holds the content it reads
+    (SECTION_INPUTS), keyed by file stem."""
+    if name == "header_icons":
+        return [generate_header_icons_html(cast(NowPage, data["now"]))]
+    if name == "now":
+        return join_lines(iter_now_html(cast(NowPage, data["now"])))
+    if name == "books":
+        books = cast(BookLog, data["books"]).books
+        return join_lines(iter_book_groups_html(books, lazy=lazy, grid_href=grid_href, stats=stats.books))
+    if name == "albums":
+        albums = cast(AlbumLog, data["albums"]).albums
+        return join_lines(iter_albums_html(albums, lazy=lazy, grid_href=grid_href, stats=stats.albums))
+    if name == "stats":
+        return join_lines(iter_stats_html(stats.books, stats.albums))
+    raise KeyError(f"unknown section: {name}")
+
+
+def _render_section(job: tuple[str, Path, EntryStats, bool, str | None]) -> tuple[str, str, float]:
+    """Section pool worker: load the section's JSON, render it, time both.
+    Top-level for pickling."""
+    name, content_dir, stats, lazy, grid_href = job
+    start = time.perf_counter()
+    data = {stem: MODELS[stem].load(content_dir / f"{stem}.json") for stem in SECTION_INPUTS[name]}
+    text = "".join(build_section(name, data, stats, lazy, grid_href))
+    return name, text, time.perf_counter() - start
+
+
+def render_sections_parallel(
+    content_dir: Path,
+    names: list[str],
+    stats: EntryStats,
+    lazy: bool = False,
+    grids: dict[str, str] | None = None,
+    workers: int | None = None,
+) -> tuple[dict[str, str], dict[str, float]]:
+    """Render the named sections concurrently, one process each (up to
+    workers). Returns their HTML and each worker's seconds, JSON load
+    included — the largest of those is the build's critical path."""
+    hrefs = grid_hrefs(grids)
+    jobs = [(name, content_dir, stats, lazy, hrefs.get(name)) for name in names]
+    rendered: dict[str, str] = {}
+    seconds: dict[str, float] = {}
+    if not jobs:
+        return rendered, seconds
+    with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(jobs))) as pool:
+        for name, text, elapsed in pool.map(_render_section, jobs):
+            rendered[name] = text
+            seconds[name] = elapsed
+    return rendered, seconds
+
+
+def _timed(name: str, chunks: Iterable[str], timings: dict[str, float]) -> Iterator[str]:
+    """Pass chunks through, adding the time spent producing them to timings[name]."""
+    iterator = iter(chunks)
+    elapsed = 0.0
+    while True:
+        start = time.perf_counter()
+        chunk = next(iterator, None)
+        elapsed += time.perf_counter() - start
+        if chunk is None:
+            break
+        yield chunk
+    timings[name] = elapsed
+
+
+def format_timings(seconds: dict[str, float]) -> str:
+    """"books 4.1 ms · albums 1.2 ms · ...", slowest first."""
+    ordered = sorted(seconds.items(), key=lambda kv: kv[1], reverse=True)
+    return " · ".join(f"{name} {elapsed * 1000:.1f} ms" for name, elapsed in ordered)
+
+
+def iter_full_html(
+    book_log: BookLog,
+    album_log: AlbumLog,
+    now: NowPage,
+    cache: SectionCache | None = None,
+    lazy: bool = False,
+    grids: dict[str, str] | None = None,
+    css: str = SITE_CSS,
+    prerendered: dict[str, str] | None = None,
+    timings: dict[str, float] | None = None,
+    stats: EntryStats | None = None,
+) -> Iterator[bytes]:
+    """Yield the complete v4 HTML page as encoded chunks, section by section.
+
+    With a SectionCache, the Now/Bookshelf/Albums/Stats sections are served from
+    disk when their input is unchanged since the last run. With lazy=True,
+    overflow entries are referenced by fragment instead of inlined. With
+    grids ({"books": payload, "albums": payload}, see book_grid_payload),
+    the two grids are virtualized client-side by GRID_JS. css is the
+    stylesheet source the page links (minified under --minify).
+
+    prerendered maps section names to HTML already rendered elsewhere
+    (render_sections_parallel); those sections are not rendered again. With a
+    timings dict, the time spent producing each section is recorded in it.
+    stats is EntryStats.of(book_log, album_log), worked out here if the
+    caller hasn't already.
+    """
+    now_meta = now.meta
+    books_meta = book_log.meta
+    albums_meta = album_log.meta
+
+    mode = "-lazy" if lazy else "-virtual" if grids else ""
+    hrefs = grid_hrefs(grids)
+    data: dict[str, BookLog | AlbumLog | NowPage] = {"books": book_log, "albums": album_log, "now": now}
+    stats = stats or EntryStats.of(book_log, album_log)
+    entries = section_cache_entries(now, stats, mode)
+    if lazy:
+        page_scripts = LAZY_FRAGMENT_SCRIPT
+    elif grids:
+        page_scripts = f'    <script src="{asset_href("grid", "js", GRID_JS)}" defer></script>\n'
+    else:
+        page_scripts = ""
+
+    def section(name: str) -> Iterator[str]:
+        def build() -> Iterable[str]:
+            if prerendered is not None and name in prerendered:
+                return [prerendered[name]]
+            return build_section(name, data, stats, lazy, hrefs.get(name))
+
+        entry = entries[name]
+        chunks = iter(build()) if cache is None or entry is None else cache.stream(*entry, build)
+        return _timed(name, chunks, timings) if timings is not None else chunks
+
+    # Section slots are lazy iterators; the template pulls them in page order.
+    yield from load_template(PAGE_SHELL).iter_bytes({
+        "css_href": asset_href("site", "css", css),
+        "header_icons": section("header_icons"),
+        "search_index": f"{SEARCH_DIR}/{SEARCH_MANIFEST}",
+        "now_date": format_content_date(str(now_meta.get("contentUpdated", ""))),
+        "now_html": section("now"),
+        "books_date": format_updated_stamp(str(books_meta.get("contentUpdated", ""))),
+        "books_html": section("books"),
+        "albums_date": format_updated_stamp(str(albums_meta.get("contentUpdated", ""))),
+        "albums_html": section("albums"),
+        "stats_html": section("stats"),
+        "build_date": build_datetime(now_meta, books_meta, albums_meta).strftime("%B %d, %Y"),
+        "js_href": asset_href("theme", "js", THEME_JS),
+        "search_js_href": asset_href("search", "js", SEARCH_JS),
+        "page_scripts": page_scripts,
+    })
+
+
+def generate_full_html(
+    book_log: BookLog,
+    album_log: AlbumLog,
+    now: NowPage,
+    cache: SectionCache | None = None,
+    lazy: bool = False,
+    grids: dict[str, str] | None = None,
+    css: str = SITE_CSS,
+    prerendered: dict[str, str] | None = None,
+    timings: dict[str, float] | None = None,
+    stats: EntryStats | None = None,
+) -> str:
+    """Generate the complete v4 HTML page."""
+    chunks = iter_full_html(book_log, album_log, now, cache, lazy, grids, css, prerendered, timings, stats)
+    return b"".join(chunks).decode("utf-8")
+
+
+def write_full_html(
+    out: IO[bytes],
+    book_log: BookLog,
+    album_log: AlbumLog,
+    now: NowPage,
+    cache: SectionCache | None = None,
+    lazy: bool = False,
+    grids: dict[str, str] | None = None,
+    css: str = SITE_CSS,
+    prerendered: dict[str, str] | None = None,
+    timings: dict[str, float] | None = None,
+    stats: EntryStats | None = None,
+) -> None:
+    """Stream the complete v4 HTML page into an open binary file handle."""
+    out.writelines(iter_full_html(book_log, album_log, now, cache, lazy, grids, css, prerendered, timings, stats))
+
+
+def write_fragments(output_dir: Path, books: list[Book], albums: list[Album]) -> list[Path]:
+    """Write one overflow fragment per long year group for --lazy pages.
+
+    Each fragment holds exactly the entries the inline page would have put
+    inside that group's "[+] N more" <details>. Fragments left over from
+    groups that no longer overflow are removed.
+    """
+    indent = "                        "
+    written: list[Path] = []
+
+    def write(href: str, lines: Iterable[str]) -> None:
+        path = output_dir / href
+        with open(path, "w") as f:
+            for chunk in join_lines(lines):
+                _ = f.write(chunk)
+            _ = f.write("\n")
+        written.append(path)
+
+    _ = (output_dir / FRAGMENT_DIR).mkdir(parents=True, exist_ok=True)
+    for year_key, year_books in group_books_by_year(books).items():
+        if len(year_books) > OVERFLOW_THRESHOLD:
+            write(
+                fragment_href("books", year_key),
+                (f"{indent}{book_title_html(book)}" for book in year_books[VISIBLE_COUNT:]),
+            )
+    for year, year_albums in group_albums_by_year(albums).items():
+        if len(year_albums) > OVERFLOW_THRESHOLD:
+            write(
+                fragment_href("albums", year),
+                (
+                    line
+                    for album in year_albums[VISIBLE_COUNT:]
+                    for line in album_lines(album, indent)
+                ),
+            )
+
+    for stale in (output_dir / FRAGMENT_DIR).glob("*.html"):
+        if stale not in written:
+            stale.unlink()
+    return written
+
+
+@dataclass(frozen=True)
+class RenderOptions:
+    """How render_site() builds a site; one per run, shared by batch tenants.
+
+    site_url is the public root the sitemap's URLs are built on. With
+    parallel_sections, the page sections the cache can't serve are rendered
+    concurrently in a process pool first (render_sections_parallel) and the
+    page is then assembled from them.
+    """
+
+    lazy: bool = False
+    virtual: bool = False
+    compress: bool = False
+    facet_pages: bool = False
+    minify: bool = False
+    site_url: str = SITE_URL
+    parallel_sections: bool = False
+
+
+def render_site(
+    content_dir: Path,
+    output_dir: Path,
+    cache: SectionCache | None = None,
+    options: RenderOptions = RenderOptions(),
+    detail_state: Path = DETAIL_STATE_PATH,
+    workers: int | None = None,
+    log: Callable[[str], object] = print,
+) -> dict[str, object]:
+    """Render one site: content_dir/*.json → output_dir/index.html and everything
+    beside it (assets, detail pages, facets, static API, search index, sitemap,
+    optional fragments/grids), as options say.
+
+    workers is passed to the section, detail-page and compression pools;
+    batch mode uses 1 so tenants, not their pages, are what runs in parallel.
+    The result's "changed" says whether index.html or any page, facet, API
+    or search file beside it was written or removed.
+    """
+    lazy = options.lazy
+    minify = options.minify
+    book_log = BookLog.load(content_dir / "books.json")
+    album_log = AlbumLog.load(content_dir / "albums.json")
+    now = NowPage.load(content_dir / "now.json")
+
+    books = book_log.books
+    albums = album_log.albums
+    log(f"  Books:  {len(books)}")
+    log(f"  Albums: {len(albums)}")
+
+    grids = None
+    if options.virtual:
+        grids = {"books": book_grid_payload(books), "albums": album_grid_payload(albums)}
+
+    stats = EntryStats.of(book_log, album_log)
+    prerendered = None
+    if options.parallel_sections:
+        mode = "-lazy" if lazy else "-virtual" if grids else ""
+        entries = section_cache_entries(now, stats, mode)
+        todo = [
+            name
+            for name, entry in entries.items()
+            if cache is None or entry is None or not cache.has(*entry)
+        ]
+        if all(entries[name] is None for name in todo):
+            todo = []  # only the trivial uncached slots; not worth a pool
+        start = time.perf_counter()
+        prerendered, worker_seconds = render_sections_parallel(content_dir, todo, stats, lazy, grids, workers)
+        wall = time.perf_counter() - start
+        log(f"  Section workers: {format_timings(worker_seconds) or 'none (all cached)'}")
+        if worker_seconds:
+            critical = max(worker_seconds, key=lambda name: worker_seconds[name])
+            log(
+                f"  Section pool: {len(todo)} section(s) in {wall * 1000:.1f} ms wall"
+                f" (critical path: {critical} {worker_seconds[critical] * 1000:.1f} ms)"
+            )
+
+    timings: dict[str, float] = {}
+    output_file = output_dir / "index.html"
+    _ = output_dir.mkdir(parents=True, exist_ok=True)
+    css = minify_css(SITE_CSS) if minify else SITE_CSS
+    previous = output_file.read_bytes() if output_file.exists() else None
+    if minify:
+        # Minifying needs the whole page, so this path gives up streaming.
+        page = generate_full_html(book_log, album_log, now, cache, lazy, grids, css, prerendered, timings, stats)
+        minified = minify_html(page).encode("utf-8")
+        index_changed = write_if_changed(output_file, minified)
+        log(f"  Minified: {output_file.name} {format_saving(len(page.encode('utf-8')), len(minified))}")
+        log(f"  Minified: site.css {format_saving(len(SITE_CSS), len(css))}")
+    else:
+        with open(output_file, "wb") as f:
+            write_full_html(f, book_log, album_log, now, cache, lazy, grids, css, prerendered, timings, stats)
+        # Streamed straight to disk, so compare afterwards.
+        index_changed = output_file.read_bytes() != previous
+    log(f"  {'Section assembly' if prerendered else 'Section times'}: {format_timings(timings)}")
+    css_href = write_asset(output_dir, "site", "css", css)
+    js_href = write_asset(output_dir, "theme", "js", THEME_JS)
+    search_js_href = write_asset(output_dir, "search", "js", SEARCH_JS)
+    if cache is not None:
+        log(f"  Cache:  {cache.summary()}")
+    if lazy:
+        fragments = write_fragments(output_dir, books, albums)
+        log(f"  Fragments: {len(fragments)} written to {output_dir / FRAGMENT_DIR}/")
+    precache = ["index.html", css_href, js_href, search_js_href, f"{SEARCH_DIR}/{SEARCH_MANIFEST}"]
+    if grids:
+        grid_hrefs = [
+            write_asset(output_dir, "grid", "js", GRID_JS),
+            write_asset(output_dir, "books-grid", "json", grids["books"]),
+            write_asset(output_dir, "albums-grid", "json", grids["albums"]),
+        ]
+        log(f"  Grids:  {', '.join(grid_hrefs)}")
+        precache.extend(grid_hrefs)
+    detail_stats = write_detail_pages(output_dir, books, albums, css_href, js_href, detail_state, workers)
+    log(
+        f"  Detail pages: {detail_stats['pages']} in {output_dir / BOOKS_DIR}/ and"
+        f" {output_dir / ALBUMS_DIR}/ ({detail_stats['rendered']} rendered,"
+        f" {detail_stats['written']} written, {detail_stats['removed']} removed)"
+    )
+    facet_stats = write_facet_indexes(output_dir, books, albums, options.facet_pages, css_href, js_href)
+    log(
+        f"  Facets: {facet_stats['values']} value(s) in {output_dir / FACET_DIR}/"
+        f" ({facet_stats['written']} written, {facet_stats['removed']} removed)"
+    )
+    api_stats = write_static_api(output_dir, books, albums, now)
+    log(
+        f"  API:    {api_stats['files']} file(s) in {output_dir / API_DIR}/"
+        f" ({api_stats['written']} written, {api_stats['removed']} removed)"
+    )
+    search_stats = write_search_index(output_dir, search_documents(books, albums))
+    log(
+        f"  Search: {search_stats['shards']} shard(s) in {output_dir / SEARCH_DIR}/"
+        f" ({search_stats['written']} written, {search_stats['removed']} removed)"
+    )
+    sitemap_stats = write_sitemap(output_dir, options.site_url)
+    log(
+        f"  Sitemap: {sitemap_stats['urls']} URL(s) in {output_dir / SITEMAP_NAME}"
+        f" ({sitemap_stats['changed']} new or changed, {sitemap_stats['removed']} removed)"
+    )
+    # Brief pages live under brief/ with a worker of their own.
+    worker = write_service_worker(output_dir, precache, "fring-v4", exclude=("brief/",))
+    log(f"  Service worker: {output_dir / SW_NAME} (version {worker['version']}, {worker['precached']} precached)")
+    if options.compress:
+        manifest = compress_tree(output_dir, workers)
+        log(f"  Compressed: {summarize_compression(manifest)}")
+
+    return {
+        "output": output_file,
+        "bytes": output_file.stat().st_size,
+        "books": len(books),
+        "albums": len(albums),
+        "assets": [css_href, js_href, search_js_href],
+        "cache": cache.summary() if cache is not None else "off",
+        "detailWritten": detail_stats["written"],
+        # Assets are hashed into index.html and the sitemap and service worker
+        # follow the pages, so these cover every change a browser would see.
+        "changed": index_changed
+        or any(
+            counts["written"] or counts["removed"]
+            for counts in (detail_stats, facet_stats, api_stats, search_stats)
+        ),
+    }
+
+
+def read_tenants(path: Path) -> list[tuple[Path, Path]]:
+    """Parse a tenants file: one "<content-dir> <output-dir>" pair per line,
+    blank lines and # comments ignored."""
+    tenants: list[tuple[Path, Path]] = []
+    for number, line in enumerate(path.read_text().splitlines(), 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        parts = line.split()
+        if len(parts) != 2:
+            raise ValueError(f"{path}:{number}: expected '<content-dir> <output-dir>', got {line!r}")
+        tenants.append((Path(parts[0]), Path(parts[1])))
+    return tenants
+
+
+def tenant_key(output_dir: Path) -> str:
+    """Stable per-tenant cache directory name."""
+    resolved = str(output_dir.resolve())
+    return f"{output_dir.name or 'site'}-{hashlib.sha256(resolved.encode()).hexdigest()[:8]}"
+
+
+def _render_tenant(job: tuple[Path, Path, Path | None, RenderOptions]) -> dict[str, object]:
+    """Batch worker: render one tenant quietly and time it. Top-level for pickling.
+
+    Any exception is the tenant's failure, reported in its stats; it must not
+    reach render_batch and take the other tenants down with it."""
+    content_dir, output_dir, cache_root, options = job
+    start = time.perf_counter()
+    state_dir = (cache_root or CACHE_DIR / "tenants") / tenant_key(output_dir)
+    cache = SectionCache(state_dir / "sections") if cache_root is not None else None
+    try:
+        stats = render_site(
+            content_dir,
+            output_dir,
+            cache,
+            options,
+            detail_state=state_dir / "detail_pages.marshal",
+            workers=1,
+            log=lambda _line: None,
+        )
+    except Exception as e:
+        stats = {"output": output_dir / "index.html", "error": f"{type(e).__name__}: {e}"}
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def render_batch(
+    tenants: list[tuple[Path, Path]],
+    jobs: int | None = None,
+    cache_root: Path | None = CACHE_DIR / "tenants",
+    options: RenderOptions = RenderOptions(),
+) -> list[dict[str, object]]:
+    """Render every (content_dir, output_dir) pair across a process pool.
+
+    Each tenant gets its own section cache and detail-page state under
+    cache_root/<tenant_key>/ (section caches prune per section name, so
+    tenants can't share one). The compiled page templates are shared: they
+    are loaded here before the pool starts, so forked workers inherit them,
+    and otherwise come from the common .cache/templates/ directory.
+    """
+    _ = load_template(PAGE_SHELL)
+    _ = load_template(DETAIL_SHELL)
+    _ = load_template(FACET_SHELL)
+    work = [(c, o, cache_root, options) for c, o in tenants]
+    results: list[dict[str, object]] = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(_render_tenant, job): job for job in work}
+        for future in as_completed(futures):
+            try:
+                stats = future.result()
+            except Exception as e:
+                # The worker itself died (killed, unpicklable result, ...).
+                output_dir = futures[future][1]
+                stats = {"output": output_dir / "index.html", "error": f"{type(e).__name__}: {e}", "seconds": 0.0}
+            results.append(stats)
+            mark, error = ("✗", f": {stats['error']}") if "error" in stats else ("✓", "")
+            print(f"  {mark} {stats['output']} ({cast(float, stats['seconds']) * 1000:.0f} ms){error}")
+    return results
+
+
 def main():
     parser = argparse.ArgumentParser(description="Regenerate v4 HTML from content JSON")
     _ = parser.add_argument(
         "--preview", action="store_true", help="Print HTML to stdout instead of writing"
     )
+    mode = parser.add_mutually_exclusive_group()
+    _ = mode.add_argument(
+        "--lazy",
+        action="store_true",
+        help=f"Move overflow entries into per-year files under {FRAGMENT_DIR}/, fetched on expand",
+    )
+    _ = mode.add_argument(
+        "--virtual",
+        action="store_true",
+        help="Render Bookshelf/Albums client-side from compact JSON, only near the viewport "
+        "(server-rendered grids kept as the <noscript> fallback)",
+    )
+    _ = parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Also write .gz/.br variants and encodings.json (see compress_site.py)",
+    )
+    _ = parser.add_argument(
+        "--facet-pages",
+        action="store_true",
+        help=f"Also write static HTML browse pages next to the facet JSON in {FACET_DIR}/",
+    )
+    _ = parser.add_argument(
+        "--minify",
+        action="store_true",
+        help="Collapse formatting whitespace and comments in index.html and minify the stylesheet",
+    )
+    _ = parser.add_argument(
+        "--site-url",
+        default=SITE_URL,
+        help=f"Public root URL the sitemap's <loc> entries are built on (default: {SITE_URL})",
+    )
+    _ = parser.add_argument(
+        "--parallel-sections",
+        action="store_true",
+        help="Render the page sections concurrently in a process pool, then assemble the page",
+    )
+    _ = parser.add_argument(
+        "--no-cache", action="store_true", help="Re-render every section, ignoring the on-disk cache"
+    )
+    _ = parser.add_argument(
+        "--cache-dir", type=Path, default=CACHE_DIR, help=f"Section cache directory (default: {CACHE_DIR})"
+    )
+    _ = parser.add_argument(
+        "--content-dir", type=Path, default=Path("content"), help="Content JSON directory (default: content)"
+    )
+    _ = parser.add_argument(
+        "--output-dir", type=Path, default=Path("sites/v4"), help="Site output directory (default: sites/v4)"
+    )
+    _ = parser.add_argument(
+        "--batch",
+        type=Path,
+        default=None,
+        metavar="TENANTS",
+        help="Render many sites: a file of '<content-dir> <output-dir>' lines, rendered concurrently",
+    )
+    _ = parser.add_argument(
+        "--jobs", type=int, default=None, help="Concurrent tenants for --batch (default: one per CPU)"
+    )
     args = parser.parse_args()
     preview = bool(getattr(args, "preview", False))
+    lazy = bool(args.lazy)
+    options = RenderOptions(
+        lazy=lazy,
+        virtual=bool(args.virtual),
+        compress=bool(args.compress),
+        facet_pages=bool(args.facet_pages),
+        minify=bool(args.minify),
+        site_url=str(args.site_url).rstrip("/"),
+        parallel_sections=bool(args.parallel_sections),
+    )
 
-    content_dir = Path("content")
-    output_file = Path("sites/v4/index.html")
+    if args.batch is not None:
+        if preview:
+            parser.error("--preview can't be combined with --batch")
+        if args.parallel_sections:
+            parser.error("--parallel-sections can't be combined with --batch (tenants already render in parallel)")
+        tenants = read_tenants(cast(Path, args.batch))
+        print(f"Regenerating v4 HTML for {len(tenants)} tenant(s)")
+        print("=" * 50)
+        start = time.perf_counter()
+        results = render_batch(
+            tenants,
+            args.jobs,
+            None if args.no_cache else cast(Path, args.cache_dir) / "tenants",
+            options,
+        )
+        wall = time.perf_counter() - start
+        print()
+        print(f"  {'Tenant':<40} {'Books':>7} {'Albums':>7} {'KB':>8} {'ms':>8}  Cache")
+        for r in sorted(results, key=lambda r: str(r["output"])):
+            if "error" in r:
+                print(f"  {str(r['output']):<40} {'—':>7} {'—':>7} {'—':>8} {cast(float, r['seconds']) * 1000:8.0f}  {r['error']}")
+                continue
+            print(
+                f"  {str(r['output']):<40} {r['books']:>7} {r['albums']:>7}"
+                f" {cast(int, r['bytes']) / 1024:8.1f} {cast(float, r['seconds']) * 1000:8.0f}  {r['cache']}"
+            )
+        failed = sum("error" in r for r in results)
+        busy = sum(cast(float, r["seconds"]) for r in results)
+        print(
+            f"\n{'✗' if failed else '✓'} {len(results) - failed}/{len(results)} tenant(s) in {wall:.2f}s wall"
+            f" ({busy:.2f}s summed, {busy / wall if wall else 0:.1f}x parallel)"
+        )
+        return 1 if failed else 0
+
+    cache = None if args.no_cache else SectionCache(cast(Path, args.cache_dir))
+    content_dir = cast(Path, args.content_dir)
+    output_dir = cast(Path, args.output_dir)
 
     print("Regenerating v4 HTML")
     print("=" * 50)
 
-    books_data = load_json(content_dir / "books.json")
-    albums_data = load_json(content_dir / "albums.json")
-    now_data = load_json(content_dir / "now.json")
-
-    books = cast(list[dict[str, object]], books_data["books"])
-    albums = cast(list[dict[str, object]], albums_data["albums"])
-    print(f"  Books:  {len(books)}")
-    print(f"  Albums: {len(albums)}")
-
-    full_html = generate_full_html(books_data, albums_data, now_data)
-
     if preview:
-        print("\n" + full_html)
-    else:
-        _ = output_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_file, "w") as f:
-            _ = f.write(full_html)
+        book_log = BookLog.load(content_dir / "books.json")
+        album_log = AlbumLog.load(content_dir / "albums.json")
+        now = NowPage.load(content_dir / "now.json")
+        books = book_log.books
+        albums = album_log.albums
+        print(f"  Books:  {len(books)}")
+        print(f"  Albums: {len(albums)}")
+        grids = None
+        if args.virtual:
+            grids = {"books": book_grid_payload(books), "albums": album_grid_payload(albums)}
+        print()
+        sys.stdout.flush()
+        if args.minify:
+            page = generate_full_html(book_log, album_log, now, cache, lazy, grids, minify_css(SITE_CSS))
+            _ = sys.stdout.buffer.write(minify_html(page).encode("utf-8"))
+        else:
+            write_full_html(sys.stdout.buffer, book_log, album_log, now, cache, lazy, grids)
+        sys.stdout.buffer.flush()
+        print()
+        return 0
 
-        size_kb = len(full_html.encode("utf-8")) / 1024
-        print(f"\n✓ Generated {output_file} ({size_kb:.1f} KB)")
-        print(f"  Sections: Now, Bookshelf, Albums, Epilogue")
+    stats = render_site(content_dir, output_dir, cache, options)
+    output_file = stats["output"]
+    print(f"\n✓ Generated {output_file} ({cast(int, stats['bytes']) / 1024:.1f} KB)")
+    print(f"  Assets: {', '.join(cast(list[str], stats['assets']))}")
+    print(f"  Sections: Now, Bookshelf, Albums, Stats, Epilogue")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+search_index.py - Sharded prefix index for the v4 page's search box.
+
+regenerate_v4_html.py hands over one document per book and album
+(kind, label, url, indexed text); this module normalizes the text with
+text_normalize.normalize (the rules sync_spotify uses for album matching),
+splits it into words, and shards the word → documents postings by each word's
+leading characters. Every shard is self-contained — it carries the documents
+its words point at — so a query fetches sites/v4/search/index.json once and
+then exactly one shard: the one for the query's longest word. SEARCH_JS in
+site_assets.py does the client side.
+
+Layout under sites/v4/search/:
+  index.json               {"keyLength": k, "docs": n, "shards": {key: file}}
+  <key>.<hash>.json        {"docs": [[kind, label, url, norm], ...],
+                            "terms": [[word, [doc, ...]], ...]}  sorted by word
+
+Shard files are content-hashed, so unchanged shards keep their name (and stay
+cached) across rebuilds; only index.json is rewritten every time.
+
+A browser can hold an older index.json (the service worker answers it from
+cache while it revalidates), so a superseded shard isn't deleted right away:
+search/shard-state.json lists the shard files of the last KEEP_VERSIONS
+builds, newest first, and only files no longer listed there are removed —
+the same policy write_asset() applies to assets/.
+
+Not a script — imported by regenerate_v4_html.py.
+"""
+
+import hashlib
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import NamedTuple, cast
+
+from site_assets import KEEP_VERSIONS
+from text_normalize import normalize
+
+SEARCH_DIR = "search"
+MANIFEST_NAME = "index.json"
+STATE_NAME = "shard-state.json"
+
+# Below this many documents, one-character shard keys keep the file count
+# small; larger logs switch to two characters so each shard stays small.
+SMALL_INDEX_DOCS = 5_000
+
+
+class SearchDoc(NamedTuple):
+    kind: str  # "book" | "album"
+    label: str
+    url: str | None
+    text: str
+
+
+def shard_key_length(doc_count: int) -> int:
+    return 1 if doc_count < SMALL_INDEX_DOCS else 2
+
+
+def _shard_name(key: str) -> str:
+    """Filesystem/URL-safe stem for a shard key."""
+    if key.isascii() and key.isalnum():
+        return key
+    return "x" + key.encode("utf-8").hex()
+
+
+def build_shards(docs: list[SearchDoc]) -> tuple[int, dict[str, dict[str, list[object]]]]:
+    """Return (key_length, {shard_key: shard}) for the given documents."""
+    key_length = shard_key_length(len(docs))
+    postings: dict[str, dict[str, list[int]]] = defaultdict(lambda: defaultdict(list))
+    norms: list[str] = []
+    for doc_id, doc in enumerate(docs):
+        norm = normalize(doc.text)
+        norms.append(norm)
+        for word in sorted(set(norm.split())):
+            postings[word[:key_length]][word].append(doc_id)
+
+    shards: dict[str, dict[str, list[object]]] = {}
+    for key, words in postings.items():
+        local: dict[int, int] = {}
+        shard_docs: list[object] = []
+        terms: list[object] = []
+        for word in sorted(words):
+            ids: list[int] = []
+            for doc_id in words[word]:
+                if doc_id not in local:
+                    local[doc_id] = len(shard_docs)
+                    doc = docs[doc_id]
+                    shard_docs.append([doc.kind, doc.label, doc.url, norms[doc_id]])
+                ids.append(local[doc_id])
+            terms.append([word, ids])
+        shards[key] = {"docs": shard_docs, "terms": terms}
+    return key_length, shards
+
+
+def write_search_index(output_dir: Path, docs: list[SearchDoc]) -> dict[str, int]:
+    """Write the sharded index under output_dir/search/; return write stats."""
+    search_dir = output_dir / SEARCH_DIR
+    _ = search_dir.mkdir(parents=True, exist_ok=True)
+    key_length, shards = build_shards(docs)
+
+    files: dict[str, str] = {}
+    written = 0
+    for key in sorted(shards):
+        body = json.dumps(shards[key], ensure_ascii=False, separators=(",", ":"))
+        digest = hashlib.sha256(body.encode("utf-8")).hexdigest()[:8]
+        name = f"{_shard_name(key)}.{digest}.json"
+        files[key] = name
+        path = search_dir / name
+        if not path.exists():
+            _ = path.write_text(body)
+            written += 1
+
+    state_path = search_dir / STATE_NAME
+    try:
+        builds = cast(list[list[str]], json.loads(state_path.read_text())["builds"])
+    except (FileNotFoundError, ValueError, KeyError):
+        builds = []
+    current = sorted(files.values())
+    if not builds or builds[0] != current:
+        builds = [current] + builds[: KEEP_VERSIONS - 1]
+        _ = state_path.write_text(json.dumps({"builds": builds}, indent=2) + "\n")
+
+    keep = {name for build in builds for name in build} | {MANIFEST_NAME, STATE_NAME}
+    removed = 0
+    for stale in search_dir.glob("*.json"):
+        if stale.name not in keep:
+            stale.unlink()
+            removed += 1
+
+    manifest = {"keyLength": key_length, "docs": len(docs), "shards": files}
+    _ = (search_dir / MANIFEST_NAME).write_text(
+        json.dumps(manifest, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    )
+    return {"shards": len(files), "written": written, "removed": removed}
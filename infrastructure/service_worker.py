@@ -0,0 +1,165 @@
+"""
+service_worker.py - Service worker and precache manifest for the v4 site and /brief.
+
+deploy.yml serves HTML with max-age=3600, so every visit re-downloads
+index.html and the brief pages. Both renderers now also write, at their site
+root:
+
+  sw-manifest.json   {"version": v, "precache": {url: revision, ...}}
+  sw.js              SERVICE_WORKER_JS, prefixed with its version and cache name
+
+The precache list is the renderer's own core files (the page, its hashed
+CSS/JS, the search manifest) and each revision is a hash of the generated
+bytes. sw.js embeds the manifest's version, so any content change changes
+sw.js, which is what makes browsers install the new worker. On install the
+worker copies every entry whose revision is unchanged from the previous
+precache and only fetches the ones that moved.
+
+At runtime, hashed files under assets/ are served cache-first (they never
+change under their name). Everything else — pages, search shards, fragments,
+API and facet JSON — is stale-while-revalidate: answered from cache at once
+and refreshed in the background, so a page is at most one visit behind the
+server. Pages visited once stay readable offline, and an uncached navigation
+offline falls back to the cached index page. A stale search/index.json still
+finds its shards: search_index.py keeps superseded ones for a few builds.
+
+The brief tree gets its own worker (scope /brief/, cache prefix fring-brief).
+The root worker skips brief/ so the two never cache each other's pages.
+Pages register their worker through THEME_JS and the data-sw attribute on its
+<script> tag — except on localhost or under dev_server.py's live reload.
+
+Not a script — imported by regenerate_v4_html.py and regenerate_brief_html.py.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from site_files import write_if_changed
+
+SW_NAME = "sw.js"
+MANIFEST_NAME = "sw-manifest.json"
+
+SERVICE_WORKER_JS = """const PRECACHE = `${CACHE_PREFIX}-precache-${VERSION}`;
+const RUNTIME = `${CACHE_PREFIX}-runtime`;
+const MANIFEST = 'sw-manifest.json';
+const SCOPE = self.registration.scope;
+
+async function previousPrecache() {
+    const names = (await caches.keys()).filter(
+        (name) => name.startsWith(`${CACHE_PREFIX}-precache-`) && name !== PRECACHE);
+    return names.length ? caches.open(names[names.length - 1]) : null;
+}
+
+self.addEventListener('install', (event) => {
+    event.waitUntil((async () => {
+        const manifest = await (await fetch(MANIFEST, { cache: 'no-cache' })).json();
+        const cache = await caches.open(PRECACHE);
+        const previous = await previousPrecache();
+        const known = previous ? await (await previous.match(MANIFEST))?.json() ?? {} : {};
+        await Promise.all(Object.entries(manifest.precache).map(async ([url, revision]) => {
+            if (known[url] === revision) {
+                const hit = await previous.match(url);
+                if (hit) return cache.put(url, hit);
+            }
+            const response = await fetch(url, { cache: 'no-cache' });
+            if (response.ok) await cache.put(url, response);
+        }));
+        await cache.put(MANIFEST, new Response(JSON.stringify(manifest.precache)));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil((async () => {
+        const stale = (await caches.keys()).filter(
+            (name) => name.startsWith(`${CACHE_PREFIX}-precache-`) && name !== PRECACHE);
+        await Promise.all(stale.map((name) => caches.delete(name)));
+        // Runtime copies of precached URLs would shadow the fresher precache.
+        const precache = await caches.open(PRECACHE);
+        const runtime = await caches.open(RUNTIME);
+        await Promise.all((await precache.keys()).map((request) => runtime.delete(request)));
+        await self.clients.claim();
+    })());
+});
+
+async function cached(request) {
+    return (await (await caches.open(RUNTIME)).match(request))
+        ?? (await (await caches.open(PRECACHE)).match(request));
+}
+
+async function cacheFirst(request) {
+    const hit = await cached(request);
+    if (hit) return hit;
+    const response = await fetch(request);
+    if (response.ok) await (await caches.open(RUNTIME)).put(request, response.clone());
+    return response;
+}
+
+async function offlinePage(request) {
+    return (await cached(request)) ?? (await cached(new URL('./', SCOPE).href));
+}
+
+async function staleWhileRevalidate(event) {
+    const request = event.request;
+    const network = fetch(request).then(async (response) => {
+        if (response.ok) await (await caches.open(RUNTIME)).put(request, response.clone());
+        return response;
+    });
+    const hit = await cached(request);
+    if (hit) {
+        event.waitUntil(network.catch(() => {}));
+        return hit;
+    }
+    if (request.mode !== 'navigate') return network;
+    try {
+        return await network;
+    } catch (error) {
+        const fallback = await offlinePage(request);
+        if (fallback) return fallback;
+        throw error;
+    }
+}
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    if (request.method !== 'GET' || !request.url.startsWith(SCOPE)) return;
+    // Event streams (the dev server's live reload) must never be cached.
+    if ((request.headers.get('Accept') || '').includes('text/event-stream')) return;
+    const path = new URL(request.url).pathname.slice(new URL(SCOPE).pathname.length);
+    if (EXCLUDE.some((prefix) => path.startsWith(prefix))) return;
+    if (path.startsWith('assets/')) event.respondWith(cacheFirst(request));
+    else event.respondWith(staleWhileRevalidate(event));
+});
+"""
+
+
+def _revision(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def write_service_worker(
+    output_dir: Path,
+    files: list[str],
+    cache_prefix: str,
+    exclude: tuple[str, ...] = (),
+) -> dict[str, object]:
+    """Write sw.js and sw-manifest.json precaching `files` (paths relative to
+    output_dir; index.html is precached as "./"). Returns the version and
+    how many entries were precached."""
+    precache = {
+        "./" if rel == "index.html" else rel: _revision((output_dir / rel).read_bytes())
+        for rel in files
+    }
+    header = (
+        f"const CACHE_PREFIX = {json.dumps(cache_prefix)};\n"
+        f"const EXCLUDE = {json.dumps(list(exclude))};\n"
+    )
+    # The worker's own code is part of the version, so a change to it also
+    # rolls a new precache.
+    version = _revision(json.dumps(precache, sort_keys=True).encode("utf-8") + (header + SERVICE_WORKER_JS).encode("utf-8"))
+    manifest = json.dumps({"version": version, "precache": precache}, indent=2, sort_keys=True) + "\n"
+    _ = write_if_changed(output_dir / MANIFEST_NAME, manifest.encode("utf-8"))
+    worker = f"const VERSION = {json.dumps(version)};\n{header}\n{SERVICE_WORKER_JS}"
+    _ = write_if_changed(output_dir / SW_NAME, worker.encode("utf-8"))
+    return {"version": version, "precached": len(precache)}
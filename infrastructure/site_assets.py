@@ -0,0 +1,778 @@
+"""
+site_assets.py - Shared stylesheets and scripts for the v4 renderers.
+
+regenerate_v4_html.py and regenerate_brief_html.py used to inline their full
+stylesheet and the theme-toggle script into every page. They now reference
+content-hashed files instead (e.g. assets/site.3f9c2a61d0.css), written next
+to the pages by write_asset(). A hashed file never changes under its name, so
+deploy.yml serves assets/ as immutable while the HTML stays short-lived, and
+every brief week shares one cached copy of the CSS.
+
+A page cached before a deploy (HTML is served with max-age=3600) still links
+the hashes it was built with, so a new hash doesn't replace the old file:
+assets/asset-state.json records each asset's recent hashes, newest first, and
+only files older than the last KEEP_VERSIONS are removed. The deploy's sync
+--delete then keeps those previous copies online too.
+
+Not a script — imported by the renderers.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+ASSET_DIR = "assets"
+STATE_NAME = "asset-state.json"
+# Hashes kept per asset, the current one included; see the module docstring.
+KEEP_VERSIONS = 4
+
+# Stylesheet for sites/v4/index.html (regenerate_v4_html.py).
+SITE_CSS = """:root {
+    /* Dark Mode (Default) */
+    --bg: #1a1a1a;
+    --text: #e0e0e0;
+    --muted: #888;
+    --accent: #88dcb4;
+    --border: #333;
+    --code-bg: #222;
+    --selection: rgba(94, 234, 212, 0.2);
+    --bg-alpha: rgba(26,26,26,0.7);
+    --font-stack: ui-monospace, 'Cascadia Code', 'Source Code Pro', Menlo, Consolas, 'DejaVu Sans Mono', monospace;
+}
+
+[data-theme="light"] {
+    --bg: #fafafa;
+    --text: #1a1a1a;
+    --muted: #666;
+    --accent: #278061;
+    --border: #ddd;
+    --code-bg: #f0f0f0;
+    --selection: rgba(13, 148, 136, 0.2);
+    --bg-alpha: rgba(250,250,250,0.7);
+}
+
+* {
+    box-sizing: border-box;
+}
+
+::selection {
+    background: var(--accent);
+    color: var(--bg);
+}
+
+html {
+    scroll-behavior: smooth;
+}
+
+body {
+    background-color: var(--bg);
+    color: var(--text);
+    font-family: var(--font-stack);
+    font-size: 16px;
+    line-height: 1.6;
+    margin: 0;
+    padding: 2rem;
+    transition: background-color 0.3s ease, color 0.3s ease;
+}
+
+.container {
+    max-width: 1100px;
+    margin: 0 auto;
+}
+
+/* Typography */
+h1, h2, h3 {
+    font-weight: 700;
+    margin-top: 2.5rem;
+    margin-bottom: 1rem;
+    line-height: 1.2;
+    letter-spacing: -0.03em;
+}
+
+h1 { font-size: 2rem; margin-top: 0; }
+h2 { font-size: 1.4rem; color: var(--accent); }
+h3 { font-size: 1.1rem; margin-top: 1.5rem; }
+
+p, li { margin-bottom: 1rem; }
+
+a {
+    color: var(--text);
+    text-decoration: underline;
+    text-decoration-color: var(--accent);
+    text-decoration-thickness: 1px;
+    text-underline-offset: 4px;
+    transition: color 0.2s, text-decoration-color 0.2s;
+}
+
+a:hover {
+    color: var(--accent);
+    text-decoration-color: transparent;
+}
+
+ul {
+    padding-left: 1.5rem;
+    list-style-type: square;
+}
+
+.muted { color: var(--muted); font-size: 0.9em; }
+.small { font-size: 0.85rem; }
+
+/* Section header (flex row with right-aligned metadata) */
+.section-header {
+    display: flex;
+    align-items: baseline;
+    justify-content: space-between;
+    gap: 1rem;
+}
+
+/* Header */
+.header-row {
+    display: flex;
+    align-items: baseline;
+    justify-content: space-between;
+    gap: 1rem;
+}
+
+.header-icons {
+    display: flex;
+    gap: 0.75rem;
+    align-items: center;
+}
+
+.header-icon {
+    color: var(--muted);
+    text-decoration: none;
+    transition: color 0.2s;
+    display: flex;
+}
+
+.header-icon:hover {
+    color: var(--accent);
+}
+
+/* Navigation */
+nav {
+    margin: 1.5rem 0 3rem 0;
+    padding: 1rem 0;
+    border-top: 1px solid var(--border);
+    border-bottom: 1px solid var(--border);
+    display: flex;
+    flex-wrap: wrap;
+    gap: 0.5rem;
+}
+
+nav a { text-decoration: none; }
+nav a:hover { color: var(--accent); }
+.nav-separator { color: var(--muted); padding: 0 0.5rem; }
+
+/* Sections */
+section { margin-bottom: 4rem; }
+
+section p, section ul, section aside {
+    max-width: 80ch;
+}
+
+/* Content Grid (Books & Albums) */
+.book-group,
+.album-group {
+    margin-bottom: 0.5rem;
+    padding-left: 1rem;
+    border-left: 2px solid var(--border);
+    transition: border-color 0.2s;
+}
+
+.book-group:hover,
+.album-group:hover {
+    border-left-color: var(--accent);
+}
+
+.book-year,
+.album-year {
+    display: block;
+    font-weight: bold;
+    padding: 0.25rem 0;
+}
+
+details.book-group summary,
+details.album-group summary {
+    list-style: none;
+    cursor: pointer;
+    font-weight: bold;
+    padding: 0.25rem 0;
+    user-select: none;
+}
+
+details.book-group summary::-webkit-details-marker,
+details.album-group summary::-webkit-details-marker {
+    display: none;
+}
+
+details.book-group summary::before,
+details.album-group summary::before {
+    content: "[+] ";
+    color: var(--muted);
+    font-size: 0.9em;
+}
+
+details.book-group[open] > summary::before,
+details.album-group[open] > summary::before {
+    content: "[-] ";
+}
+
+details.book-group summary:hover,
+details.album-group summary:hover {
+    color: var(--accent);
+}
+
+details.book-overflow,
+details.album-overflow {
+    margin-top: 0.25rem;
+}
+
+details.book-overflow summary,
+details.album-overflow summary {
+    list-style: none;
+    cursor: pointer;
+    user-select: none;
+    padding: 0.25rem 0;
+}
+
+details.book-overflow summary::-webkit-details-marker,
+details.album-overflow summary::-webkit-details-marker {
+    display: none;
+}
+
+details.book-overflow summary:hover,
+details.album-overflow summary:hover {
+    color: var(--accent);
+}
+
+.book-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(320px, 1fr));
+    gap: 1rem 2rem;
+}
+
+.book-title {
+    display: block;
+    color: var(--muted);
+    font-size: 0.9em;
+    line-height: 1.5;
+    text-decoration: none;
+}
+
+a.book-title:hover {
+    color: var(--accent);
+    text-decoration: underline;
+}
+
+.sparkline {
+    color: var(--muted);
+    font-size: 0.85rem;
+    margin-bottom: 1rem;
+    line-height: 1.6;
+}
+
+.album-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(320px, 1fr));
+    gap: 1rem 2rem;
+}
+
+.album-title {
+    display: block;
+    text-decoration: none;
+}
+
+a.album-title:hover {
+    color: var(--accent);
+    text-decoration: underline;
+}
+
+.album-note {
+    display: block;
+    color: var(--muted);
+    font-size: 0.85em;
+    font-style: italic;
+    line-height: 1.4;
+    margin-bottom: 0.5rem;
+}
+
+/* Search */
+.site-search {
+    position: relative;
+    max-width: 60ch;
+    margin: -1.5rem 0 3rem 0;
+}
+
+.site-search input {
+    width: 100%;
+    background: var(--code-bg);
+    color: var(--text);
+    border: 1px solid var(--border);
+    border-radius: 4px;
+    padding: 0.5rem 0.75rem;
+    font-family: inherit;
+    font-size: 0.9rem;
+}
+
+.site-search input:focus {
+    outline: none;
+    border-color: var(--accent);
+}
+
+.search-results {
+    list-style: none;
+    padding: 0;
+    margin: 0.5rem 0 0 0;
+    font-size: 0.9em;
+}
+
+.search-results li { margin-bottom: 0.25rem; }
+.search-results .search-kind { color: var(--muted); padding-right: 0.5rem; }
+
+/* Theme Toggle */
+.theme-toggle {
+    position: fixed;
+    top: 1.5rem;
+    right: 1.5rem;
+    background: var(--bg-alpha);
+    backdrop-filter: blur(8px);
+    -webkit-backdrop-filter: blur(8px);
+    border: 1px solid var(--border);
+    color: var(--text);
+    padding: 0.5rem;
+    cursor: pointer;
+    border-radius: 4px;
+    font-family: inherit;
+    line-height: 1;
+    z-index: 100;
+}
+
+.theme-toggle:hover {
+    border-color: var(--accent);
+    color: var(--accent);
+}
+
+.back-to-top {
+    display: block;
+    text-align: right;
+    font-size: 0.8rem;
+    margin-top: 1rem;
+    color: var(--muted);
+    text-decoration: none;
+}
+.back-to-top:hover { color: var(--accent); }
+
+/* Responsive */
+@media (max-width: 768px) {
+    body { padding: 1rem; }
+    h1 { font-size: 1.7rem; }
+    nav { font-size: 0.9rem; }
+    .theme-toggle { top: 1rem; right: 1rem; }
+    .book-grid, .album-grid { grid-template-columns: 1fr; }
+}
+"""
+
+# Stylesheet for sites/v4/brief/*.html (regenerate_brief_html.py).
+BRIEF_CSS = """:root {
+    --bg: #1a1a1a; --text: #e0e0e0; --muted: #888; --accent: #88dcb4;
+    --border: #333; --code-bg: #222; --selection: rgba(94, 234, 212, 0.2);
+    --font-stack: ui-monospace, 'Cascadia Code', 'Source Code Pro', Menlo, Consolas, 'DejaVu Sans Mono', monospace;
+}
+[data-theme="light"] {
+    --bg: #fafafa; --text: #1a1a1a; --muted: #666; --accent: #278061;
+    --border: #ddd; --code-bg: #f0f0f0; --selection: rgba(13, 148, 136, 0.2);
+}
+* { box-sizing: border-box; }
+::selection { background: var(--accent); color: var(--bg); }
+body {
+    background-color: var(--bg); color: var(--text); font-family: var(--font-stack);
+    font-size: 16px; line-height: 1.6; margin: 0; padding: 2rem;
+    transition: background-color 0.3s ease, color 0.3s ease;
+}
+.container { max-width: 1100px; margin: 0 auto; }
+h1, h2, h3 { font-weight: 700; margin-top: 2.5rem; margin-bottom: 1rem;
+    line-height: 1.2; letter-spacing: -0.03em; }
+h1 { font-size: 2rem; margin-top: 0; }
+h2 { font-size: 1.4rem; color: var(--accent); }
+h3 { font-size: 1.1rem; margin-top: 1.5rem; }
+p, li { margin-bottom: 0.6rem; }
+a { color: var(--text); text-decoration: underline;
+    text-decoration-color: var(--accent); text-decoration-thickness: 1px;
+    text-underline-offset: 4px; transition: color 0.2s, text-decoration-color 0.2s; }
+a:hover { color: var(--accent); text-decoration-color: transparent; }
+ul { padding-left: 1.5rem; list-style-type: square; }
+.muted { color: var(--muted); font-size: 0.9em; }
+.small { font-size: 0.85rem; }
+.header-row { display: flex; align-items: baseline;
+    justify-content: space-between; gap: 1rem; }
+nav { margin: 1.5rem 0 2.5rem 0; padding: 1rem 0; border-top: 1px solid var(--border);
+    border-bottom: 1px solid var(--border); display: flex; flex-wrap: wrap; gap: 0.5rem; }
+nav a { text-decoration: none; }
+nav a:hover { color: var(--accent); }
+.nav-separator { color: var(--muted); padding: 0 0.5rem; }
+.layout { display: grid; grid-template-columns: 240px minmax(0, 1fr); gap: 3rem; }
+@media (max-width: 800px) {
+  .layout { grid-template-columns: 1fr; }
+  .sidebar { position: static; order: 2; }
+  article { order: 1; }
+}
+article { max-width: 80ch; min-width: 0; }
+article h2 { border-bottom: 1px solid var(--border); padding-bottom: 0.3rem; }
+.sidebar { position: sticky; top: 1rem; align-self: start;
+    max-height: calc(100vh - 2rem); overflow-y: auto; font-size: 0.85rem; }
+.sidebar h2 { font-size: 1rem; margin-top: 1.5rem; }
+.sidebar h2:first-child { margin-top: 0; }
+.sidebar ul { list-style: none; padding: 0; }
+.sidebar ul ul { padding-left: 1rem; list-style: none; }
+.sidebar li { margin-bottom: 0.4rem; }
+#theme-toggle { background: none; border: 1px solid var(--border); color: var(--muted);
+    font-family: var(--font-stack); cursor: pointer; padding: 0.2rem 0.6rem;
+    border-radius: 4px; }
+#theme-toggle:hover { color: var(--accent); border-color: var(--accent); }
+footer { margin-top: 3rem; padding-top: 1rem; border-top: 1px solid var(--border);
+    color: var(--muted); font-size: 0.85rem; }
+"""
+
+# Theme toggle shared by both renderers. Both pages have a #theme-toggle
+# button; the saved choice lives in localStorage under the same key, so the
+# theme carries over between fring.io and /brief.
+THEME_JS = """const toggleBtn = document.getElementById('theme-toggle');
+const html = document.documentElement;
+
+// Check local storage or system preference
+const savedTheme = localStorage.getItem('theme');
+if (savedTheme) {
+    html.setAttribute('data-theme', savedTheme);
+    updateIcon(savedTheme);
+} else if (window.matchMedia('(prefers-color-scheme: light)').matches) {
+    html.setAttribute('data-theme', 'light');
+    updateIcon('light');
+}
+
+function updateIcon(theme) {
+    toggleBtn.textContent = theme === 'light' ? '\\u263e' : '\\u2600';
+}
+
+toggleBtn.addEventListener('click', () => {
+    const currentTheme = html.getAttribute('data-theme');
+    const newTheme = currentTheme === 'light' ? 'dark' : 'light';
+
+    html.setAttribute('data-theme', newTheme);
+    localStorage.setItem('theme', newTheme);
+    updateIcon(newTheme);
+});
+
+// Pages name their service worker (service_worker.py) in data-sw, relative
+// to the page, so the same script works at any depth and under /brief/.
+// Local previews (localhost, or dev_server.py's live-reload snippet) get no
+// worker, and lose any left from an earlier visit: a cached page would hide
+// the build that was just reloaded.
+const serviceWorker = document.currentScript && document.currentScript.dataset.sw;
+if (serviceWorker && 'serviceWorker' in navigator) {
+    window.addEventListener('load', () => {
+        const local = ['localhost', '127.0.0.1', '[::1]'].includes(location.hostname)
+            || document.querySelector('script[data-live-reload]');
+        if (local) {
+            navigator.serviceWorker.getRegistrations()
+                .then((registrations) => registrations.forEach((r) => r.unregister()))
+                .catch(() => {});
+            return;
+        }
+        navigator.serviceWorker.register(serviceWorker).catch(() => {});
+    });
+}
+"""
+
+
+# Search box for sites/v4/index.html, backed by the sharded index that
+# search_index.py writes. normalize() must stay in step with
+# text_normalize.normalize — the index is built with the Python version.
+SEARCH_JS = """(() => {
+    const input = document.getElementById('site-search');
+    const results = document.getElementById('search-results');
+    if (!input || !results) return;
+    input.closest('.site-search').hidden = false;
+
+    const LIMIT = 25;
+    const indexUrl = input.dataset.index;
+    const base = indexUrl.slice(0, indexUrl.lastIndexOf('/') + 1);
+    const TAGS = ['reissue', 'remastered', 'deluxe', 'expanded', 'bonus'];
+    // Python's Unicode \\w; a bare \\b in JS only knows ASCII word characters.
+    const WORD = /[\\p{L}\\p{N}_]/u.source;
+    let manifest = null;
+    const shards = new Map();
+    let latest = 0;
+
+    function normalize(text) {
+        // Python's \\s also matches \\x1c-\\x1f and \\x85 but not U+FEFF; map them
+        // so JS's \\s sees the same whitespace. U+FEFF becomes a character that
+        // is stripped as punctuation below, as in Python — after lowercasing,
+        // since both treat it as case-ignorable when choosing a final sigma.
+        let t = text.replace(/[\\x1c-\\x1f\\x85]/g, ' ').toLowerCase();
+        t = t.replace(/\\ufeff/g, '\\0').trim();
+        t = t.replace(/\\s*\\(([^)]*)\\)\\s*/g, ' ');
+        for (const tag of TAGS) t = t.replace(new RegExp(`(?<!${WORD})${tag}(?!${WORD})`, 'gu'), '');
+        t = t.replace(/[^\\p{L}\\p{N}_\\s]/gu, '');
+        return t.replace(/\\s+/g, ' ').trim();
+    }
+
+    function loadManifest() {
+        manifest ??= fetch(indexUrl).then((r) => r.json());
+        return manifest;
+    }
+
+    function loadShard(m, key) {
+        const file = m.shards[key];
+        if (!file) return Promise.resolve(null);
+        if (!shards.has(key)) shards.set(key, fetch(base + file).then((r) => r.json()));
+        return shards.get(key);
+    }
+
+    function firstAtLeast(terms, word) {
+        let lo = 0, hi = terms.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (terms[mid][0] < word) lo = mid + 1; else hi = mid;
+        }
+        return lo;
+    }
+
+    // Prefix-match the longest query word in its shard, keeping docs where
+    // every other query word prefixes one of the doc's words. Stops at LIMIT
+    // so a common prefix never walks its whole posting list.
+    function search(shard, words, longest) {
+        const seen = new Set();
+        const found = [];
+        const terms = shard.terms;
+        for (let i = firstAtLeast(terms, longest); i < terms.length && terms[i][0].startsWith(longest); i++) {
+            for (const id of terms[i][1]) {
+                if (seen.has(id)) continue;
+                seen.add(id);
+                const doc = shard.docs[id];
+                const docWords = doc[3].split(' ');
+                if (words.every((w) => docWords.some((dw) => dw.startsWith(w)))) {
+                    found.push(doc);
+                    if (found.length === LIMIT) return found;
+                }
+            }
+        }
+        return found;
+    }
+
+    function render(docs) {
+        results.replaceChildren(...docs.map(([kind, label, url]) => {
+            const li = document.createElement('li');
+            const tag = document.createElement('span');
+            tag.className = 'search-kind';
+            tag.textContent = kind;
+            const link = document.createElement(url ? 'a' : 'span');
+            if (url) { link.href = url; link.target = '_blank'; }
+            link.textContent = label;
+            li.append(tag, link);
+            return li;
+        }));
+    }
+
+    input.addEventListener('input', async () => {
+        const run = ++latest;
+        const query = normalize(input.value);
+        const words = query ? query.split(' ') : [];
+        if (!words.length) { results.replaceChildren(); return; }
+        const m = await loadManifest();
+        const longest = words.reduce((a, b) => (b.length > a.length ? b : a));
+        if (longest.length < m.keyLength) {
+            // Shards are keyed by a word's first keyLength characters, so a
+            // shorter query can't pick one; say so rather than show nothing.
+            if (run !== latest) return;
+            const hint = document.createElement('li');
+            hint.className = 'muted';
+            hint.textContent = `type at least ${m.keyLength} characters`;
+            results.replaceChildren(hint);
+            return;
+        }
+        const shard = await loadShard(m, longest.slice(0, m.keyLength));
+        if (run !== latest) return;
+        render(shard ? search(shard, words, longest) : []);
+    });
+})();
+"""
+
+
+# Virtualized Bookshelf/Albums grids for `regenerate_v4_html.py --virtual`.
+# Each [data-grid] container points at a compact payload (book_grid_payload /
+# album_grid_payload): a string table plus flat int arrays. Year groups become
+# placeholder slots and only the ones near the viewport hold DOM; a slot that
+# scrolls away keeps its measured height and drops its children. Large groups
+# show the first `visible` entries and page the rest in on "[+] N more".
+# The server-rendered grid in the following <noscript> is the no-JS fallback,
+# and is swapped in if the payload can't be loaded.
+GRID_JS = """(() => {
+    const MARGIN = '800px 0px';
+    const PAGE = 200;
+    const LINE_EM = 1.6;
+
+    function el(tag, className, text) {
+        const node = document.createElement(tag);
+        if (className) node.className = className;
+        if (text !== undefined) node.textContent = text;
+        return node;
+    }
+
+    function mount(grid, data) {
+        const { kind, visible, threshold, width, strings: s, items } = data;
+
+        function entry(i) {
+            const o = i * width;
+            if (kind === 'book') {
+                const link = el('a', 'book-title', s[items[o]]);
+                link.href = s[items[o + 1]];
+                link.target = '_blank';
+                return [link];
+            }
+            const year = items[o + 2];
+            const text = s[items[o]] + ' \\u2014 ' + s[items[o + 1]] + (year ? ' (' + year + ')' : '');
+            const href = items[o + 3];
+            const title = el(href >= 0 ? 'a' : 'span', 'album-title', text);
+            if (href >= 0) { title.href = s[href]; title.target = '_blank'; }
+            if (items[o + 4] < 0) return [title];
+            return [title, el('span', 'album-note', s[items[o + 4]])];
+        }
+
+        function append(parent, from, to, before) {
+            const nodes = [];
+            for (let i = from; i < to; i++) nodes.push(...entry(i));
+            before ? before.before(...nodes) : parent.append(...nodes);
+        }
+
+        function heading(tag, g) {
+            const head = el(tag, kind + '-year', g.label + ' ');
+            head.append(el('span', 'muted small', '(' + g.count + ')'));
+            return head;
+        }
+
+        function fill(slot) {
+            if (slot.firstChild) return;
+            const g = slot.group;
+            if (g.count <= threshold) {
+                const group = el('details', kind + '-group');
+                group.open = !g.closed;
+                group.addEventListener('toggle', () => { g.closed = !group.open; });
+                group.append(heading('summary', g));
+                append(group, g.start, g.start + g.count);
+                slot.append(group);
+            } else {
+                const group = el('div', kind + '-group');
+                group.append(heading('span', g));
+                append(group, g.start, g.start + visible);
+                const overflow = el('details', kind + '-overflow');
+                overflow.append(el('summary', 'muted small', '[+] ' + (g.count - visible) + ' more'));
+                const more = el('a', 'muted small fragment-link', 'show more');
+                more.href = '#';
+                const end = () => g.start + visible + g.shown;
+                const page = () => {
+                    const to = Math.min(end() + PAGE, g.start + g.count);
+                    append(overflow, end(), to, more);
+                    g.shown = to - g.start - visible;
+                    more.hidden = to === g.start + g.count;
+                };
+                more.addEventListener('click', (e) => { e.preventDefault(); page(); });
+                overflow.append(more);
+                if (g.shown) {
+                    append(overflow, g.start + visible, end(), more);
+                    more.hidden = end() === g.start + g.count;
+                    overflow.open = true;
+                }
+                overflow.addEventListener('toggle', () => {
+                    if (overflow.open && !g.shown) page();
+                });
+                group.append(overflow);
+                slot.append(group);
+            }
+            slot.style.minHeight = '';
+        }
+
+        function empty(slot) {
+            if (!slot.firstChild) return;
+            slot.style.minHeight = slot.offsetHeight + 'px';
+            slot.replaceChildren();
+        }
+
+        const observer = new IntersectionObserver((entries) => {
+            for (const e of entries) (e.isIntersecting ? fill : empty)(e.target);
+        }, { rootMargin: MARGIN });
+
+        let start = 0;
+        for (const [label, count] of data.groups) {
+            const slot = el('div', kind + '-slot');
+            slot.group = { label: s[label], count, start, shown: 0, closed: false };
+            const rows = (count > threshold ? visible + 1 : count) + 1;
+            slot.style.minHeight = rows * LINE_EM + 'em';
+            start += count;
+            grid.append(slot);
+            observer.observe(slot);
+        }
+        grid.hidden = false;
+    }
+
+    document.querySelectorAll('[data-grid]').forEach((grid) => {
+        fetch(grid.dataset.grid)
+            .then((r) => r.ok ? r.json() : Promise.reject(r.status))
+            .then((data) => mount(grid, data))
+            .catch(() => {
+                const fallback = grid.nextElementSibling;
+                if (fallback && fallback.tagName === 'NOSCRIPT') {
+                    grid.outerHTML = fallback.textContent;
+                }
+            });
+    });
+})();
+"""
+
+def asset_href(stem: str, ext: str, content: str) -> str:
+    """Relative, content-hashed URL for an asset: assets/<stem>.<hash>.<ext>."""
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:10]
+    return f"{ASSET_DIR}/{stem}.{digest}.{ext}"
+
+
+def _load_state(path: Path) -> dict[str, list[str]]:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except ValueError:
+        return {}
+
+
+def write_asset(output_dir: Path, stem: str, ext: str, content: str) -> str:
+    """Write a hashed asset under output_dir (if new) and return its href.
+
+    Older hashes of the same stem stay until KEEP_VERSIONS newer ones exist,
+    so pages cached from a previous deploy still find their CSS and JS.
+    """
+    href = asset_href(stem, ext, content)
+    path = output_dir / href
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not path.exists():
+        path.write_text(content)
+
+    state_path = path.parent / STATE_NAME
+    state = _load_state(state_path)
+    key = f"{stem}.{ext}"
+    known = state.get(key, [])
+    # Files the state doesn't list yet predate it, so they rank last, newest first.
+    unknown = sorted(
+        (p for p in path.parent.glob(f"{stem}.*.{ext}") if p.name not in known),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    names = [path.name]
+    names += [name for name in known if name != path.name and (path.parent / name).exists()]
+    names += [p.name for p in unknown if p != path]
+    for name in names[KEEP_VERSIONS:]:
+        (path.parent / name).unlink()
+    if names[:KEEP_VERSIONS] != known:
+        state[key] = names[:KEEP_VERSIONS]
+        _ = state_path.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n")
+    return href
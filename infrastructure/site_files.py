@@ -0,0 +1,22 @@
+"""
+site_files.py - Shared file-writing helper for the generated site trees.
+
+Each render rewrites sitemap.xml, the facet indexes, the static API and the
+service worker files. write_if_changed() leaves a file alone when its bytes
+are already on disk, so unchanged files keep their mtime (compress_site.py
+skips re-compressing them) and their count doesn't inflate the build log.
+
+Not a script — imported by sitemap.py, facet_index.py, static_api.py,
+service_worker.py, regenerate_v4_html.py and regenerate_brief_html.py.
+"""
+
+from pathlib import Path
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Write data to path unless the file already holds exactly those bytes.
+    Returns whether it wrote."""
+    if path.exists() and path.read_bytes() == data:
+        return False
+    _ = path.write_bytes(data)
+    return True
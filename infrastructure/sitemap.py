@@ -0,0 +1,93 @@
+"""
+sitemap.py - sitemap.xml for the v4 site, the brief archive and the detail pages.
+
+Both renderers call write_sitemap() on the site root (sites/v4) once their
+pages are on disk, so whichever of them runs last leaves a sitemap listing:
+
+  index.html              https://fring.io/
+  brief/*.html            every week, the archive index and about
+  books/*.html            detail pages (detail_pages.py)
+  albums/*.html
+  facets/**/*.html        browse pages, when rendered with --facet-pages
+
+Each page's <lastmod> is the day its bytes last changed, not the build date.
+sitemap-state.json beside the sitemap keeps {page: [content hash, lastmod]};
+a run hashes the pages, keeps the entry of every page whose hash matches,
+stamps today on new or changed ones and drops removed ones, so crawlers and
+link checkers only revisit pages that actually changed. The state is
+committed with the site (CI has no persistent cache to keep it in), and
+deploy.yml leaves it out of the upload.
+
+Not a script — imported by regenerate_v4_html.py and regenerate_brief_html.py.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import cast
+from xml.sax.saxutils import escape
+
+from site_files import write_if_changed
+
+SITE_URL = "https://fring.io"
+SITEMAP_NAME = "sitemap.xml"
+STATE_NAME = "sitemap-state.json"
+
+PAGE_GLOBS = ("index.html", "brief/*.html", "books/*.html", "albums/*.html", "facets/**/*.html")
+
+
+def page_url(site_url: str, rel: str) -> str:
+    """Public URL of a page; directory indexes map to their directory."""
+    if rel == "index.html" or rel.endswith("/index.html"):
+        rel = rel[: -len("index.html")]
+    return f"{site_url}/{rel}"
+
+
+def load_state(path: Path) -> dict[str, list[str]]:
+    if not path.exists():
+        return {}
+    try:
+        return cast(dict[str, list[str]], json.loads(path.read_text())["pages"])
+    except (ValueError, KeyError):
+        return {}
+
+
+def write_sitemap(
+    site_dir: Path,
+    site_url: str = SITE_URL,
+    today: str | None = None,
+) -> dict[str, int]:
+    """Update site_dir/sitemap-state.json from the pages on disk and write
+    site_dir/sitemap.xml. Returns how many URLs it lists and how many were
+    added/changed or removed since the last run."""
+    today = today or datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    state_path = site_dir / STATE_NAME
+    previous = load_state(state_path)
+
+    pages = sorted({p.relative_to(site_dir).as_posix() for pattern in PAGE_GLOBS for p in site_dir.glob(pattern)})
+    state: dict[str, list[str]] = {}
+    changed = 0
+    for rel in pages:
+        digest = hashlib.sha256((site_dir / rel).read_bytes()).hexdigest()[:16]
+        entry = previous.get(rel)
+        if entry is None or entry[0] != digest:
+            entry = [digest, today]
+            changed += 1
+        state[rel] = entry
+    removed = len(previous.keys() - state.keys())
+
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+    for rel, (_digest, lastmod) in state.items():
+        lines.append(f"  <url><loc>{escape(page_url(site_url, rel))}</loc><lastmod>{lastmod}</lastmod></url>")
+    lines.append("</urlset>")
+
+    _ = write_if_changed(site_dir / SITEMAP_NAME, ("\n".join(lines) + "\n").encode("utf-8"))
+    # One page per line keeps the committed diff to the pages that changed.
+    entries = ",\n".join(f"    {json.dumps(rel)}: {json.dumps(entry)}" for rel, entry in state.items())
+    state_json = f'{{\n  "pages": {{\n{entries}\n  }}\n}}\n'
+    _ = write_if_changed(state_path, state_json.encode("utf-8"))
+    return {"urls": len(state), "changed": changed, "removed": removed}
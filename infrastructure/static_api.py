@@ -0,0 +1,96 @@
+"""
+static_api.py - Versioned static JSON API for the v4 site.
+
+Tools that want the reading and listening log used to scrape
+sites/v4/index.html. regenerate_v4_html.py now also publishes the content as
+plain JSON under sites/v4/api/v1/:
+
+  manifest.json          {"version": 1, "pageSize": n,
+                          "books":  {"count": n, "pages": [[file, count, sha256], ...]},
+                          "albums": {"count": n, "pages": [[file, count, sha256], ...]},
+                          "now":    [file, sha256]}
+  books/page-<N>.json    {"page": N, "books": [...]}
+  albums/page-<N>.json   {"page": N, "albums": [...]}
+  now.json               content/now.json as-is
+
+Entries are the content JSON records unchanged (content_model's to_json()).
+Pages are numbered from the oldest entry, so a new book or album only
+changes the last page; consumers compare the manifest hashes (or send
+If-None-Match — a file is only rewritten when its bytes change, so the
+server's ETag stays put too) and fetch just the pages that moved. A page holds no totals (the manifest lists the pages), so
+crossing a page boundary adds a page without touching the earlier ones.
+Page files keep stable names, unlike the hashed search shards, because they
+are what external tools link to.
+
+Not a script — imported by regenerate_v4_html.py.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Sequence, TypeVar
+
+from content_model import Album, Book, NowPage
+from site_files import write_if_changed
+
+T = TypeVar("T")
+
+API_DIR = "api/v1"
+API_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+PAGE_SIZE = 100
+
+
+def _dump(data: object) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def paginate(entries: Sequence[T], page_size: int = PAGE_SIZE) -> list[Sequence[T]]:
+    """Split newest-first content entries into oldest-first pages."""
+    oldest_first = entries[::-1]
+    pages = [oldest_first[i:i + page_size] for i in range(0, len(oldest_first), page_size)]
+    return pages or [[]]
+
+
+def write_static_api(
+    output_dir: Path,
+    books: list[Book],
+    albums: list[Album],
+    now: NowPage,
+    page_size: int = PAGE_SIZE,
+) -> dict[str, int]:
+    """Write the API under output_dir/api/v1/; return file stats."""
+    api_root = output_dir / API_DIR
+    manifest: dict[str, object] = {"version": API_VERSION, "pageSize": page_size}
+    keep: set[Path] = {api_root / MANIFEST_NAME}
+    files = 1  # the manifest
+    written = 0
+
+    for kind, entries in (("books", books), ("albums", albums)):
+        directory = api_root / kind
+        _ = directory.mkdir(parents=True, exist_ok=True)
+        pages = paginate(entries, page_size)
+        listed: list[list[object]] = []
+        for number, items in enumerate(pages, 1):
+            name = f"{kind}/page-{number}.json"
+            body = _dump({"page": number, kind: [e.to_json() for e in items]})
+            keep.add(api_root / name)
+            written += write_if_changed(api_root / name, body)
+            listed.append([name, len(items), hashlib.sha256(body).hexdigest()])
+            files += 1
+        manifest[kind] = {"count": len(entries), "pages": listed}
+
+    body = _dump(now.to_json())
+    keep.add(api_root / "now.json")
+    written += write_if_changed(api_root / "now.json", body)
+    manifest["now"] = ["now.json", hashlib.sha256(body).hexdigest()]
+    files += 1
+
+    removed = 0
+    for stale in api_root.rglob("*.json"):
+        if stale not in keep:
+            stale.unlink()
+            removed += 1
+
+    written += write_if_changed(api_root / MANIFEST_NAME, _dump(manifest))
+    return {"files": files, "written": written, "removed": removed}
@@ -25,6 +25,8 @@ from datetime import datetime
 from pathlib import Path
 from urllib.request import urlopen
 
+from text_normalize import normalize as _normalize
+
 try:
     import spotipy
     from spotipy.oauth2 import SpotifyClientCredentials
@@ -187,17 +189,6 @@ def fetch_playlist_albums(sp):
     return albums_seen
 
 
-def _normalize(text):
-    """Normalize for fuzzy matching: lowercase, strip parens/reissue/deluxe, punctuation."""
-    t = text.lower().strip()
-    t = re.sub(r"\s*\(([^)]*)\)\s*", " ", t)
-    for tag in ["reissue", "remastered", "deluxe", "expanded", "bonus"]:
-        t = re.sub(rf"\b{tag}\b", "", t)
-    t = re.sub(r"[^\w\s]", "", t)
-    t = re.sub(r"\s+", " ", t).strip()
-    return t
-
-
 def load_existing_albums():
     if not ALBUMS_JSON.exists():
         return set(), set()
@@ -0,0 +1,23 @@
+"""
+text_normalize.py - Title normalization shared by the Spotify sync and search.
+
+sync_spotify.py uses normalize() to fuzzy-match playlist albums against
+albums.json; search_index.py uses the same rules to build the v4 search index
+(and SEARCH_JS in site_assets.py mirrors them for queries), so a title that
+the sync considers "the same album" is also found by the same search.
+"""
+
+import re
+
+EDITION_TAGS = ["reissue", "remastered", "deluxe", "expanded", "bonus"]
+
+
+def normalize(text):
+    """Normalize for fuzzy matching: lowercase, strip parens/reissue/deluxe, punctuation."""
+    t = text.lower().strip()
+    t = re.sub(r"\s*\(([^)]*)\)\s*", " ", t)
+    for tag in EDITION_TAGS:
+        t = re.sub(rf"\b{tag}\b", "", t)
+    t = re.sub(r"[^\w\s]", "", t)
+    t = re.sub(r"\s+", " ", t).strip()
+    return t
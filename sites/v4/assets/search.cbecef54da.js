@@ -0,0 +1,92 @@
+(() => {
+    const input = document.getElementById('site-search');
+    const results = document.getElementById('search-results');
+    if (!input || !results) return;
+    input.closest('.site-search').hidden = false;
+
+    const LIMIT = 25;
+    const indexUrl = input.dataset.index;
+    const base = indexUrl.slice(0, indexUrl.lastIndexOf('/') + 1);
+    const TAGS = ['reissue', 'remastered', 'deluxe', 'expanded', 'bonus'];
+    let manifest = null;
+    const shards = new Map();
+    let latest = 0;
+
+    function normalize(text) {
+        let t = text.toLowerCase().trim();
+        t = t.replace(/\s*\(([^)]*)\)\s*/g, ' ');
+        for (const tag of TAGS) t = t.replace(new RegExp('\\b' + tag + '\\b', 'g'), '');
+        t = t.replace(/[^\p{L}\p{N}_\s]/gu, '');
+        return t.replace(/\s+/g, ' ').trim();
+    }
+
+    function loadManifest() {
+        manifest ??= fetch(indexUrl).then((r) => r.json());
+        return manifest;
+    }
+
+    function loadShard(m, key) {
+        const file = m.shards[key];
+        if (!file) return Promise.resolve(null);
+        if (!shards.has(key)) shards.set(key, fetch(base + file).then((r) => r.json()));
+        return shards.get(key);
+    }
+
+    function firstAtLeast(terms, word) {
+        let lo = 0, hi = terms.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (terms[mid][0] < word) lo = mid + 1; else hi = mid;
+        }
+        return lo;
+    }
+
+    // Prefix-match the longest query word in its shard, keeping docs where
+    // every other query word prefixes one of the doc's words. Stops at LIMIT
+    // so a common prefix never walks its whole posting list.
+    function search(shard, words, longest) {
+        const seen = new Set();
+        const found = [];
+        const terms = shard.terms;
+        for (let i = firstAtLeast(terms, longest); i < terms.length && terms[i][0].startsWith(longest); i++) {
+            for (const id of terms[i][1]) {
+                if (seen.has(id)) continue;
+                seen.add(id);
+                const doc = shard.docs[id];
+                const docWords = doc[3].split(' ');
+                if (words.every((w) => docWords.some((dw) => dw.startsWith(w)))) {
+                    found.push(doc);
+                    if (found.length === LIMIT) return found;
+                }
+            }
+        }
+        return found;
+    }
+
+    function render(docs) {
+        results.replaceChildren(...docs.map(([kind, label, url]) => {
+            const li = document.createElement('li');
+            const tag = document.createElement('span');
+            tag.className = 'search-kind';
+            tag.textContent = kind;
+            const link = document.createElement(url ? 'a' : 'span');
+            if (url) { link.href = url; link.target = '_blank'; }
+            link.textContent = label;
+            li.append(tag, link);
+            return li;
+        }));
+    }
+
+    input.addEventListener('input', async () => {
+        const run = ++latest;
+        const query = normalize(input.value);
+        const words = query ? query.split(' ') : [];
+        if (!words.length) { results.replaceChildren(); return; }
+        const m = await loadManifest();
+        const longest = words.reduce((a, b) => (b.length > a.length ? b : a));
+        if (longest.length < m.keyLength) { results.replaceChildren(); return; }
+        const shard = await loadShard(m, longest.slice(0, m.keyLength));
+        if (run !== latest) return;
+        render(shard ? search(shard, words, longest) : []);
+    });
+})();
@@ -0,0 +1,45 @@
+const toggleBtn = document.getElementById('theme-toggle');
+const html = document.documentElement;
+
+// Check local storage or system preference
+const savedTheme = localStorage.getItem('theme');
+if (savedTheme) {
+    html.setAttribute('data-theme', savedTheme);
+    updateIcon(savedTheme);
+} else if (window.matchMedia('(prefers-color-scheme: light)').matches) {
+    html.setAttribute('data-theme', 'light');
+    updateIcon('light');
+}
+
+function updateIcon(theme) {
+    toggleBtn.textContent = theme === 'light' ? '\u263e' : '\u2600';
+}
+
+toggleBtn.addEventListener('click', () => {
+    const currentTheme = html.getAttribute('data-theme');
+    const newTheme = currentTheme === 'light' ? 'dark' : 'light';
+
+    html.setAttribute('data-theme', newTheme);
+    localStorage.setItem('theme', newTheme);
+    updateIcon(newTheme);
+});
+
+// Pages name their service worker (service_worker.py) in data-sw, relative
+// to the page, so the same script works at any depth and under /brief/.
+// Local previews (localhost, or dev_server.py's live-reload snippet) get no
+// worker, and lose any left from an earlier visit: a cached page would hide
+// the build that was just reloaded.
+const serviceWorker = document.currentScript && document.currentScript.dataset.sw;
+if (serviceWorker && 'serviceWorker' in navigator) {
+    window.addEventListener('load', () => {
+        const local = ['localhost', '127.0.0.1', '[::1]'].includes(location.hostname)
+            || document.querySelector('script[data-live-reload]');
+        if (local) {
+            navigator.serviceWorker.getRegistrations()
+                .then((registrations) => registrations.forEach((r) => r.unregister()))
+                .catch(() => {});
+            return;
+        }
+        navigator.serviceWorker.register(serviceWorker).catch(() => {});
+    });
+}
@@ -0,0 +1,95 @@
+const VERSION = "d524bd94d58e";
+const CACHE_PREFIX = "fring-v4";
+const EXCLUDE = ["brief/"];
+
+const PRECACHE = `${CACHE_PREFIX}-precache-${VERSION}`;
+const RUNTIME = `${CACHE_PREFIX}-runtime`;
+const MANIFEST = 'sw-manifest.json';
+const SCOPE = self.registration.scope;
+
+async function previousPrecache() {
+    const names = (await caches.keys()).filter(
+        (name) => name.startsWith(`${CACHE_PREFIX}-precache-`) && name !== PRECACHE);
+    return names.length ? caches.open(names[names.length - 1]) : null;
+}
+
+self.addEventListener('install', (event) => {
+    event.waitUntil((async () => {
+        const manifest = await (await fetch(MANIFEST, { cache: 'no-cache' })).json();
+        const cache = await caches.open(PRECACHE);
+        const previous = await previousPrecache();
+        const known = previous ? await (await previous.match(MANIFEST))?.json() ?? {} : {};
+        await Promise.all(Object.entries(manifest.precache).map(async ([url, revision]) => {
+            if (known[url] === revision) {
+                const hit = await previous.match(url);
+                if (hit) return cache.put(url, hit);
+            }
+            const response = await fetch(url, { cache: 'no-cache' });
+            if (response.ok) await cache.put(url, response);
+        }));
+        await cache.put(MANIFEST, new Response(JSON.stringify(manifest.precache)));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil((async () => {
+        const stale = (await caches.keys()).filter(
+            (name) => name.startsWith(`${CACHE_PREFIX}-precache-`) && name !== PRECACHE);
+        await Promise.all(stale.map((name) => caches.delete(name)));
+        // Runtime copies of precached URLs would shadow the fresher precache.
+        const precache = await caches.open(PRECACHE);
+        const runtime = await caches.open(RUNTIME);
+        await Promise.all((await precache.keys()).map((request) => runtime.delete(request)));
+        await self.clients.claim();
+    })());
+});
+
+async function cached(request) {
+    return (await (await caches.open(RUNTIME)).match(request))
+        ?? (await (await caches.open(PRECACHE)).match(request));
+}
+
+async function cacheFirst(request) {
+    const hit = await cached(request);
+    if (hit) return hit;
+    const response = await fetch(request);
+    if (response.ok) await (await caches.open(RUNTIME)).put(request, response.clone());
+    return response;
+}
+
+async function offlinePage(request) {
+    return (await cached(request)) ?? (await cached(new URL('./', SCOPE).href));
+}
+
+async function staleWhileRevalidate(event) {
+    const request = event.request;
+    const network = fetch(request).then(async (response) => {
+        if (response.ok) await (await caches.open(RUNTIME)).put(request, response.clone());
+        return response;
+    });
+    const hit = await cached(request);
+    if (hit) {
+        event.waitUntil(network.catch(() => {}));
+        return hit;
+    }
+    if (request.mode !== 'navigate') return network;
+    try {
+        return await network;
+    } catch (error) {
+        const fallback = await offlinePage(request);
+        if (fallback) return fallback;
+        throw error;
+    }
+}
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    if (request.method !== 'GET' || !request.url.startsWith(SCOPE)) return;
+    // Event streams (the dev server's live reload) must never be cached.
+    if ((request.headers.get('Accept') || '').includes('text/event-stream')) return;
+    const path = new URL(request.url).pathname.slice(new URL(SCOPE).pathname.length);
+    if (EXCLUDE.some((prefix) => path.startsWith(prefix))) return;
+    if (path.startsWith('assets/')) event.respondWith(cacheFirst(request));
+    else event.respondWith(staleWhileRevalidate(event));
+});